@@ -9,7 +9,7 @@ if len(sys.argv) != 2:
 
 instance = scheduler.problem.Instance.load_txt(sys.argv[1])
 
-print("OPT >= ", sum(instance.tasks_durations) / instance.processors_number)
+print("OPT >= ", scheduler.bounds.lower_bound(instance.tasks_durations, instance.processors_number))
 
 
 algorithms = [
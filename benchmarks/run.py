@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""Reproducible benchmark suite of the scheduler package.
+
+Measures ns per task of the constructive heuristics, generations per second of the genetic algorithms and nodes
+per second of the exact solvers, together with the quality gap of every result, and the startup time of the
+command line interface. Throughputs are the best of a few repetitions spread across passes of the whole suite,
+each in a new process. The quality of the genetic algorithms is measured separately after a fixed number of seeded
+generations, so it doesn't depend on the speed of the machine. Results can be saved as a baseline and later
+compared against it, the comparison fails if any throughput or quality regressed.
+
+The committed baseline.json was measured with --quick. Its quality gaps are reproducible on any machine, its
+throughputs only on the machine which measured them, so save a local baseline (or raise --tolerance) before
+comparing throughputs elsewhere.
+
+    python benchmarks/run.py --quick --save benchmarks/baseline.json
+    python benchmarks/run.py --quick --compare benchmarks/baseline.json
+"""
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import click
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import scheduler  # noqa: E402
+from scheduler import bounds  # noqa: E402
+from scheduler.algorithms import (  # noqa: E402
+    branch_and_bound,
+    brute_force_iterative,
+    brute_force_recursive,
+    eryk_heuristic,
+    greedy,
+    jakub_genetic,
+    karmarkar_karp,
+    local_search,
+    lpt,
+    multifit,
+)
+
+ROOT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+INSTANCES_DIRECTORY = os.path.join(ROOT_DIRECTORY, "instances")
+SEED = 112997
+# Minimal duration of a single timing sample (in seconds)
+MINIMAL_SAMPLE = 0.02
+# Number of runs of the whole suite
+PASSES = 5
+CONSTRUCTIVE = {
+    "greedy": greedy.solve,
+    "lpt": lpt.solve,
+    "multifit": multifit.solve,
+    "karmarkar_karp": karmarkar_karp.solve,
+    "local_search": local_search.solve,
+}
+CONSTRUCTIVE_INSTANCES = ["m10n200", "m50n200", "m50n1000", "w1410", "w997", "m25", "m30"]
+GENETIC_INSTANCES = ["m10n200", "m50n200", "m50n1000"]
+EXACT_INSTANCES = ["example_instance"]
+
+
+def generated(tasks_number: int, processors_number: int, task_duration_max: int, seed: int):
+    """Generates an instance with a known optimal total time.
+
+    :return: instance and its optimal total time
+    """
+    cmax = 1 + ((tasks_number - 1) * (task_duration_max + 2) // 2) // processors_number
+    random.seed(seed)
+    return scheduler.generate(cmax, tasks_number, processors_number, task_duration_max), cmax
+
+
+def uniform(tasks_number: int, processors_number: int, seed: int):
+    """Generates an instance with uniformly distributed durations, hard for the exact solvers.
+
+    :return: instance and its lower bound as the reference total time
+    """
+    generator = random.Random(seed)
+    instance = scheduler.Instance(processors_number, [generator.randint(10, 99) for _ in range(tasks_number)])
+    return instance, bounds.lower_bound(instance.tasks_durations, instance.processors_number)
+
+
+def shipped(name: str):
+    """Loads a shipped instance, its lower bound is used as the reference total time.
+
+    :return: instance and the reference total time
+    """
+    instance = scheduler.Instance.load(os.path.join(INSTANCES_DIRECTORY, f"{name}.txt"))
+    return instance, bounds.lower_bound(instance.tasks_durations, instance.processors_number)
+
+
+def gap(total_time: int, reference: int) -> float:
+    return (total_time - reference) / reference if reference > 0 else 0.0
+
+
+def best_time(function, repeat: int):
+    """Returns the shortest duration of a call of the function out of repeat samples and the last result.
+
+    Every sample calls the function until it takes at least MINIMAL_SAMPLE seconds, so short calls aren't dominated
+    by the resolution of the clock.
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            result = function()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= MINIMAL_SAMPLE:
+                break
+        best = elapsed / calls if best is None else min(best, elapsed / calls)
+    return best, result
+
+
+def record(name: str, metric: str, value: float, higher_is_better: bool, quality_gap: float = None) -> dict:
+    """Returns a benchmark result, the quality gap is None if the result measures only the throughput."""
+    return {"name": name, "metric": metric, "value": value, "higher_is_better": higher_is_better, "gap": quality_gap}
+
+
+def constructive_benchmarks(cases: list, repeat: int) -> list:
+    results = []
+    for case, (instance, reference) in cases:
+        tasks_number = len(instance.tasks_durations)
+        for algorithm, solve in CONSTRUCTIVE.items():
+            elapsed, solution = best_time(lambda: solve(instance), repeat)
+            results.append(record(
+                f"{algorithm}/{case}", "ns_per_task", elapsed * 1e9 / max(tasks_number, 1), False,
+                gap(solution.total_time, reference)
+            ))
+    return results
+
+
+def genetic_rate(create, period: float, repeat: int) -> float:
+    """Returns the best number of generations per second of the generators created by create within the period."""
+    rates = []
+    for _ in range(repeat):
+        random.seed(SEED)
+        generations = 0
+        start = time.perf_counter()
+        # The generators stop by themselves once they reach the lower bound, then they're started again
+        while time.perf_counter() - start < period:
+            generator = create()
+            next(generator)
+            for solution in generator:
+                generations += solution is not None
+                if time.perf_counter() - start >= period:
+                    break
+            generator.close()
+        rates.append(generations / (time.perf_counter() - start))
+    return max(rates)
+
+
+def genetic_total_time(create, generations: int) -> int:
+    """Returns the best total time of the generator created by create after the seeded generations."""
+    random.seed(SEED)
+    generator = create()
+    best = next(generator).total_time
+    created = 0
+    for solution in generator:
+        if solution is None:
+            continue
+        best = min(best, solution.total_time)
+        created += 1
+        if created >= generations:
+            break
+    generator.close()
+    return best
+
+
+def genetic_benchmarks(cases: list, period: float, generations: int, repeat: int) -> list:
+    results = []
+    for case, (instance, reference) in cases:
+        engines = {
+            "jakub_genetic": lambda: jakub_genetic.solution_generator(instance, 128, 32),
+            "jakub_genetic_numpy": lambda: jakub_genetic.population_generator(instance, 128, 32, rng=SEED),
+            "eryk_heuristic": lambda: eryk_heuristic.solution_generator(instance),
+        }
+        # A single thread evolves the population deterministically, the throughput is measured with all of them
+        quality_engines = {**engines, "eryk_heuristic": lambda: eryk_heuristic.solution_generator(instance, 1)}
+        for algorithm, create in engines.items():
+            results.append(record(
+                f"{algorithm}/{case}", "generations_per_second", genetic_rate(create, period, repeat), True
+            ))
+            results.append(record(
+                f"{algorithm}/{case}", "fixed_generations", generations, True,
+                gap(genetic_total_time(quality_engines[algorithm], generations), reference)
+            ))
+    return results
+
+
+def exact_benchmarks(cases: list, repeat: int, brute_force: bool = True) -> list:
+    results = []
+    for case, (instance, reference) in cases:
+        tasks_number = len(instance.tasks_durations)
+        if brute_force:
+            # The solvers stop at the lower bound, so the throughput is measured on the whole enumeration
+            enumerations = {
+                "brute_force_iterative": (brute_force_iterative.solve, lambda: min(
+                    total_time for total_time, _ in brute_force_iterative.brute_scored_generator(
+                        instance.tasks_durations, instance.processors_number
+                    )
+                )),
+                "brute_force_recursive": (brute_force_recursive.solve, lambda: min(
+                    scheduler.InstanceSolution(instance, partition).total_time
+                    for partition in brute_force_recursive.generate_partitions(
+                        list(range(tasks_number)), instance.processors_number
+                    )
+                )),
+            }
+            leaves = sum(1 for _ in brute_force_iterative.brute_scored_generator(
+                instance.tasks_durations, instance.processors_number
+            ))
+            for algorithm, (solve, enumerate_all) in enumerations.items():
+                elapsed, _ = best_time(enumerate_all, repeat)
+                results.append(record(
+                    f"{algorithm}/{case}", "nodes_per_second", leaves / elapsed, True,
+                    gap(solve(instance).total_time, reference)
+                ))
+
+        order = sorted(range(tasks_number), key=instance.tasks_durations.__getitem__, reverse=True)
+        durations = [instance.tasks_durations[task_index] for task_index in order]
+        bound = bounds.lower_bound(durations, instance.processors_number)
+
+        def search():
+            upper_bound = lpt.solve(instance).total_time
+            result = branch_and_bound.BranchAndBound(durations, instance.processors_number, upper_bound, bound)
+            best, _ = result.run()
+            return result, upper_bound if best is None else best
+
+        elapsed, (result, total_time) = best_time(search, repeat)
+        results.append(record(
+            f"branch_and_bound/{case}", "nodes_per_second", result.nodes / elapsed, True, gap(total_time, reference)
+        ))
+    return results
+
+
+def startup_benchmarks(repeat: int) -> list:
+    """Measures the wall time of fresh processes, short solve jobs are dominated by the imports."""
+    instance = os.path.join(INSTANCES_DIRECTORY, "example_instance.txt")
+    cli = "from scheduler.scripts.solve import solve; solve()"
+    environment = {**os.environ, "PYTHONPATH": os.path.abspath(ROOT_DIRECTORY)}
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        commands = {
+            "import": ["-c", "import scheduler"],
+            "solve_help": ["-c", cli, "--help"],
+            "solve_greedy": ["-c", cli, "heuristic", "-i", instance, "-a", "greedy", "-o", directory],
+        }
+        for name, arguments in commands.items():
+            elapsed, _ = best_time(lambda: subprocess.run(
+                [sys.executable, *arguments], env=environment, stdout=subprocess.DEVNULL, check=True
+            ), repeat)
+            results.append(record(f"startup/{name}", "ms", elapsed * 1e3, False))
+    return results
+
+
+def measure(quick: bool) -> list:
+    """Runs every benchmark once."""
+    repeat = 1 if quick else 3
+    period = 0.5 if quick else 3.0
+    generations = 50 if quick else 200
+    sizes = [100, 1000] if quick else [100, 1000, 10000, 100000]
+
+    constructive = [(name, shipped(name)) for name in CONSTRUCTIVE_INSTANCES]
+    constructive += [(f"generated_n{n}", generated(n, 10, 100, SEED + n)) for n in sizes]
+    genetic = [(name, shipped(name)) for name in GENETIC_INSTANCES[:1 if quick else None]]
+    genetic += [("generated_n200", generated(200, 10, 100, SEED))]
+    exact = [(name, shipped(name)) for name in EXACT_INSTANCES]
+    exact += [(f"generated_n{n}", generated(n, 3, 10, SEED + n)) for n in ([9] if quick else [9, 10])]
+    branch_and_bound_only = [(f"uniform_n{n}", uniform(n, 4, SEED + n)) for n in ([16] if quick else [16, 20, 24])]
+
+    return constructive_benchmarks(constructive, repeat) + \
+        genetic_benchmarks(genetic, period, generations, repeat) + exact_benchmarks(exact, repeat) + \
+        exact_benchmarks(branch_and_bound_only, repeat, brute_force=False) + startup_benchmarks(3 * repeat)
+
+
+def run(quick: bool, passes: int = PASSES) -> list:
+    """Runs the whole suite a few times, every time in a new process, and keeps the best throughput of every benchmark.
+
+    The speed of the same code differs between processes (e.g. by their memory layout) and a shared machine slows
+    down for a while, so the samples of a benchmark are spread across processes instead of being taken one right
+    after another. The quality gaps don't depend on the timing, they're taken from the first pass.
+    """
+    results = None
+    for _ in range(passes):
+        with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            measured = executor.submit(measure, quick).result()
+        if results is None:
+            results = measured
+            continue
+        for result, other in zip(results, measured):
+            better = max if result["higher_is_better"] else min
+            result["value"] = better(result["value"], other["value"])
+    return results
+
+
+def compare(results: list, baseline: list, tolerance: float, gap_tolerance: float) -> list:
+    """Returns descriptions of the regressions of the results against the baseline."""
+    regressions = []
+    current = {(result["name"], result["metric"]): result for result in results}
+    for reference in baseline:
+        result = current.get((reference["name"], reference["metric"]))
+        if result is None:
+            continue
+        if reference["higher_is_better"]:
+            slower = result["value"] < reference["value"] * (1 - tolerance)
+        else:
+            slower = result["value"] > reference["value"] * (1 + tolerance)
+        if slower:
+            regressions.append(
+                f"{result['name']}: {result['metric']} {result['value']:.4g} (baseline {reference['value']:.4g})"
+            )
+        if result["gap"] is not None and reference["gap"] is not None and \
+                result["gap"] > reference["gap"] + gap_tolerance:
+            regressions.append(f"{result['name']}: gap {result['gap']:.4f} (baseline {reference['gap']:.4f})")
+    return regressions
+
+
+@click.command()
+@click.option("--quick", is_flag=True, help="Smaller instances, shorter periods and fewer repetitions.")
+@click.option("--passes", default=PASSES, help="Number of runs of the whole suite.", type=click.IntRange(min=1))
+@click.option("--save", "save", default=None, help="Save the results as a baseline.", type=click.Path(dir_okay=False))
+@click.option(
+    "--compare", "baseline", default=None, help="Compare the results with a baseline.",
+    type=click.Path(exists=True, dir_okay=False)
+)
+@click.option("--tolerance", default=0.3, help="Allowed relative throughput regression.", type=float)
+@click.option("--gap-tolerance", default=0.01, help="Allowed absolute increase of the quality gap.", type=float)
+def main(quick: bool, passes: int, save: str, baseline: str, tolerance: float, gap_tolerance: float):
+    """Runs the benchmark suite."""
+    results = run(quick, passes)
+    width = max(len(result["name"]) for result in results)
+    for result in results:
+        quality = "" if result["gap"] is None else f"gap {result['gap']:.4f}"
+        print(f"{result['name']:{width}}", f"{result['metric']:22}", f"{result['value']:14.2f}", quality, sep=" | ")
+    if save is not None:
+        with open(save, 'w') as target:
+            json.dump({"quick": quick, "results": results}, target, indent=2)
+    if baseline is not None:
+        with open(baseline, 'r') as source:
+            saved = json.load(source)
+        if saved.get("quick") != quick:
+            print(f"WARNING baseline was measured with quick={saved.get('quick')}", file=sys.stderr)
+        regressions = compare(results, saved["results"], tolerance, gap_tolerance)
+        for regression in regressions:
+            print("REGRESSION", regression, file=sys.stderr)
+        print(f"{len(regressions)} regressions", file=sys.stderr)
+        if regressions:
+            raise click.exceptions.Exit(1)
+
+
+if __name__ == "__main__":
+    main()
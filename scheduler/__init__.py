@@ -1,14 +1,61 @@
-from .algorithms import brute_force_iterative
-from .algorithms import brute_force_recursive
-from .algorithms import greedy
-from .algorithms import jakub_genetic
-from .algorithms import lpt
-from .algorithms import eryk_heuristic
-from .algorithms.eryk_heuristic import SolutionsQueue
-from .problem import Instance, InstanceSolution
-from .generator import generate
-from .exceptions import FileContentError
+import importlib
 
+# The submodules and the names below are imported on the first access (PEP 562), so importing the package, e.g. by
+# a short-lived solve process, doesn't load numpy, toml or matplotlib before they are needed
+_LAZY_ATTRIBUTES = {
+    "brute_force_iterative": (".algorithms.brute_force_iterative", None),
+    "brute_force_recursive": (".algorithms.brute_force_recursive", None),
+    "branch_and_bound": (".algorithms.branch_and_bound", None),
+    "dynamic_programming": (".algorithms.dynamic_programming", None),
+    "greedy": (".algorithms.greedy", None),
+    "jakub_genetic": (".algorithms.jakub_genetic", None),
+    "lpt": (".algorithms.lpt", None),
+    "karmarkar_karp": (".algorithms.karmarkar_karp", None),
+    "multifit": (".algorithms.multifit", None),
+    "list_scheduling": (".algorithms.list_scheduling", None),
+    "local_search": (".algorithms.local_search", None),
+    "eryk_heuristic": (".algorithms.eryk_heuristic", None),
+    "SolutionsQueue": (".algorithms.eryk_heuristic", "SolutionsQueue"),
+    "Instance": (".problem", "Instance"),
+    "InstanceSolution": (".problem", "InstanceSolution"),
+    "convert_txt_to_bin": (".problem", "convert_txt_to_bin"),
+    "convert_bin_to_txt": (".problem", "convert_bin_to_txt"),
+    "CompactSolution": (".compact", "CompactSolution"),
+    "generate": (".generator", "generate"),
+    "generate_vectorized": (".generator", "generate_vectorized"),
+    "generate_batch": (".generator", "generate_batch"),
+    "FileContentError": (".exceptions", "FileContentError"),
+    "anytime": (".anytime", None),
+    "bounds": (".bounds", None),
+    "batch": (".batch", None),
+    "cache": (".cache", None),
+    "checkpoint": (".checkpoint", None),
+    "gantt": (".gantt", None),
+    "report": (".report", None),
+    "profiling": (".profiling", None),
+    "algorithms": (".algorithms", None),
+    "compact": (".compact", None),
+    "exceptions": (".exceptions", None),
+    "generator": (".generator", None),
+    "problem": (".problem", None),
+}
 
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    value = importlib.import_module(module_name, __name__)
+    if attribute is not None:
+        value = getattr(value, attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_LAZY_ATTRIBUTES})
+
+
+__all__ = list(_LAZY_ATTRIBUTES)
 __version__ = "1.0.0"
 __authors__ = ["Jakub Błażejowski", "Eryk Andrzejewski"]
@@ -0,0 +1,293 @@
+from scheduler.problem import Instance, InstanceSolution
+from scheduler.algorithms import lpt
+from scheduler.bounds import lower_bound
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator
+import multiprocessing
+import os
+
+# Number of visited nodes between two checks of the shared bound (must be a power of 2)
+SYNCHRONIZATION_PERIOD = 1024
+# Minimal number of subtrees per worker in the parallel search
+SUBTREES_PER_WORKER = 8
+
+
+class BranchAndBound:
+    """Depth-first branch and bound search over the assignments of tasks to processors.
+
+    :ivar tasks_durations: durations of the tasks, sorted in decreasing order
+    :type tasks_durations: list
+    :ivar processors_number: number of available processors
+    :type processors_number: int
+    :ivar lower_bound: the search stops as soon as a solution with this total time is found
+    :type lower_bound: int
+    :ivar bound: only solutions with total time lower than bound are explored
+    :type bound: int
+    :ivar best: total time of the best solution found by this search, None if there's no such solution
+    :type best: int
+    :ivar best_assignment: best_assignment[task_index] = processor assigned to the task in the best solution
+    :type best_assignment: list
+    :ivar nodes: number of visited nodes
+    :type nodes: int
+    :ivar shared: optional synchronized value with the best total time found by other searches
+    """
+    def __init__(self, tasks_durations: list, processors_number: int, upper_bound: int, lower_bound: int, shared=None):
+        """Creates a py:class:`BranchAndBound` object.
+
+        :param tasks_durations: durations of the tasks, sorted in decreasing order
+        :param processors_number: number of available processors
+        :param upper_bound: total time of a known solution
+        :param lower_bound: lower bound of the optimal total time
+        :param shared: optional synchronized value (e.g. multiprocessing.Value) shared with other searches
+        """
+        self.tasks_durations = tasks_durations
+        self.processors_number = processors_number
+        self.lower_bound = lower_bound
+        self.bound = upper_bound
+        self.best = None
+        self.best_assignment = None
+        self.nodes = 0
+        self.shared = shared
+
+    def synchronize(self):
+        """Lowers the bound to the best total time found by other searches."""
+        if self.shared is not None and self.shared.value < self.bound:
+            self.bound = self.shared.value
+
+    def improve(self, total_time: int, assignment: list):
+        """Stores a new best solution and publishes its total time to other searches."""
+        self.best = self.bound = total_time
+        self.best_assignment = list(assignment)
+        if self.shared is not None:
+            with self.shared.get_lock():
+                if total_time < self.shared.value:
+                    self.shared.value = total_time
+
+    def run(self, prefix: tuple = ()):
+        """Searches all assignments which start with the given prefix.
+
+        :param prefix: prefix[task_index] = processor assigned to one of the first tasks
+        :return: total time and assignment of the best solution found, (None, None) if none beat the bound
+        """
+        durations = self.tasks_durations
+        processors_number = self.processors_number
+        tasks_number = len(durations)
+        loads = [0] * processors_number
+        assignment = [0] * tasks_number
+        for task_index, processor in enumerate(prefix):
+            assignment[task_index] = processor
+            loads[processor] += durations[task_index]
+        remaining = [0] * (tasks_number + 1)
+        for task_index in range(tasks_number - 1, -1, -1):
+            remaining[task_index] = remaining[task_index + 1] + durations[task_index]
+
+        self.synchronize()
+        if max(loads) >= self.bound:
+            return self.best, self.best_assignment
+        # The search is as deep as the number of tasks, so it keeps its own stack instead of recursing. The task
+        # index is the depth, the stack is made of the processors left to try and the loads tried for every task.
+        first = len(prefix)
+        processors = range(processors_number)
+        untried = [None] * tasks_number
+        tried = [None] * tasks_number
+        smallest = durations[-1] if durations else 0
+        # The bound and the number of nodes are kept in locals, they're read by every node
+        bound = self.bound
+        lower = self.lower_bound
+        nodes = self.nodes
+        task_index = first
+        while True:
+            nodes += 1
+            if nodes & (SYNCHRONIZATION_PERIOD - 1) == 0:
+                self.synchronize()
+                bound = self.bound
+                if bound <= lower:
+                    break
+            if task_index == tasks_number:
+                total_time = max(loads)
+                if total_time < bound:
+                    self.improve(total_time, assignment)
+                    bound = total_time
+                    if bound <= lower:
+                        break
+                task_index -= 1
+            else:
+                # Slack smaller than the shortest task is wasted, so the remaining tasks have to fit into the rest
+                capacity = bound - 1
+                slack = 0
+                for load in loads:
+                    if capacity - load >= smallest:
+                        slack += capacity - load
+                if slack < remaining[task_index]:
+                    task_index -= 1
+                else:
+                    assignment[task_index] = -1
+                    untried[task_index] = iter(processors)
+                    tried[task_index] = set()
+            # Backtracks to the deepest task which can still be assigned to another processor
+            while task_index >= first:
+                duration = durations[task_index]
+                processor = assignment[task_index]
+                if processor >= 0:
+                    loads[processor] -= duration
+                tried_loads = tried[task_index]
+                # Processors with equal loads lead to symmetric subtrees, so only the first one of them is explored
+                for processor in untried[task_index]:
+                    load = loads[processor]
+                    if load not in tried_loads and load + duration < bound:
+                        tried_loads.add(load)
+                        loads[processor] = load + duration
+                        assignment[task_index] = processor
+                        break
+                else:
+                    task_index -= 1
+                    continue
+                break
+            else:
+                break
+            task_index += 1
+        self.nodes = nodes
+        return self.best, self.best_assignment
+
+
+def generate_prefixes(tasks_durations: list, processors_number: int, depth: int, bound: int) -> Iterator[tuple]:
+    """Yields the assignments of the first tasks which may lead to a solution better than the bound.
+
+    :param tasks_durations: durations of the tasks, sorted in decreasing order
+    :param processors_number: number of available processors
+    :param depth: number of assigned tasks
+    :param bound: total time of a known solution
+    :return: prefix[task_index] = processor assigned to the task
+    """
+    loads = [0] * processors_number
+    prefix = []
+
+    def branch(task_index):
+        if task_index == depth:
+            yield tuple(prefix)
+            return
+        duration = tasks_durations[task_index]
+        tried = set()
+        for processor in range(processors_number):
+            load = loads[processor]
+            if load in tried or load + duration >= bound:
+                continue
+            tried.add(load)
+            loads[processor] = load + duration
+            prefix.append(processor)
+            yield from branch(task_index + 1)
+            prefix.pop()
+            loads[processor] = load
+
+    yield from branch(0)
+
+
+def split(tasks_durations: list, processors_number: int, bound: int, workers: int, depth: int = None) -> list:
+    """Splits the search tree into subtrees, by default at the smallest depth giving enough of them for the workers.
+
+    :param tasks_durations: durations of the tasks, sorted in decreasing order
+    :param processors_number: number of available processors
+    :param bound: total time of a known solution
+    :param workers: number of workers
+    :param depth: optional number of tasks assigned in every subtree root
+    :return: list of prefixes
+    """
+    if depth is not None:
+        return list(generate_prefixes(tasks_durations, processors_number, depth, bound))
+    prefixes = [()]
+    for depth in range(1, len(tasks_durations) + 1):
+        prefixes = list(generate_prefixes(tasks_durations, processors_number, depth, bound))
+        if len(prefixes) >= SUBTREES_PER_WORKER * workers:
+            break
+    return prefixes
+
+
+_shared_bound = None
+
+
+def _initialize_worker(shared):
+    global _shared_bound
+    _shared_bound = shared
+
+
+def _search_subtree(tasks_durations: list, processors_number: int, bound: int, prefix: tuple) -> tuple:
+    search = BranchAndBound(tasks_durations, processors_number, _shared_bound.value, bound, _shared_bound)
+    return search.run(prefix)
+
+
+def _to_solution(instance: Instance, order: list, assignment: list) -> InstanceSolution:
+    processors = [[] for _ in range(instance.processors_number)]
+    for position, processor in enumerate(assignment):
+        processors[processor].append(order[position])
+    return InstanceSolution(instance, processors)
+
+
+def solve(instance: Instance) -> InstanceSolution:
+    """Solves the P||Cmax problem exactly by using a branch and bound algorithm.
+
+    :param instance: valid problem instance
+    :return: optimal solution of a given problem instance
+    """
+    order = sorted(range(len(instance.tasks_durations)), key=instance.tasks_durations.__getitem__, reverse=True)
+    tasks_durations = [instance.tasks_durations[task_index] for task_index in order]
+    bound = lower_bound(tasks_durations, instance.processors_number)
+
+    best_solution = lpt.solve(instance)
+    if best_solution.total_time <= bound:
+        return best_solution
+
+    search = BranchAndBound(tasks_durations, instance.processors_number, best_solution.total_time, bound)
+    _, assignment = search.run()
+    if assignment is None:
+        return best_solution
+
+    return _to_solution(instance, order, assignment)
+
+
+def solve_parallel(instance: Instance, workers: int = None, split_depth: int = None) -> InstanceSolution:
+    """Solves the P||Cmax problem exactly by using a branch and bound algorithm distributed across processes.
+
+    The search tree is split at a fixed depth and the subtrees are searched by a process pool.
+    Workers share the best total time found so far, so every one of them prunes with it.
+
+    :param instance: valid problem instance
+    :param workers: number of processes, defaults to the number of CPUs
+    :param split_depth: number of tasks assigned in the root of every subtree, chosen automatically by default
+    :return: optimal solution of a given problem instance
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    order = sorted(range(len(instance.tasks_durations)), key=instance.tasks_durations.__getitem__, reverse=True)
+    tasks_durations = [instance.tasks_durations[task_index] for task_index in order]
+    bound = lower_bound(tasks_durations, instance.processors_number)
+
+    best_solution = lpt.solve(instance)
+    if best_solution.total_time <= bound:
+        return best_solution
+
+    prefixes = split(tasks_durations, instance.processors_number, best_solution.total_time, workers, split_depth)
+    shared = multiprocessing.Value("q", best_solution.total_time)
+    best_total_time = best_solution.total_time
+    best_assignment = None
+    with ProcessPoolExecutor(workers, initializer=_initialize_worker, initargs=(shared,)) as executor:
+        futures = [
+            executor.submit(_search_subtree, tasks_durations, instance.processors_number, bound, prefix)
+            for prefix in prefixes
+        ]
+        for future in as_completed(futures):
+            total_time, assignment = future.result()
+            if assignment is not None and total_time < best_total_time:
+                best_total_time = total_time
+                best_assignment = assignment
+            if best_total_time <= bound:
+                for pending in futures:
+                    pending.cancel()
+                break
+
+    if best_assignment is None:
+        return best_solution
+
+    return _to_solution(instance, order, best_assignment)
+
+
+__all__ = ["solve", "solve_parallel", "BranchAndBound"]
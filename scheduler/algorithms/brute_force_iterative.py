@@ -1,4 +1,5 @@
 from scheduler.problem import Instance, InstanceSolution
+from scheduler.bounds import lower_bound
 from typing import Iterator
 
 
@@ -59,10 +60,19 @@ class Processors(Lists):
         :ivar used: number of processors that have at least one task assigned to them
         :ivar storage: storage[processor_index] = list of tasks that are currently assigned to the processor
         :ivar storage: list
+        :ivar tasks_durations: optional durations of the tasks, enables tracking of the loads
+        :type tasks_durations: list
+        :ivar loads: loads[processor_index] = sum of durations of the tasks assigned to the processor
+        :type loads: list
+        :ivar peaks: peaks[-1] = current maximal load, one entry per assigned task
+        :type peaks: list
         """
-    def __init__(self, n_processors):
+    def __init__(self, n_processors, tasks_durations=None):
         super().__init__(n_processors)
         self.storage = [[] for _ in range(n_processors)]
+        self.tasks_durations = tasks_durations
+        self.loads = [0 for _ in range(n_processors)]
+        self.peaks = [0]
 
     def free(self):
         return self.number - self.used
@@ -71,32 +81,41 @@ class Processors(Lists):
         if len(self.storage[self.current]) == 0 and self.used < self.number - 1:
             self.used += 1
         self.storage[self.current].append(value)
+        if self.tasks_durations is not None:
+            self.loads[self.current] += self.tasks_durations[value]
+            self.peaks.append(max(self.peaks[-1], self.loads[self.current]))
 
     def pop_from_current(self):
         result = self.storage[self.current].pop()
         if len(self.storage[self.current]) == 0 and self.used > 0:
             self.used = self.current - 1
+        if self.tasks_durations is not None:
+            self.loads[self.current] -= self.tasks_durations[result]
+            self.peaks.pop()
         return result
 
     def len_current(self):
         return len(self.storage[self.current])
 
+    def total_time(self):
+        """Returns the maximal load, tasks are pushed and popped in LIFO order so the peaks stack stays valid."""
+        return self.peaks[-1]
 
-def brute_generator(tasks_number: int, processors_number: int) -> Iterator[list]:
-    """Yields all of the possible combinations of process assignment.
 
-    :param tasks_number:
-    :param processors_number:
-    :return: list of processors with tasks assigned to them
+def enumerate_assignments(tasks: Tasks, processors: Processors) -> Iterator[None]:
+    """Walks through all of the possible combinations of process assignment.
+
+    Yields once every time the tasks and processors helpers describe a complete assignment.
+
+    :param tasks: helper with no assigned tasks
+    :param processors: helper with no assigned tasks
     """
-    tasks = Tasks(tasks_number)
-    processors = Processors(processors_number)
     lower_bound = True
     upper_bound = True
 
     while lower_bound:
         if not upper_bound:
-            yield [list(processor) for processor in processors.storage]
+            yield
             upper_bound = True
             continue
 
@@ -124,17 +143,52 @@ def brute_generator(tasks_number: int, processors_number: int) -> Iterator[list]
             upper_bound = tasks.next()
 
 
+def brute_generator(tasks_number: int, processors_number: int) -> Iterator[list]:
+    """Yields all of the possible combinations of process assignment.
+
+    :param tasks_number:
+    :param processors_number:
+    :return: list of processors with tasks assigned to them
+    """
+    processors = Processors(processors_number)
+    for _ in enumerate_assignments(Tasks(tasks_number), processors):
+        yield [list(processor) for processor in processors.storage]
+
+
+def brute_scored_generator(tasks_durations: list, processors_number: int) -> Iterator[tuple]:
+    """Yields the total time of every possible combination of process assignment without copying it.
+
+    :param tasks_durations: durations of the tasks
+    :param processors_number:
+    :return: total time and assignment[task_index] = processor, the assignment is only valid until the next step
+    """
+    tasks = Tasks(len(tasks_durations))
+    processors = Processors(processors_number, tasks_durations)
+    for _ in enumerate_assignments(tasks, processors):
+        yield processors.total_time(), tasks.storage
+
+
 def solve(instance: Instance) -> InstanceSolution:
     """Solves the P||Cmax problem by using an iterative version of a brute force algorithm.
 
     :param instance: valid problem instance
     :return: generated solution of a given problem instance
     """
-    all_possible_partitions = brute_generator(len(instance.tasks_durations), instance.processors_number)
-    solutions = map(lambda p: InstanceSolution(instance, p), all_possible_partitions)
-    best_solution = min(solutions, key=lambda s: s.total_time)
-
-    return best_solution
+    bound = lower_bound(instance.tasks_durations, instance.processors_number)
+    best_total_time = None
+    best_assignment = None
+    for total_time, assignment in brute_scored_generator(instance.tasks_durations, instance.processors_number):
+        if best_total_time is None or total_time < best_total_time:
+            best_total_time = total_time
+            best_assignment = list(assignment)
+            if best_total_time <= bound:
+                break
+
+    processors = [[] for _ in range(instance.processors_number)]
+    for task_index, processor in enumerate(best_assignment):
+        processors[processor].append(task_index)
+
+    return InstanceSolution(instance, processors)
 
 
 __all__ = ["solve"]
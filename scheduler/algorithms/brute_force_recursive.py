@@ -1,4 +1,5 @@
 from scheduler.problem import Instance, InstanceSolution
+from scheduler.bounds import lower_bound
 from typing import Iterator
 
 
@@ -34,7 +35,13 @@ def solve(instance: Instance) -> InstanceSolution:
     tasks_indexes = list(range(len(instance.tasks_durations)))
     all_possible_partitions = generate_partitions(tasks_indexes, instance.processors_number)
     solutions = map(lambda p: InstanceSolution(instance, p), all_possible_partitions)
-    best_solution = min(solutions, key=lambda s: s.total_time)
+    bound = lower_bound(instance.tasks_durations, instance.processors_number)
+    best_solution = None
+    for solution in solutions:
+        if best_solution is None or solution.total_time < best_solution.total_time:
+            best_solution = solution
+            if best_solution.total_time <= bound:
+                break
 
     return best_solution
 
@@ -0,0 +1,262 @@
+from scheduler.problem import Instance, InstanceSolution
+from scheduler.algorithms import lpt, multifit
+from scheduler.bounds import lower_bound
+from scheduler.exceptions import StateLimitError
+import heapq
+import numpy
+
+# Default maximal size of the tables of the exact dynamic programming (in bytes)
+MEMORY_LIMIT = 256 * 2 ** 20
+# Approximate memory used per state of the exact dynamic programming, including the temporary arrays
+TWO_PROCESSORS_BYTES = 8
+THREE_PROCESSORS_BYTES = 24
+# Default maximal number of states of the dynamic programming of the PTAS
+STATE_LIMIT = 2 ** 20
+# Default precision of the PTAS, the result is at most (1 + epsilon) times the optimum
+EPSILON = 0.2
+
+
+def _to_solution(instance: Instance, assignment: list) -> InstanceSolution:
+    processors = [[] for _ in range(instance.processors_number)]
+    for task_index, processor in enumerate(assignment):
+        processors[processor].append(task_index)
+    return InstanceSolution(instance, processors)
+
+
+def solve_two(instance: Instance, memory_limit: int = MEMORY_LIMIT) -> InstanceSolution:
+    """Solves the P2||Cmax problem exactly with a subset sum over the reachable loads of the first processor.
+
+    The reachable loads are a boolean vector updated with one shifted OR per task. For every load the index of
+    the task which made it reachable is kept, which is enough to reconstruct the subset in O(n).
+
+    :param instance: valid problem instance with 2 processors
+    :param memory_limit: maximal size of the tables in bytes
+    :raise StateLimitError: if the tables would exceed the memory limit
+    :return: optimal solution of a given problem instance
+    """
+    tasks_durations = [int(duration) for duration in instance.tasks_durations]
+    capacity = sum(tasks_durations) // 2
+    if TWO_PROCESSORS_BYTES * (capacity + 1) > memory_limit:
+        raise StateLimitError(f"{capacity + 1} loads exceed the memory limit")
+    reachable = numpy.zeros(capacity + 1, dtype=bool)
+    reachable[0] = True
+    first = numpy.full(capacity + 1, -1, dtype=numpy.int32)
+    for task_index, duration in enumerate(tasks_durations):
+        if 0 < duration <= capacity:
+            reached = reachable[:-duration] & ~reachable[duration:]
+            first[duration:][reached] = task_index
+            reachable[duration:] |= reached
+
+    load = int(numpy.flatnonzero(reachable)[-1])
+    assignment = [1] * len(tasks_durations)
+    while load > 0:
+        task_index = int(first[load])
+        assignment[task_index] = 0
+        load -= tasks_durations[task_index]
+    return _to_solution(instance, assignment)
+
+
+def solve_three(instance: Instance, memory_limit: int = MEMORY_LIMIT) -> InstanceSolution:
+    """Solves the P3||Cmax problem exactly with a dynamic programming over the loads of the first two processors.
+
+    Loads above the total time of the LPT solution are never better, so they aren't stored. For every pair of
+    loads the task which made it reachable and its processor are kept for the reconstruction.
+
+    :param instance: valid problem instance with 3 processors
+    :param memory_limit: maximal size of the tables in bytes
+    :raise StateLimitError: if the tables would exceed the memory limit
+    :return: optimal solution of a given problem instance
+    """
+    tasks_durations = [int(duration) for duration in instance.tasks_durations]
+    total = sum(tasks_durations)
+    best_solution = lpt.solve(instance)
+    if best_solution.total_time <= lower_bound(tasks_durations, 3):
+        return best_solution
+    capacity = best_solution.total_time - 1
+    if THREE_PROCESSORS_BYTES * (capacity + 1) ** 2 > memory_limit:
+        raise StateLimitError(f"{(capacity + 1) ** 2} pairs of loads exceed the memory limit")
+    reachable = numpy.zeros((capacity + 1, capacity + 1), dtype=bool)
+    reachable[0, 0] = True
+    # first[a, b] = 2 * task_index + processor of the task which made the loads reachable
+    first = numpy.full((capacity + 1, capacity + 1), -1, dtype=numpy.int32)
+    for task_index, duration in enumerate(tasks_durations):
+        if not 0 < duration <= capacity:
+            continue
+        previous = reachable.copy()
+        reached = previous[:-duration, :] & ~reachable[duration:, :]
+        first[duration:, :][reached] = 2 * task_index
+        reachable[duration:, :] |= reached
+        reached = previous[:, :-duration] & ~reachable[:, duration:]
+        first[:, duration:][reached] = 2 * task_index + 1
+        reachable[:, duration:] |= reached
+
+    loads = numpy.arange(capacity + 1)
+    peaks = numpy.maximum(numpy.maximum(loads[:, None], loads[None, :]), total - loads[:, None] - loads[None, :])
+    peaks[~reachable] = total + 1
+    first_load, second_load = numpy.unravel_index(int(numpy.argmin(peaks)), peaks.shape)
+    if peaks[first_load, second_load] >= best_solution.total_time:
+        return best_solution
+
+    first_load, second_load = int(first_load), int(second_load)
+    assignment = [2] * len(tasks_durations)
+    while first_load > 0 or second_load > 0:
+        task_index, processor = divmod(int(first[first_load, second_load]), 2)
+        assignment[task_index] = processor
+        if processor == 0:
+            first_load -= tasks_durations[task_index]
+        else:
+            second_load -= tasks_durations[task_index]
+    return _to_solution(instance, assignment)
+
+
+def _configurations(types: list, counts: list, units: int) -> list:
+    """Returns all nonzero numbers of large tasks of every type which fit on a processor."""
+    configurations = []
+
+    def extend(configuration, type_index, free):
+        if type_index == len(types):
+            if any(configuration):
+                configurations.append(tuple(configuration))
+            return
+        for count in range(min(counts[type_index], free // types[type_index]) + 1):
+            extend(configuration + [count], type_index + 1, free - count * types[type_index])
+
+    extend([], 0, units)
+    return configurations
+
+
+def dual_schedule(tasks_durations: list, processors_number: int, capacity: int, epsilon: float = EPSILON,
+                  state_limit: int = STATE_LIMIT):
+    """Dual approximation step of the Hochbaum-Shmoys PTAS.
+
+    Tasks longer than epsilon * capacity are large, their durations are rounded down to multiples of
+    epsilon^2 * capacity and packed optimally by a dynamic programming over the numbers of the remaining large
+    tasks of every rounded duration. Small tasks are then assigned to the least loaded processors.
+
+    :param tasks_durations: durations of the tasks
+    :param processors_number: number of available processors
+    :param capacity: guessed total time
+    :param epsilon: precision of the approximation
+    :param state_limit: maximal number of states of the dynamic programming
+    :raise StateLimitError: if the dynamic programming would exceed the state limit
+    :return: assignment[task_index] = processor with total time at most (1 + epsilon) * capacity, or None if
+        capacity is proven lower than the optimal total time
+    """
+    if max(tasks_durations) > capacity:
+        return None
+    unit = epsilon * epsilon * capacity
+    large = [task_index for task_index, duration in enumerate(tasks_durations) if duration > epsilon * capacity]
+    rounded = {task_index: int(tasks_durations[task_index] // unit) for task_index in large}
+    types = sorted(set(rounded.values()))
+    pools = {size: [] for size in types}
+    for task_index in large:
+        pools[rounded[task_index]].append(task_index)
+    counts = [len(pools[size]) for size in types]
+    shape = tuple(count + 1 for count in counts)
+    if numpy.prod(shape, dtype=float) > state_limit:
+        raise StateLimitError(f"{numpy.prod(shape, dtype=float):.0f} states exceed the state limit")
+
+    # processors[state] = minimal number of processors executing the large tasks counted by the state
+    configurations = _configurations(types, counts, int(capacity // unit))
+    processors = numpy.full(shape, processors_number + 1, dtype=numpy.int32)
+    processors[(0,) * len(types)] = 0
+    for used in range(processors_number):
+        frontier = processors == used
+        if not frontier.any() or processors[tuple(counts)] <= processors_number:
+            break
+        for configuration in configurations:
+            target = tuple(slice(count, None) for count in configuration)
+            source = tuple(slice(0, size - count) for size, count in zip(shape, configuration))
+            processors[target] = numpy.where(
+                frontier[source] & (processors[target] > used + 1), used + 1, processors[target]
+            )
+    if processors[tuple(counts)] > processors_number:
+        return None
+
+    assignment = [-1] * len(tasks_durations)
+    loads = [0] * processors_number
+    state = list(counts)
+    processor = 0
+    while any(state):
+        used = processors[tuple(state)]
+        for configuration in configurations:
+            previous = tuple(count - taken for count, taken in zip(state, configuration))
+            if min(previous) >= 0 and processors[previous] == used - 1:
+                break
+        for size, taken in zip(types, configuration):
+            for _ in range(taken):
+                task_index = pools[size].pop()
+                assignment[task_index] = processor
+                loads[processor] += tasks_durations[task_index]
+        state = list(previous)
+        processor += 1
+
+    heap = [(load, processor) for processor, load in enumerate(loads)]
+    heapq.heapify(heap)
+    for task_index, duration in enumerate(tasks_durations):
+        if assignment[task_index] == -1:
+            load, processor = heap[0]
+            if load >= capacity:
+                return None
+            assignment[task_index] = processor
+            heapq.heapreplace(heap, (load + duration, processor))
+    return assignment
+
+
+def ptas(instance: Instance, epsilon: float = EPSILON, state_limit: int = STATE_LIMIT) -> InstanceSolution:
+    """Solves the P||Cmax problem approximately by using the Hochbaum-Shmoys PTAS.
+
+    The smallest total time for which py:func:`dual_schedule` succeeds is binary searched between the lower bound
+    and the total time of the LPT solution, the result is at most (1 + epsilon) times the optimal total time.
+
+    :param instance: valid problem instance
+    :param epsilon: precision of the approximation
+    :param state_limit: maximal number of states of the dynamic programming
+    :raise StateLimitError: if the dynamic programming would exceed the state limit
+    :return: generated solution of a given problem instance
+    """
+    tasks_durations = [int(duration) for duration in instance.tasks_durations]
+    best_solution = lpt.solve(instance)
+    low = lower_bound(tasks_durations, instance.processors_number)
+    high = best_solution.total_time
+    while low < high:
+        capacity = (low + high) // 2
+        assignment = dual_schedule(tasks_durations, instance.processors_number, capacity, epsilon, state_limit)
+        if assignment is None:
+            low = capacity + 1
+            continue
+        high = capacity
+        solution = _to_solution(instance, assignment)
+        if solution.total_time < best_solution.total_time:
+            best_solution = solution
+    return best_solution
+
+
+def solve(instance: Instance, epsilon: float = EPSILON, memory_limit: int = MEMORY_LIMIT,
+          state_limit: int = STATE_LIMIT) -> InstanceSolution:
+    """Solves the P||Cmax problem by using a dynamic programming.
+
+    Instances with 2 or 3 processors are solved exactly if the tables fit in the memory limit, the others with
+    the PTAS. If the PTAS exceeds its state limit, the MULTIFIT solution is returned.
+
+    :param instance: valid problem instance
+    :param epsilon: precision of the PTAS
+    :param memory_limit: maximal size of the tables of the exact dynamic programming in bytes
+    :param state_limit: maximal number of states of the dynamic programming of the PTAS
+    :return: generated solution of a given problem instance
+    """
+    if len(instance.tasks_durations) == 0 or instance.processors_number == 1:
+        return lpt.solve(instance)
+    exact = {2: solve_two, 3: solve_three}.get(instance.processors_number)
+    if exact is not None:
+        try:
+            return exact(instance, memory_limit)
+        except StateLimitError:
+            pass
+    try:
+        return ptas(instance, epsilon, state_limit)
+    except StateLimitError:
+        return multifit.solve(instance)
+
+
+__all__ = ["solve", "solve_two", "solve_three", "ptas", "dual_schedule"]
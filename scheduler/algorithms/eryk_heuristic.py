@@ -1,16 +1,26 @@
-import math
+import bisect
 import copy
 import heapq
+import itertools
+import queue as queues
 import random
-from threading import Event, Timer, Thread, Lock
+import signal
+import multiprocessing
+from threading import Condition, Event, Timer, Thread
 
 import scheduler
 from scheduler.problem import Instance, InstanceSolution
+from scheduler.bounds import lower_bound
+from scheduler.checkpoint import assignment_of
+from scheduler.compact import CompactSolution
+from scheduler.profiling import NULL_PROFILER
 
 # Default arguments
+POP_TIMEOUT = 0.1
 THREADS = 8
 THREAD_POPULATION_SIZE = 32
 BEST_SPECIMENS_PER_THREAD = 6
+MIGRATION_PERIOD = 16
 
 
 def index_of_min(iterable):
@@ -21,40 +31,117 @@ def index_of_max(iterable):
 
 
 class SolutionsQueue:
-    def __init__(self, size):
-        self.stored_elements = 2 ** math.ceil(math.log(size + 1, 2))
+    """Bounded, thread safe container keeping the best distinct solutions.
+
+    :ivar size: maximal number of stored solutions
+    :type size: int
+    :ivar queue: stored (total_time, insertion_number, schedule, solution) tuples, sorted from the best
+    :type queue: list
+    :ivar schedules: schedules of the stored solutions, used for rejecting duplicates
+    :type schedules: set
+    :ivar profiler: py:class:`scheduler.profiling.Profiler` measuring the time spent waiting for the lock as the
+        "<name>.lock" phase and for a solution as the "<name>.wait" phase
+    """
+    def __init__(self, size, profiler=None, name="queue"):
+        self.size = size
         self.queue = []
-        self.lock = Lock()
+        self.schedules = set()
+        self.counter = itertools.count()
+        self.condition = Condition()
+        self.profiler = NULL_PROFILER if profiler is None else profiler
+        self.lock_phase = f"{name}.lock"
+        self.wait_phase = f"{name}.wait"
 
-    def push(self, element):
-        with self.lock:
-            heapq.heappush(self.queue, element)
-            if len(self.queue) > self.stored_elements:
-                self.queue = self.queue[:self.stored_elements]
+    def locked(self):
+        return self.profiler.acquire(self.lock_phase, self.condition)
 
-    def pop(self):
-        while True:
-            with self.lock:
-                if not self.empty():
-                    return heapq.heappop(self.queue)
+    @staticmethod
+    def schedule(element):
+        return tuple(tuple(sorted(processor)) for processor in element.processors)
+
+    def push(self, element):
+        """Stores the solution if it's not a duplicate and it's one of the best ones.
+
+        :param element: solution
+        :return: True if the solution was stored
+        """
+        schedule = self.schedule(element)
+        with self.locked():
+            if schedule in self.schedules:
+                return False
+            if len(self.queue) >= self.size and element.total_time >= self.queue[-1][0]:
+                return False
+            bisect.insort(self.queue, (element.total_time, next(self.counter), schedule, element))
+            self.schedules.add(schedule)
+            if len(self.queue) > self.size:
+                _, _, removed, _ = self.queue.pop()
+                self.schedules.discard(removed)
+            self.condition.notify()
+            return True
+
+    def pop(self, timeout=None):
+        """Removes and returns the best solution, waits until one is available.
+
+        :param timeout: maximal waiting time in seconds, None means no limit
+        :raise queue.Empty: if no solution became available before the timeout
+        :return: the best solution
+        """
+        with self.locked():
+            with self.profiler.phase(self.wait_phase):
+                available = self.condition.wait_for(lambda: len(self.queue) > 0, timeout)
+            if not available:
+                raise queues.Empty()
+            _, _, schedule, element = self.queue.pop(0)
+            self.schedules.discard(schedule)
+            return element
 
     def empty(self):
-        return len(self.queue) == 0
+        with self.locked():
+            return len(self.queue) == 0
 
     def best(self):
-        with self.lock:
-            return self.queue[0]
+        """Returns the best solution without removing it.
+
+        :raise queue.Empty: if there are no solutions
+        """
+        with self.locked():
+            if len(self.queue) == 0:
+                raise queues.Empty()
+            return self.queue[0][-1]
+
+    def solutions(self):
+        """Returns the stored solutions without removing them, sorted from the best."""
+        with self.locked():
+            return [element for *_, element in self.queue]
+
+    def __len__(self):
+        with self.locked():
+            return len(self.queue)
 
 
 # Odwołuje się do zadań normalnie po wartościach, nie indeksach
 class GeneticSolution(InstanceSolution):
     def __init__(self, initial: InstanceSolution):
         super().__init__(initial.instance, initial.processors)
-        self.processors_times = list(map(sum, self))
+        self._loads = list(initial.loads)
+
+    @property
+    def processors_times(self):
+        # Kept up to date in place by mutate and cross, together with total_time
+        return self.loads
 
     def __lt__(self, other):
         return self.score() < other.score()
 
+    def __deepcopy__(self, memo):
+        # The instance is never modified, so copies share it instead of duplicating the tasks durations
+        result = GeneticSolution.__new__(GeneticSolution)
+        result.instance = self.instance
+        result.processors = [list(processor) for processor in self.processors]
+        result._loads = list(self.loads)
+        result._total_time = self.total_time
+        return result
+
 
     def score(self):
         return self.total_time
@@ -115,51 +202,329 @@ class GeneticSolution(InstanceSolution):
 
 
 
-def algorithm_thread(queue, results_queue, stop_event, solution_produced, thread_population_size, best_specimens_per_thread):
-    while not stop_event.is_set():
-        parent = queue.pop()
-        
+def evolve(queue, thread_population_size, best_specimens_per_thread, improve=None, profiler=NULL_PROFILER):
+    with profiler.phase("pop"):
+        parent = queue.pop(timeout=POP_TIMEOUT)
+
+    with profiler.phase("copy"):
         population = [copy.deepcopy(parent) for _ in range(thread_population_size)]
+    with profiler.phase("mutate"):
         for specimen in population:
             specimen.mutate()
 
+    with profiler.phase("select"):
         best_specimens = heapq.nsmallest(best_specimens_per_thread, population, key=lambda s: s.score())
+    if improve is not None:
+        with profiler.phase("improve"):
+            best_specimens[0] = GeneticSolution(improve(best_specimens[0]))
+    with profiler.phase("cross"):
         for specimen in best_specimens:
             specimen.cross()
+    with profiler.phase("push"):
+        for specimen in best_specimens:
             queue.push(specimen)
 
-        results_queue.push(queue.best())
+    return min(best_specimens, key=lambda s: s.score())
+
+
+def population_of(queue):
+    """Returns the assignment matrix of the solutions stored in the queue, used for checkpoints."""
+    return [assignment_of(solution) for solution in queue.solutions()]
+
+
+def from_assignments(instance, assignments):
+    """Returns the specimens of the (specimens_number x tasks_number) matrix of assignments."""
+    return [GeneticSolution(CompactSolution(instance, assignment).to_instance_solution()) for assignment in assignments]
+
+
+def algorithm_thread(queue, results_queue, stop_event, solution_produced, thread_population_size, best_specimens_per_thread, improve=None, bound=None, checkpoint=None, profiler=NULL_PROFILER, generations=None, thread_index=0):
+    # Every thread counts only its own generations, the checkpoint saves the sum of all threads
+    generations = [0] if generations is None else generations
+    while not stop_event.is_set():
+        try:
+            best_specimen = evolve(queue, thread_population_size, best_specimens_per_thread, improve, profiler)
+        except queues.Empty:
+            continue
+        generations[thread_index] += 1
+        profiler.generation()
+        profiler.improvement(best_specimen.total_time)
+
+        results_queue.push(best_specimen)
         solution_produced(results_queue)
+        # Nothing is better than a solution which reaches the lower bound
+        if bound is not None and best_specimen.total_time <= bound:
+            stop_event.set()
+        if checkpoint is not None and checkpoint.due():
+            with profiler.phase("checkpoint"):
+                checkpoint.save(population_of(queue), sum(generations))
+
+
+def island_process(island_index, initial, inbox, outbox, stop_event, island_population_size, best_specimens_per_island, migration_period, improve=None):
+    """Evolves a separate population and periodically exchanges the best specimens with the coordinator.
+
+    :param island_index: index of the island
+    :param initial: specimen the population starts from
+    :param inbox: multiprocessing queue with immigrants sent by the coordinator
+    :param outbox: multiprocessing queue shared by all islands, receives (island_index, best specimen) pairs
+    :param stop_event: multiprocessing event used for stopping the island
+    :param island_population_size: number of specimens created in every generation
+    :param best_specimens_per_island: number of specimens kept from every generation
+    :param migration_period: number of generations between two migrations
+    :param improve: optional improvement step applied to the best specimen of every generation
+    """
+    # Interruptions are handled by the coordinator, and forked islands mustn't share the random state
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    random.seed()
+
+    queue = SolutionsQueue(island_population_size)
+    queue.push(initial)
+    # Solutions the run is resumed from are sent before the island starts
+    while True:
+        try:
+            queue.push(inbox.get_nowait())
+        except queues.Empty:
+            break
+    generation = 0
+    while not stop_event.is_set():
+        try:
+            evolve(queue, island_population_size, best_specimens_per_island, improve)
+        except queues.Empty:
+            continue
+        generation += 1
+
+        if generation % migration_period == 0:
+            outbox.put((island_index, queue.best()))
+            while True:
+                try:
+                    queue.push(inbox.get_nowait())
+                except queues.Empty:
+                    break
 
 
 def solve(instance: Instance, results_queue: SolutionsQueue, stop_event: Event, solution_produced, threads_number=THREADS,
-          thread_population_size=THREAD_POPULATION_SIZE, best_specimens_per_thread=BEST_SPECIMENS_PER_THREAD) -> InstanceSolution:
+          thread_population_size=THREAD_POPULATION_SIZE, best_specimens_per_thread=BEST_SPECIMENS_PER_THREAD, improve=None,
+          seeder=None, initial=None, checkpoint=None, profiler=None, generation=0) -> InstanceSolution:
     """Solves the P||Cmax problem by using a basic heuristic.
 
     :param instance: valid problem instance
     :param stop_event: event for synchronization work of threads; it's been used for stopping algorithm
     :param current_best_result_callback: callback used for returning partial results to runner on runtime
+    :param improve: optional improvement step (e.g. local search) applied to the best specimen of every generation
+    :param seeder: function returning the solution the population starts from, greedy.solve by default
+    :param initial: optional (specimens_number x tasks_number) matrix of assignments added to the population
+    :param checkpoint: optional py:class:`scheduler.checkpoint.Checkpoint` saving the population periodically
+        and when the threads stop
+    :param profiler: optional py:class:`scheduler.profiling.Profiler` measuring the phases of the generations of
+        the threads and the time they wait for the population queue
+    :param generation: number of the generation of the initial population, the generations saved to the
+        checkpoint are counted from it
     :return: generated solution of a given problem instance
     """
 
-    # lpt_solution = scheduler.lpt.solve(instance)
-    lpt_solution = scheduler.greedy.solve(instance)
+    if seeder is None:
+        seeder = scheduler.greedy.solve
+    lpt_solution = seeder(instance)
+    if improve is not None:
+        lpt_solution = improve(lpt_solution)
     genetic_solution = GeneticSolution(lpt_solution)
+    bound = lower_bound(instance.tasks_durations, instance.processors_number)
+    if genetic_solution.total_time <= bound:
+        results_queue.push(genetic_solution)
+        solution_produced(results_queue)
+        return
     threads = []
 
-    queue = SolutionsQueue(thread_population_size * threads_number)
+    queue = SolutionsQueue(thread_population_size * threads_number, profiler)
+
+    for specimen in from_assignments(instance, [] if initial is None else initial):
+        queue.push(specimen)
 
-    for _ in range(threads_number):
+    # The first thread continues the count of the initial population, so the sum is the generation of the population
+    generations = [generation] + [0] * (threads_number - 1)
+    for thread_index in range(threads_number):
         copied_solution = copy.deepcopy(genetic_solution)
         queue.push(copied_solution)
 
-        t = Thread(target=algorithm_thread, args=(queue, results_queue, stop_event, solution_produced, thread_population_size, best_specimens_per_thread))
+        t = Thread(target=algorithm_thread, args=(queue, results_queue, stop_event, solution_produced, thread_population_size, best_specimens_per_thread, improve, bound, checkpoint, NULL_PROFILER if profiler is None else profiler, generations, thread_index))
         t.start()
         threads.append(t)
 
     for thread in threads:
         thread.join()
+    if checkpoint is not None:
+        checkpoint.save(population_of(queue), sum(generations), force=True)
 
 
-__all__ = ["solve"]
+def solve_processes(instance: Instance, results_queue: SolutionsQueue, stop_event: Event, solution_produced,
+                    processes_number=THREADS, island_population_size=THREAD_POPULATION_SIZE,
+                    best_specimens_per_island=BEST_SPECIMENS_PER_THREAD, migration_period=MIGRATION_PERIOD, improve=None,
+                    seeder=None, initial=None, checkpoint=None, profiler=None, generation=0):
+    """Solves the P||Cmax problem by using a basic heuristic distributed across processes (island model).
+
+    Every process evolves its own population and periodically sends its best specimen to the coordinator,
+    which passes it to the results queue and forwards it as an immigrant to the next island. The islands are
+    stopped as soon as a specimen reaches the lower bound of the optimal total time.
+
+    :param instance: valid problem instance
+    :param results_queue: queue receiving the best specimens of the islands
+    :param stop_event: event used for stopping the algorithm
+    :param solution_produced: callback called with the results queue after every migration
+    :param processes_number: number of islands
+    :param island_population_size: number of specimens created in every generation of an island
+    :param best_specimens_per_island: number of specimens kept from every generation of an island
+    :param migration_period: number of generations between two migrations
+    :param improve: optional picklable improvement step applied to the best specimen of every generation
+    :param seeder: function returning the solution the populations start from, greedy.solve by default
+    :param initial: optional (specimens_number x tasks_number) matrix of assignments spread across the islands
+    :param checkpoint: optional py:class:`scheduler.checkpoint.Checkpoint` saving the best specimens received
+        from the islands periodically and when the islands stop
+    :param profiler: optional py:class:`scheduler.profiling.Profiler`, the islands run in other processes, so only
+        the coordinator is measured; every received migration counts as migration_period generations
+    :param generation: number of the generation of the initial population, the generations saved to the
+        checkpoint are counted from it
+    """
+    if profiler is None:
+        profiler = NULL_PROFILER
+    if seeder is None:
+        seeder = scheduler.greedy.solve
+    initial_solution = seeder(instance)
+    if improve is not None:
+        initial_solution = improve(initial_solution)
+    genetic_solution = GeneticSolution(initial_solution)
+    bound = lower_bound(instance.tasks_durations, instance.processors_number)
+    if genetic_solution.total_time <= bound:
+        results_queue.push(genetic_solution)
+        solution_produced(results_queue)
+        return
+    islands_stop_event = multiprocessing.Event()
+    outbox = multiprocessing.Queue()
+    inboxes = [multiprocessing.Queue() for _ in range(processes_number)]
+    received = SolutionsQueue(processes_number * best_specimens_per_island)
+    received.push(genetic_solution)
+    for index, specimen in enumerate(from_assignments(instance, [] if initial is None else initial)):
+        received.push(specimen)
+        inboxes[index % processes_number].put(specimen)
+    islands = [
+        multiprocessing.Process(
+            target=island_process,
+            args=(
+                island_index, genetic_solution, inboxes[island_index], outbox, islands_stop_event,
+                island_population_size, best_specimens_per_island, migration_period, improve
+            ),
+            daemon=True
+        )
+        for island_index in range(processes_number)
+    ]
+    for island in islands:
+        island.start()
+
+    # Every received migration stands for migration_period generations of its island
+    try:
+        while not stop_event.is_set():
+            try:
+                with profiler.phase("migration"):
+                    island_index, specimen = outbox.get(timeout=0.1)
+            except queues.Empty:
+                continue
+            generation += migration_period
+            profiler.generation(migration_period)
+            profiler.improvement(specimen.total_time)
+            results_queue.push(specimen)
+            solution_produced(results_queue)
+            if specimen.total_time <= bound:
+                break
+            inboxes[(island_index + 1) % processes_number].put(specimen)
+            received.push(specimen)
+            if checkpoint is not None and checkpoint.due():
+                with profiler.phase("checkpoint"):
+                    checkpoint.save(population_of(received), generation)
+    finally:
+        if checkpoint is not None:
+            checkpoint.save(population_of(received), generation, force=True)
+        islands_stop_event.set()
+        # Islands can't exit before the coordinator receives everything they've sent
+        while any(island.is_alive() for island in islands):
+            try:
+                outbox.get(timeout=0.1)
+            except queues.Empty:
+                pass
+        for island in islands:
+            island.join()
+        for inbox in inboxes:
+            inbox.cancel_join_thread()
+
+
+def solution_generator(instance: Instance, threads_number=THREADS, thread_population_size=THREAD_POPULATION_SIZE,
+                       best_specimens_per_thread=BEST_SPECIMENS_PER_THREAD, improve=None, backend="threads",
+                       migration_period=MIGRATION_PERIOD, seeder=None, initial=None, checkpoint=None, profiler=None,
+                       generation=0):
+    """Runs the heuristic in the background and yields the best solution found so far after every generation.
+
+    The solution the heuristic starts from is yielded first. The generator stops when the workers stop, which
+    happens once the lower bound of the optimal total time is reached. None is yielded when no generation finished
+    within POP_TIMEOUT, so the consumer can check its budget. Closing the generator stops the workers.
+
+    :param instance: valid problem instance
+    :param threads_number: number of threads (or islands if the backend is "processes")
+    :param thread_population_size: number of specimens created in every generation of a thread
+    :param best_specimens_per_thread: number of specimens kept from every generation of a thread
+    :param improve: optional improvement step applied to the best specimen of every generation
+    :param backend: "threads" runs py:func:`solve`, "processes" runs py:func:`solve_processes` and yields
+        after every migration instead of every generation
+    :param migration_period: number of generations between two migrations of the "processes" backend
+    :param seeder: function returning the solution the population starts from, greedy.solve by default
+    :param initial: optional (specimens_number x tasks_number) matrix of assignments, e.g. loaded from a
+        checkpoint, added to the population
+    :param checkpoint: optional py:class:`scheduler.checkpoint.Checkpoint` saving the population periodically
+        and when the workers stop; the workers start after the first solution is yielded, so nothing is saved when
+        the generator is closed before
+    :param profiler: optional py:class:`scheduler.profiling.Profiler`, see py:func:`solve` and
+        py:func:`solve_processes`
+    :param generation: number of the generation of the initial population, e.g. loaded from a checkpoint, the
+        generations saved to the checkpoint are counted from it
+    :return: generator of solutions
+    """
+    if backend not in ("threads", "processes"):
+        raise ValueError(f"backend must be threads or processes, not ({backend})")
+    if seeder is None:
+        seeder = scheduler.greedy.solve
+    initial_solution = seeder(instance)
+    if initial is not None and len(initial) > 0:
+        initial_solution = min([initial_solution, *from_assignments(instance, initial)], key=lambda s: s.total_time)
+    produced = queues.SimpleQueue()
+    stop_event = Event()
+    results_queue = SolutionsQueue(1)
+    arguments = (instance, results_queue, stop_event, lambda queue: produced.put(queue.best()), threads_number,
+                 thread_population_size, best_specimens_per_thread)
+    # The workers start from the solution which has already been computed
+    if backend == "processes":
+        worker = Thread(
+            target=solve_processes,
+            args=arguments + (
+                migration_period, improve, lambda _: initial_solution, initial, checkpoint, profiler, generation
+            )
+        )
+    else:
+        worker = Thread(
+            target=solve,
+            args=arguments + (improve, lambda _: initial_solution, initial, checkpoint, profiler, generation)
+        )
+
+    yield initial_solution
+    if initial_solution.total_time <= lower_bound(instance.tasks_durations, instance.processors_number):
+        return
+    worker.start()
+    try:
+        while worker.is_alive() or not produced.empty():
+            try:
+                yield produced.get(timeout=POP_TIMEOUT)
+            except queues.Empty:
+                yield None
+    finally:
+        stop_event.set()
+        if worker.is_alive():
+            worker.join()
+
+
+__all__ = ["solve", "solve_processes", "solution_generator"]
 
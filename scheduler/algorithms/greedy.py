@@ -1,5 +1,5 @@
 from scheduler.problem import Instance, InstanceSolution
-from collections import deque
+from scheduler.algorithms.list_scheduling import schedule
 
 
 def solve(instance: Instance) -> InstanceSolution:
@@ -8,17 +8,7 @@ def solve(instance: Instance) -> InstanceSolution:
     :param instance: valid problem instance
     :return: generated solution of a given problem instance
     """
-    processors = [[0, deque([])] for _ in range(instance.processors_number)]
-
-    for task_index, task_duration in enumerate(instance.tasks_durations):
-        free_processor = min(enumerate(processors), key=lambda x: x[1][0])[0]
-        processors[free_processor][0] += task_duration
-        processors[free_processor][1].append(task_index)
-
-    result_processors = list(map(lambda x: list(x[1]), processors))
-
-    return InstanceSolution(instance, result_processors)
+    return schedule(instance)
 
 
 __all__ = ["solve"]
-
@@ -2,6 +2,9 @@ import copy
 import random
 import numpy
 from scheduler.problem import Instance, InstanceSolution
+from scheduler.compact import CompactSolution
+from scheduler.bounds import lower_bound
+from scheduler.profiling import NULL_PROFILER
 from itertools import cycle
 
 
@@ -43,8 +46,8 @@ class GeneticSolution(InstanceSolution):
         best_processors = sorted(
             filter(
                 lambda x: (x[2] - self.average_computation_time) >= 0,
-                [("self", i, j) for i, j in enumerate(map(sum, self))] +
-                [("other", i, j) for i, j in enumerate(map(sum, self))]
+                [("self", i, j) for i, j in enumerate(self.loads)] +
+                [("other", i, j) for i, j in enumerate(other.loads)]
             ),
             key=lambda x: x[2]
         )
@@ -73,11 +76,12 @@ class GeneticSolution(InstanceSolution):
         return GeneticSolution(self.instance, task_mapping, processors=processors)
 
     def mutate(self, weights=None):
+        return GeneticSolution(self.instance, self.mutated_mapping(weights))
+
+    def mutated_mapping(self, weights=None):
         tasks_mapping = copy.deepcopy(self.tasks_mapping)
-        # processor_1 = random.randrange(self.instance.processors_number)
-        processor_1, = numpy.random.default_rng().choice(
-            self.instance.processors_number, size=1, replace=False, p=weights, shuffle=False
-        )
+        # Drawn from the random module, so seeding it makes the runs reproducible
+        processor_1, = random.choices(range(self.instance.processors_number), weights=weights)
         processor_2 = random.randrange(1, self.instance.processors_number)
         processor_2 = (processor_1 + processor_2) % self.instance.processors_number
         if self.processors[processor_1] != []:
@@ -86,7 +90,7 @@ class GeneticSolution(InstanceSolution):
         if self.processors[processor_2] != []:
             index_2 = random.choice(self.processors[processor_2])
             tasks_mapping[index_2] = processor_1
-        return GeneticSolution(self.instance, tasks_mapping)
+        return tasks_mapping
 
     @staticmethod
     def random(instance):
@@ -113,21 +117,167 @@ def cross_list_of_specimens(specimens):
     return result
 
 
-def solution_generator(instance, population_size, best_specimens_number):
+def solution_generator(instance, population_size, best_specimens_number, improve=None, seeder=None, initial=None,
+                       checkpoint=None, profiler=None, generation=0):
+    # The generator stops after yielding a solution which reaches the lower bound, it can't be improved
+    if profiler is None:
+        profiler = NULL_PROFILER
+    bound = lower_bound(instance.tasks_durations, instance.processors_number)
     population = [GeneticSolution.random(instance) for _ in range(population_size)]
+    seeded = 0
+    if seeder is not None:
+        population[0] = GeneticSolution.from_instance_solution(seeder(instance))
+        seeded = 1
+    if initial is not None:
+        for index, tasks_mapping in enumerate(initial[:population_size - seeded], seeded):
+            population[index] = GeneticSolution(instance, [int(processor) for processor in tasks_mapping])
     weights = [i**10 for i in range(1, instance.processors_number + 1)]
     sigma = sum(weights)
     weights = list(map(lambda x: x / sigma, weights))
-    while True:
-        best_specimens = sorted(population, key=lambda x: x.total_time)[:best_specimens_number]
-        crossed = cross_list_of_specimens(best_specimens)
-        mutated = [
-            solution.mutate(weights=weights) for solution, _ in
-            zip(cycle(crossed), range(population_size - len(crossed)))
-        ]
-        population = crossed + mutated
-        best_solution = min(population, key=lambda x: x.total_time)
-        yield best_solution
+    try:
+        while True:
+            with profiler.phase("sort"):
+                best_specimens = sorted(population, key=lambda x: x.total_time)[:best_specimens_number]
+            if improve is not None:
+                with profiler.phase("improve"):
+                    best_specimens[0] = GeneticSolution.from_instance_solution(improve(best_specimens[0]))
+            with profiler.phase("cross"):
+                crossed = cross_list_of_specimens(best_specimens)
+            # Mutation and construction of the mutated specimens are measured separately
+            with profiler.phase("mutate"):
+                mappings = [
+                    solution.mutated_mapping(weights=weights) for solution, _ in
+                    zip(cycle(crossed), range(population_size - len(crossed)))
+                ]
+            with profiler.phase("construct"):
+                mutated = [GeneticSolution(instance, tasks_mapping) for tasks_mapping in mappings]
+            population = crossed + mutated
+            if improve is not None:
+                population[-1] = best_specimens[0]
+            generation += 1
+            best_solution = min(population, key=lambda x: x.total_time)
+            profiler.generation()
+            profiler.improvement(best_solution.total_time)
+            yield best_solution
+            if best_solution.total_time <= bound:
+                return
+            if checkpoint is not None and checkpoint.due():
+                with profiler.phase("checkpoint"):
+                    checkpoint.save([solution.tasks_mapping for solution in population], generation)
+    finally:
+        if checkpoint is not None:
+            checkpoint.save([solution.tasks_mapping for solution in population], generation, force=True)
+
+
+def population_loads(population, tasks_durations, processors_number):
+    """Computes the loads of all of the processors of every individual at once.
+
+    :param population: (population_size x tasks_number) matrix, population[i][task_index] = processor
+    :param tasks_durations: durations of the tasks
+    :param processors_number: number of available processors
+    :return: (population_size x processors_number) matrix of loads
+    """
+    rows = population.shape[0]
+    offsets = numpy.arange(rows, dtype=numpy.int64)[:, None] * processors_number
+    weights = numpy.broadcast_to(tasks_durations, population.shape).ravel()
+    loads = numpy.bincount((population + offsets).ravel(), weights=weights, minlength=rows * processors_number)
+    return loads.reshape(rows, processors_number).astype(numpy.int64)
+
+
+def population_generator(instance, population_size, best_specimens_number, rng=None, improve=None, seeder=None,
+                         initial=None, checkpoint=None, profiler=None, generation=0):
+    """Genetic algorithm working on the whole population stored as a NumPy assignment matrix.
+
+    Every generation the best specimens are selected with argpartition and crossed in pairs, every child takes
+    whole processors from one parent and the rest of the tasks from the other. The rest of the population is
+    made of mutated children: a random task is moved from the most to the least loaded processor and two random
+    tasks swap their processors. The best specimen always survives to the next generation. The generator stops
+    after yielding a specimen which reaches the lower bound of the optimal total time.
+
+    :param instance: valid problem instance
+    :param population_size: number of specimens in every generation
+    :param best_specimens_number: number of specimens selected for crossing, at least 2
+    :param rng: optional numpy.random.Generator or seed
+    :param improve: optional improvement step (e.g. local search) applied to the best specimen of every generation
+    :param seeder: optional function returning a solution which replaces one of the random initial specimens
+    :param initial: optional (specimens_number x tasks_number) matrix of assignments, e.g. loaded from a
+        checkpoint, which replace the following random initial specimens
+    :param checkpoint: optional py:class:`scheduler.checkpoint.Checkpoint` saving the population periodically
+        and when the generator is closed
+    :param profiler: optional py:class:`scheduler.profiling.Profiler` measuring the phases of every generation
+    :param generation: number of the generation of the initial population, e.g. loaded from a checkpoint, the
+        generations saved to the checkpoint are counted from it
+    :return: the best specimen of every generation
+    """
+    if best_specimens_number < 2:
+        raise ValueError(f"at least 2 specimens have to be selected for crossing, not ({best_specimens_number})")
+    if profiler is None:
+        profiler = NULL_PROFILER
+    rng = numpy.random.default_rng(rng)
+    processors_number = instance.processors_number
+    tasks_durations = numpy.asarray(instance.tasks_durations, dtype=numpy.int64)
+    tasks_number = len(tasks_durations)
+    population = rng.integers(processors_number, size=(population_size, tasks_number), dtype=numpy.int32)
+    if seeder is not None:
+        population[0] = CompactSolution.from_instance_solution(seeder(instance), tasks_durations).assignment
+    if initial is not None:
+        seeded = int(seeder is not None)
+        initial = numpy.asarray(initial, dtype=numpy.int32)[:population_size - seeded]
+        population[seeded:seeded + len(initial)] = initial
+    best_specimens_number = min(best_specimens_number, population_size)
+    bound = lower_bound(tasks_durations, processors_number)
+    try:
+        while True:
+            with profiler.phase("evaluate"):
+                loads = population_loads(population, tasks_durations, processors_number)
+                total_times = loads.max(axis=1)
+                best = int(numpy.argmin(total_times))
+            if improve is not None:
+                with profiler.phase("improve"):
+                    improved = improve(
+                        CompactSolution(instance, population[best], tasks_durations).to_instance_solution()
+                    )
+                    population[best] = CompactSolution.from_instance_solution(improved, tasks_durations).assignment
+            best_solution = CompactSolution(instance, population[best].copy(), tasks_durations)
+            generation += 1
+            profiler.generation()
+            profiler.improvement(best_solution.total_time)
+            yield best_solution
+            if best_solution.total_time <= bound:
+                return
+            if checkpoint is not None and checkpoint.due():
+                with profiler.phase("checkpoint"):
+                    checkpoint.save(population, generation)
+            with profiler.phase("select"):
+                elite = numpy.argpartition(total_times, best_specimens_number - 1)[:best_specimens_number]
+
+            # Crossing: each child keeps the tasks of randomly chosen processors of the first parent
+            with profiler.phase("cross"):
+                first, second = population[elite[0::2][:len(elite) // 2]], population[elite[1::2]]
+                kept_processors = rng.random((len(first), processors_number)) < 0.5
+                crossed = numpy.where(numpy.take_along_axis(kept_processors, first, axis=1), first, second)
+
+            # Mutation: the children are cycled to fill the rest of the population
+            with profiler.phase("mutate"):
+                rows = numpy.arange(population_size - len(crossed))
+                mutated = crossed[rows % len(crossed)]
+                mutated_loads = population_loads(mutated, tasks_durations, processors_number)
+                critical = mutated_loads.argmax(axis=1)
+                priorities = numpy.where(mutated == critical[:, None], rng.random(mutated.shape), -1.0)
+                moved = priorities.argmax(axis=1)
+                mutated[rows, moved] = mutated_loads.argmin(axis=1)
+                first_task = rng.integers(tasks_number, size=len(rows))
+                second_task = rng.integers(tasks_number, size=len(rows))
+                mutated[rows, first_task], mutated[rows, second_task] = (
+                    mutated[rows, second_task], mutated[rows, first_task]
+                )
+
+            best_specimen = population[best]
+            population = numpy.concatenate((crossed, mutated))
+            population[-1] = best_specimen
+    finally:
+        if checkpoint is not None:
+            checkpoint.save(population, generation, force=True)
 
 
 def solve(instance: Instance) -> InstanceSolution:
@@ -0,0 +1,67 @@
+from scheduler.problem import Instance, InstanceSolution
+import heapq
+import itertools
+
+
+def merge(first, second):
+    """Merges two lists of tasks, the shorter one is appended to the longer one, which is reused.
+
+    :param first: list of tasks or None if it's empty
+    :param second: list of tasks or None if it's empty
+    :return: merged list or None
+    """
+    if first is None:
+        return second
+    if second is None:
+        return first
+    if len(first) < len(second):
+        first, second = second, first
+    first.extend(second)
+    return first
+
+
+def combine(first: list, second: list) -> list:
+    """Combines two partial partitions, the most loaded subset of one is joined with the least loaded of the other.
+
+    :param first: m (load, tasks) pairs sorted by the loads in decreasing order
+    :param second: m (load, tasks) pairs sorted by the loads in decreasing order
+    :return: m (load, tasks) pairs sorted by the loads in decreasing order
+    """
+    combined = [
+        (load + other_load, merge(tasks, other_tasks))
+        for (load, tasks), (other_load, other_tasks) in zip(first, reversed(second))
+    ]
+    combined.sort(key=lambda subset: subset[0], reverse=True)
+    return combined
+
+
+def solve(instance: Instance) -> InstanceSolution:
+    """Solves the P||Cmax problem by using the greedy multi-way Karmarkar-Karp largest differencing method.
+
+    Every task starts as a partial partition with the task alone in one subset. The two partitions with the largest
+    differences between their most and least loaded subsets are taken from a heap and combined, until only one
+    partition is left.
+
+    :param instance: valid problem instance
+    :return: generated solution of a given problem instance
+    """
+    processors_number = instance.processors_number
+    empty = [(0, None)] * (processors_number - 1)
+    counter = itertools.count()
+    heap = [
+        (-int(duration), next(counter), [(int(duration), [task_index]), *empty])
+        for task_index, duration in enumerate(instance.tasks_durations)
+    ]
+    heapq.heapify(heap)
+
+    while len(heap) > 1:
+        _, _, first = heapq.heappop(heap)
+        _, _, second = heapq.heappop(heap)
+        combined = combine(first, second)
+        heapq.heappush(heap, (combined[-1][0] - combined[0][0], next(counter), combined))
+
+    partition = heap[0][2] if heap else [(0, None)] * processors_number
+    return InstanceSolution(instance, [[] if tasks is None else tasks for _, tasks in partition])
+
+
+__all__ = ["solve"]
@@ -0,0 +1,31 @@
+from scheduler.problem import Instance, InstanceSolution
+from typing import Iterable
+import heapq
+
+
+def schedule(instance: Instance, order: Iterable[int] = None) -> InstanceSolution:
+    """Assigns tasks one by one to the least loaded processor.
+
+    Processors are kept in a heap of (load, processor_index) pairs, so each assignment costs O(log m).
+    Ties are broken in favour of the processor with the lowest index.
+
+    :param instance: valid problem instance
+    :param order: indexes of tasks in the order in which they should be assigned, defaults to the instance order
+    :return: generated solution of a given problem instance
+    """
+    tasks_durations = instance.tasks_durations
+    if order is None:
+        order = range(len(tasks_durations))
+
+    processors = [[] for _ in range(instance.processors_number)]
+    loads = [(0, processor_index) for processor_index in range(instance.processors_number)]
+
+    for task_index in order:
+        load, free_processor = loads[0]
+        heapq.heapreplace(loads, (load + tasks_durations[task_index], free_processor))
+        processors[free_processor].append(task_index)
+
+    return InstanceSolution(instance, processors)
+
+
+__all__ = ["schedule"]
@@ -0,0 +1,236 @@
+from scheduler.problem import Instance, InstanceSolution
+from scheduler.algorithms import lpt
+from scheduler.bounds import lower_bound as compute_lower_bound
+import time
+
+MODES = ("best", "first")
+
+
+class IndexedHeap:
+    """Heap of processors ordered by their loads, which allows updating the load of any processor.
+
+    :ivar loads: loads[processor_index] = current load of the processor, shared with the owner of the heap
+    :type loads: list
+    :ivar maximum: True if the most loaded processor is on the top, False if the least loaded one is
+    :type maximum: bool
+    :ivar heap: processors indexes in the heap order
+    :type heap: list
+    :ivar position: position[processor_index] = index of the processor in the heap
+    :type position: list
+    """
+    def __init__(self, loads: list, maximum: bool = True):
+        self.loads = loads
+        self.maximum = maximum
+        self.heap = list(range(len(loads)))
+        self.position = list(range(len(loads)))
+        for index in range(len(loads) // 2 - 1, -1, -1):
+            self._sift_down(index)
+
+    def _before(self, processor_1: int, processor_2: int) -> bool:
+        load_1 = self.loads[processor_1]
+        load_2 = self.loads[processor_2]
+        if load_1 == load_2:
+            return processor_1 < processor_2
+        return load_1 > load_2 if self.maximum else load_1 < load_2
+
+    def _swap(self, index_1: int, index_2: int):
+        heap = self.heap
+        heap[index_1], heap[index_2] = heap[index_2], heap[index_1]
+        self.position[heap[index_1]] = index_1
+        self.position[heap[index_2]] = index_2
+
+    def _sift_up(self, index: int):
+        while index > 0:
+            parent = (index - 1) // 2
+            if not self._before(self.heap[index], self.heap[parent]):
+                break
+            self._swap(index, parent)
+            index = parent
+
+    def _sift_down(self, index: int):
+        size = len(self.heap)
+        while True:
+            chosen = index
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < size and self._before(self.heap[child], self.heap[chosen]):
+                    chosen = child
+            if chosen == index:
+                break
+            self._swap(index, chosen)
+            index = chosen
+
+    def top(self) -> int:
+        """Returns the index of the processor on the top of the heap."""
+        return self.heap[0]
+
+    def update(self, processor: int):
+        """Restores the heap order after the load of the processor has changed.
+
+        :param processor: index of the processor
+        """
+        index = self.position[processor]
+        self._sift_up(index)
+        self._sift_down(self.position[processor])
+
+
+class LocalSearch:
+    """Local search which moves and swaps tasks between the most loaded processor and the others.
+
+    Loads are cached, so every candidate is evaluated in O(1).
+
+    :ivar tasks_durations: durations of the tasks
+    :type tasks_durations: list
+    :ivar processors: processors[processor_index] = list of tasks assigned to the processor
+    :type processors: list
+    :ivar position: position[task_index] = index of the task in the list of its processor
+    :type position: list
+    :ivar loads: loads[processor_index] = sum of durations of the tasks assigned to the processor
+    :type loads: list
+    :ivar steps: number of applied improvements
+    :type steps: int
+    :ivar lower_bound: the search stops once the maximal load reaches it
+    :type lower_bound: int
+    """
+    def __init__(self, solution: InstanceSolution, lower_bound: int = None):
+        self.tasks_durations = solution.instance.tasks_durations
+        self.processors = [list(processor) for processor in solution.processors]
+        self.position = [0] * len(self.tasks_durations)
+        for processor in self.processors:
+            for index, task_index in enumerate(processor):
+                self.position[task_index] = index
+        self.loads = list(solution.loads)
+        self.most_loaded = IndexedHeap(self.loads, maximum=True)
+        self.least_loaded = IndexedHeap(self.loads, maximum=False)
+        self.steps = 0
+        if lower_bound is None:
+            lower_bound = compute_lower_bound(self.tasks_durations, len(self.loads))
+        self.lower_bound = lower_bound
+
+    def _remove(self, task_index: int, processor: int):
+        tasks = self.processors[processor]
+        last = tasks.pop()
+        if last != task_index:
+            tasks[self.position[task_index]] = last
+            self.position[last] = self.position[task_index]
+
+    def _add(self, task_index: int, processor: int):
+        self.position[task_index] = len(self.processors[processor])
+        self.processors[processor].append(task_index)
+
+    def _set_load(self, processor: int, load: int):
+        self.loads[processor] = load
+        self.most_loaded.update(processor)
+        self.least_loaded.update(processor)
+
+    def find(self, first: bool):
+        """Finds an improving move or swap of a task of the most loaded processor.
+
+        A candidate improves the solution if both changed processors end up below the current maximal load.
+
+        :param first: return the first improving candidate instead of the best one
+        :return: (resulting peak, task, other task or None, other processor) or None
+        """
+        durations = self.tasks_durations
+        loads = self.loads
+        critical = self.most_loaded.top()
+        critical_load = loads[critical]
+        best = None
+
+        # Tasks with equal durations are interchangeable
+        critical_tasks = {}
+        for task_index in self.processors[critical]:
+            critical_tasks.setdefault(durations[task_index], task_index)
+
+        # Moves: the least loaded processor is the best target for every task
+        target = self.least_loaded.top()
+        if target != critical:
+            target_load = loads[target]
+            for duration, task_index in critical_tasks.items():
+                peak = max(critical_load - duration, target_load + duration)
+                if peak < critical_load and (best is None or peak < best[0]):
+                    best = (peak, task_index, None, target)
+                    if first:
+                        return best
+
+        # Swaps
+        for processor, load in enumerate(loads):
+            if processor == critical:
+                continue
+            gap = critical_load - load
+            if gap <= 1:
+                continue
+            other_tasks = {}
+            for task_index in self.processors[processor]:
+                other_tasks.setdefault(durations[task_index], task_index)
+            for duration, task_index in critical_tasks.items():
+                for other_duration, other_task in other_tasks.items():
+                    difference = duration - other_duration
+                    if 0 < difference < gap:
+                        peak = max(critical_load - difference, load + difference)
+                        if best is None or peak < best[0]:
+                            best = (peak, task_index, other_task, processor)
+                            if first:
+                                return best
+        return best
+
+    def apply(self, task_index: int, other_task, processor: int):
+        """Moves the task of the most loaded processor to the processor, swapping it with the other task if given."""
+        durations = self.tasks_durations
+        critical = self.most_loaded.top()
+        self._remove(task_index, critical)
+        self._add(task_index, processor)
+        critical_load = self.loads[critical] - durations[task_index]
+        load = self.loads[processor] + durations[task_index]
+        if other_task is not None:
+            self._remove(other_task, processor)
+            self._add(other_task, critical)
+            critical_load += durations[other_task]
+            load -= durations[other_task]
+        self._set_load(critical, critical_load)
+        self._set_load(processor, load)
+        self.steps += 1
+
+    def run(self, mode: str = "best", time_limit: float = None):
+        """Applies improvements until a local optimum or the lower bound is reached, or the time runs out.
+
+        :param mode: "best" applies the best candidate of the neighborhood, "first" the first improving one
+        :param time_limit: optional time budget in seconds
+        """
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, not ({mode})")
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        while deadline is None or time.perf_counter() < deadline:
+            if self.loads[self.most_loaded.top()] <= self.lower_bound:
+                break
+            candidate = self.find(mode == "first")
+            if candidate is None:
+                break
+            _, task_index, other_task, processor = candidate
+            self.apply(task_index, other_task, processor)
+
+
+def improve(solution: InstanceSolution, mode: str = "best", time_limit: float = None,
+            lower_bound: int = None) -> InstanceSolution:
+    """Improves the solution by using a local search.
+
+    :param solution: solution of a P||Cmax problem instance
+    :param mode: "best" or "first" improvement
+    :param time_limit: optional time budget in seconds
+    :param lower_bound: precomputed lower bound of the optimal total time, computed if not given
+    :return: improved solution
+    """
+    search = LocalSearch(solution, lower_bound)
+    search.run(mode, time_limit)
+    return InstanceSolution(solution.instance, search.processors)
+
+
+def solve(instance: Instance) -> InstanceSolution:
+    """Solves the P||Cmax problem by improving the LPT solution with a local search.
+
+    :param instance: valid problem instance
+    :return: generated solution of a given problem instance
+    """
+    return improve(lpt.solve(instance))
+
+
+__all__ = ["solve", "improve", "LocalSearch", "IndexedHeap"]
@@ -1,6 +1,5 @@
-import scheduler
 from scheduler.problem import Instance, InstanceSolution
-from collections import deque
+from scheduler.algorithms.list_scheduling import schedule
 
 
 def solve(instance: Instance) -> InstanceSolution:
@@ -9,13 +8,9 @@ def solve(instance: Instance) -> InstanceSolution:
     :param instance: valid problem instance
     :return: generated solution of a given problem instance
     """
+    order = sorted(range(len(instance.tasks_durations)), key=instance.tasks_durations.__getitem__, reverse=True)
 
-    transformed_instance = Instance(
-        instance.processors_number,
-        list(sorted(instance.tasks_durations, reverse=True))
-    )
+    return schedule(instance, order)
 
-    return scheduler.greedy.solve(transformed_instance)
 
 __all__ = ["solve"]
-
@@ -0,0 +1,100 @@
+from scheduler.problem import Instance, InstanceSolution
+from scheduler.bounds import lower_bound
+
+
+class FreeSpaceTree:
+    """Segment tree over the free space of the processors, finds the first processor with enough space in O(log m).
+
+    :ivar size: number of leaves, the smallest power of 2 not lower than the number of processors
+    :type size: int
+    :ivar free: free[node] = maximal free space of the processors in the subtree of the node, the root is 1
+    :type free: list
+    """
+    def __init__(self, processors_number: int, capacity: int):
+        self.size = 1
+        while self.size < processors_number:
+            self.size *= 2
+        # Padding leaves have no space, so they're never chosen
+        self.free = [0] * (2 * self.size)
+        self.free[self.size:self.size + processors_number] = [capacity] * processors_number
+        for node in range(self.size - 1, 0, -1):
+            self.free[node] = max(self.free[2 * node], self.free[2 * node + 1])
+
+    def first_fit(self, duration: int) -> int:
+        """Returns the index of the first processor with at least duration of free space, or -1 if there's none."""
+        free = self.free
+        if free[1] < duration:
+            return -1
+        node = 1
+        while node < self.size:
+            node *= 2
+            if free[node] < duration:
+                node += 1
+        return node - self.size
+
+    def take(self, processor: int, duration: int):
+        """Decreases the free space of the processor."""
+        free = self.free
+        node = processor + self.size
+        free[node] -= duration
+        node //= 2
+        while node > 0:
+            free[node] = max(free[2 * node], free[2 * node + 1])
+            node //= 2
+
+
+def first_fit_decreasing(tasks_durations_sorted_desc: list, processors_number: int, capacity: int):
+    """Packs the tasks into the processors with the given capacity by using the FFD rule.
+
+    :param tasks_durations_sorted_desc: durations of the tasks, sorted in decreasing order
+    :param processors_number: number of available processors
+    :param capacity: maximal load of a processor
+    :return: assignment[position] = processor of the task on the position, None if the tasks don't fit
+    """
+    tree = FreeSpaceTree(processors_number, capacity)
+    assignment = []
+    for duration in tasks_durations_sorted_desc:
+        processor = tree.first_fit(duration)
+        if processor == -1:
+            return None
+        tree.take(processor, duration)
+        assignment.append(processor)
+    return assignment
+
+
+def solve(instance: Instance, iterations: int = None) -> InstanceSolution:
+    """Solves the P||Cmax problem by using the MULTIFIT algorithm.
+
+    The capacity is binary searched between the lower bound and max(2 * sum / m, longest task), for which FFD
+    always succeeds. The FFD packing of the lowest capacity that worked is returned.
+
+    :param instance: valid problem instance
+    :param iterations: maximal number of steps of the binary search, by default it runs until it converges
+    :return: generated solution of a given problem instance
+    """
+    tasks_durations = instance.tasks_durations
+    processors_number = instance.processors_number
+    order = sorted(range(len(tasks_durations)), key=tasks_durations.__getitem__, reverse=True)
+    durations = [int(tasks_durations[task_index]) for task_index in order]
+
+    low = lower_bound(durations, processors_number)
+    high = max(-(-2 * sum(durations) // processors_number), durations[0] if durations else 0, low)
+    best = first_fit_decreasing(durations, processors_number, high)
+    step = 0
+    while low < high and (iterations is None or step < iterations):
+        capacity = (low + high) // 2
+        assignment = first_fit_decreasing(durations, processors_number, capacity)
+        if assignment is None:
+            low = capacity + 1
+        else:
+            high = capacity
+            best = assignment
+        step += 1
+
+    processors = [[] for _ in range(processors_number)]
+    for position, processor in enumerate(best):
+        processors[processor].append(order[position])
+    return InstanceSolution(instance, processors)
+
+
+__all__ = ["solve", "first_fit_decreasing", "FreeSpaceTree"]
@@ -0,0 +1,136 @@
+import time
+
+# Reasons of stopping an anytime run
+EXHAUSTED = "exhausted"
+TIME_LIMIT = "time_limit"
+ITERATIONS = "iterations"
+TARGET = "target"
+OPTIMAL = "optimal"
+STOPPED = "stopped"
+INTERRUPTED = "interrupted"
+
+# Minimal time between two progress events (in seconds)
+PROGRESS_INTERVAL = 0.5
+
+
+class Progress:
+    """State of an anytime run passed to the progress callback.
+
+    :ivar best: best solution found so far, None if there is none yet
+    :ivar iterations: number of received solutions (e.g. generations)
+    :type iterations: int
+    :ivar elapsed: time since the start of the run in seconds
+    :type elapsed: float
+    :ivar improved_at: time of the last improvement since the start of the run in seconds
+    :type improved_at: float
+    """
+    def __init__(self, best, iterations: int, elapsed: float, improved_at: float):
+        self.best = best
+        self.iterations = iterations
+        self.elapsed = elapsed
+        self.improved_at = improved_at
+
+    @property
+    def total_time(self):
+        return None if self.best is None else self.best.total_time
+
+    @property
+    def rate(self) -> float:
+        """Iterations per second."""
+        return self.iterations / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class AnytimeResult(Progress):
+    """Final state of an anytime run.
+
+    :ivar status: reason of stopping, one of EXHAUSTED, TIME_LIMIT, ITERATIONS, TARGET, OPTIMAL, STOPPED
+        or INTERRUPTED
+    :type status: str
+    """
+    def __init__(self, best, iterations: int, elapsed: float, improved_at: float, status: str):
+        super().__init__(best, iterations, elapsed, improved_at)
+        self.status = status
+
+    @property
+    def solution(self):
+        return self.best
+
+
+def one_shot(solve, instance):
+    """Adapts an algorithm which returns a single solution to the anytime interface.
+
+    :param solve: solve(instance) function of an algorithm
+    :param instance: valid problem instance
+    :return: generator yielding the only solution
+    """
+    yield solve(instance)
+
+
+def run(steps, time_limit: float = None, iterations: int = None, target: int = None, lower_bound: int = None,
+        progress=None, progress_interval: float = PROGRESS_INTERVAL, stop_event=None) -> AnytimeResult:
+    """Consumes solutions produced by an anytime algorithm until one of the stopping conditions is met.
+
+    The steps may yield None when they have no new solution yet, this doesn't count as an iteration but lets
+    the budget be checked. The steps are closed when the run stops, and KeyboardInterrupt stops the run cleanly.
+
+    :param steps: iterable of solutions, e.g. a generator yielding the best specimen of every generation
+    :param time_limit: wall-clock budget in seconds, None means no limit
+    :param iterations: iteration budget, None means no limit
+    :param target: stop as soon as a solution with total time not greater than the target is found
+    :param lower_bound: lower bound of the optimal total time, the run stops once it's reached
+    :param progress: optional callback called with py:class:`Progress` at most once per progress_interval,
+        and with the py:class:`AnytimeResult` at the end
+    :param progress_interval: minimal time between two progress events in seconds
+    :param stop_event: optional event which stops the run when set
+    :return: the best solution found and the statistics of the run
+    """
+    start = time.perf_counter()
+    deadline = None if time_limit is None else start + time_limit
+    next_report = start + progress_interval
+    best = None
+    best_total_time = None
+    improved_at = 0.0
+    iteration = 0
+    status = EXHAUSTED
+    iterator = iter(steps)
+    try:
+        for solution in iterator:
+            now = time.perf_counter()
+            if solution is not None:
+                iteration += 1
+                total_time = solution.total_time
+                if best is None or total_time < best_total_time:
+                    best, best_total_time, improved_at = solution, total_time, now - start
+            if best is not None:
+                if lower_bound is not None and best_total_time <= lower_bound:
+                    status = OPTIMAL
+                    break
+                if target is not None and best_total_time <= target:
+                    status = TARGET
+                    break
+            if iterations is not None and iteration >= iterations:
+                status = ITERATIONS
+                break
+            if deadline is not None and now >= deadline:
+                status = TIME_LIMIT
+                break
+            if stop_event is not None and stop_event.is_set():
+                status = STOPPED
+                break
+            if progress is not None and now >= next_report:
+                progress(Progress(best, iteration, now - start, improved_at))
+                next_report = now + progress_interval
+    except KeyboardInterrupt:
+        status = INTERRUPTED
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+
+    result = AnytimeResult(best, iteration, time.perf_counter() - start, improved_at, status)
+    if progress is not None:
+        progress(result)
+    return result
+
+
+__all__ = ["run", "one_shot", "Progress", "AnytimeResult"]
@@ -0,0 +1,215 @@
+import contextlib
+import csv
+import glob
+import importlib
+import json
+import os
+import signal
+import time
+from . import anytime
+from . import bounds
+from .cache import ResultsCache
+from .problem import Instance
+
+# Default processing time of the anytime algorithms if the job has no time limit (in seconds)
+DEFAULT_PERIOD = 10
+SUMMARY_FIELDS = ["instance", "algorithm", "status", "total_time", "lower_bound", "proven_optimal", "gap", "wall_time", "solution"]
+
+
+class JobTimeout(Exception):
+    """Raised inside of a job which exceeded its time limit."""
+
+
+def run_anytime(instance: Instance, steps, time_limit: float):
+    """Runs an anytime algorithm until the time limit or the lower bound is reached.
+
+    :return: best solution and the statistics of the run
+    """
+    result = anytime.run(
+        steps, time_limit=DEFAULT_PERIOD if time_limit is None else time_limit,
+        lower_bound=bounds.lower_bound(instance.tasks_durations, instance.processors_number)
+    )
+    return result.best, {"generations": result.iterations, "stop_reason": result.status}
+
+
+def run_constructive(name: str):
+    """Returns the runner of an algorithm with a solve(instance) function, its module is imported on the first run."""
+    def runner(instance: Instance, time_limit: float):
+        return importlib.import_module(f"scheduler.algorithms.{name}").solve(instance), {}
+    return runner
+
+
+def run_jakub_genetic(instance: Instance, time_limit: float):
+    from .algorithms import jakub_genetic
+
+    best_solution, extras = run_anytime(instance, jakub_genetic.population_generator(instance, 128, 32), time_limit)
+    return best_solution.to_instance_solution(), {
+        "population_size": 128, "best_specimens_group_size": 32, **extras
+    }
+
+
+def run_eryk_heuristic(instance: Instance, time_limit: float):
+    from .algorithms import eryk_heuristic
+
+    best_solution, extras = run_anytime(instance, eryk_heuristic.solution_generator(instance), time_limit)
+    return best_solution, {
+        "threads_number": eryk_heuristic.THREADS,
+        "thread_population_size": eryk_heuristic.THREAD_POPULATION_SIZE,
+        "best_specimens_per_thread": eryk_heuristic.BEST_SPECIMENS_PER_THREAD,
+        **extras
+    }
+
+
+# name: (runner(instance, time_limit) -> (solution, extras), True if the runner respects the time limit itself)
+ALGORITHMS = {
+    "greedy": (run_constructive("greedy"), False),
+    "lpt": (run_constructive("lpt"), False),
+    "multifit": (run_constructive("multifit"), False),
+    "karmarkar_karp": (run_constructive("karmarkar_karp"), False),
+    "local_search": (run_constructive("local_search"), False),
+    "branch_and_bound": (run_constructive("branch_and_bound"), False),
+    "dynamic_programming": (run_constructive("dynamic_programming"), False),
+    "brute_force_iterative": (run_constructive("brute_force_iterative"), False),
+    "brute_force_recursive": (run_constructive("brute_force_recursive"), False),
+    "jakub_genetic": (run_jakub_genetic, True),
+    "eryk_heuristic": (run_eryk_heuristic, True),
+}
+
+
+def _raise_timeout(signum, frame):
+    raise JobTimeout()
+
+
+@contextlib.contextmanager
+def time_limited(seconds: float):
+    """Raises py:class:`JobTimeout` in the main thread after the given number of seconds (POSIX only)."""
+    if seconds is None or not hasattr(signal, "setitimer"):
+        yield
+        return
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def find_instances(pattern: str) -> list:
+    """Returns the instance files in a directory or matching a glob pattern, sorted by name.
+
+    :param pattern: path to a directory or a glob pattern
+    :return: list of paths
+    """
+    if os.path.isdir(pattern):
+        paths = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+    else:
+        paths = glob.glob(pattern)
+    return sorted(path for path in paths if os.path.isfile(path))
+
+
+def run_job(source: str, algorithm: str, time_limit: float, output_directory: str,
+            cache_directory: str = None) -> dict:
+    """Solves one instance with one algorithm and saves the result in a toml file.
+
+    :param source: path to the instance file
+    :param algorithm: name of the algorithm, one of py:data:`ALGORITHMS`
+    :param time_limit: time limit in seconds, None means no limit
+    :param output_directory: directory for the solution files
+    :param cache_directory: optional directory of the results cache, results of the algorithms which don't
+        depend on the time limit are reused
+    :return: summary row
+    """
+    runner, anytime_algorithm = ALGORITHMS[algorithm]
+    row = dict.fromkeys(SUMMARY_FIELDS, "")
+    row.update({"instance": source, "algorithm": algorithm})
+    start = time.perf_counter()
+    try:
+        instance = Instance.load(source)
+        cache = None if cache_directory is None else ResultsCache(cache_directory)
+        solution = None if cache is None or anytime_algorithm else cache.get(instance, algorithm)
+        if solution is not None:
+            extras = {"cached": True}
+        else:
+            with time_limited(None if anytime_algorithm else time_limit):
+                solution, extras = runner(instance, time_limit)
+            if cache is not None:
+                cache.put(instance, algorithm, {"time_limit": time_limit} if anytime_algorithm else None, solution)
+    except JobTimeout:
+        row.update({"status": "timeout", "wall_time": time.perf_counter() - start})
+        return row
+    except Exception as error:
+        row.update({"status": f"error: {error}", "wall_time": time.perf_counter() - start})
+        return row
+    wall_time = time.perf_counter() - start
+
+    bound = bounds.lower_bound(instance.tasks_durations, instance.processors_number)
+    name = os.path.splitext(os.path.basename(source))[0]
+    target = os.path.join(output_directory, f"{algorithm}-{name}.toml")
+    solution.save_toml(target, extras={"algorithm": algorithm, "instance": source, "wall_time": wall_time, **extras})
+    row.update({
+        "status": "ok",
+        "total_time": int(solution.total_time),
+        "lower_bound": int(bound),
+        "proven_optimal": bounds.is_optimal(solution.total_time, bound),
+        "gap": (solution.total_time - bound) / bound if bound > 0 else 0.0,
+        "wall_time": wall_time,
+        "solution": target
+    })
+    return row
+
+
+def write_summary(rows: list, filename: str, fields: list = None):
+    """Writes the summary rows to a csv file, or to a json file if the name ends with .json.
+
+    :param rows: summary rows
+    :param filename: name of the summary file
+    :param fields: columns of the csv file, py:data:`SUMMARY_FIELDS` by default
+    """
+    if filename.endswith(".json"):
+        with open(filename, 'w') as target:
+            json.dump(rows, target, indent=2)
+    else:
+        with open(filename, 'w', newline='') as target:
+            writer = csv.DictWriter(target, fieldnames=SUMMARY_FIELDS if fields is None else fields)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def run_batch(sources: list, algorithms: list, output_directory: str, time_limit: float = None,
+              workers: int = None, summary: str = None, job_finished=None, cache_directory: str = None) -> list:
+    """Solves every instance with every algorithm in a process pool.
+
+    :param sources: paths to the instance files
+    :param algorithms: names of the algorithms
+    :param output_directory: directory for the solution files
+    :param time_limit: time limit of a single job in seconds, None means no limit
+    :param workers: number of processes, defaults to the number of CPUs
+    :param summary: optional path to the csv/json summary
+    :param job_finished: optional callback called with every summary row
+    :param cache_directory: optional directory of the results cache
+    :return: summary rows in the order of the jobs
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    for algorithm in algorithms:
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"unknown algorithm ({algorithm})")
+    os.makedirs(output_directory, exist_ok=True)
+    jobs = [(source, algorithm) for source in sources for algorithm in algorithms]
+    rows = [None] * len(jobs)
+    with ProcessPoolExecutor(workers) as executor:
+        futures = {
+            executor.submit(run_job, source, algorithm, time_limit, output_directory, cache_directory): index
+            for index, (source, algorithm) in enumerate(jobs)
+        }
+        for future in as_completed(futures):
+            rows[futures[future]] = future.result()
+            if job_finished is not None:
+                job_finished(rows[futures[future]])
+    if summary is not None:
+        write_summary(rows, summary)
+    return rows
+
+
+__all__ = ["ALGORITHMS", "run_batch", "run_job", "find_instances", "write_summary"]
@@ -0,0 +1,59 @@
+import itertools
+
+
+def average_load(tasks_durations, processors_number: int) -> int:
+    """Returns ceil(sum / m), no schedule can be shorter than the average load of the processors.
+
+    :param tasks_durations: durations of the tasks
+    :param processors_number: number of available processors
+    """
+    return -(-int(sum(tasks_durations)) // processors_number)
+
+
+def longest_task(tasks_durations) -> int:
+    """Returns the duration of the longest task, which has to be executed by some processor."""
+    return int(max(tasks_durations, default=0))
+
+
+def pigeonhole(tasks_durations_sorted_desc, processors_number: int) -> int:
+    """Generalisation of the pairwise (L2) bound d[m-1] + d[m].
+
+    Some processor executes at least k + 1 of the k * m + 1 longest tasks, so its load is at least the sum of
+    the k + 1 shortest of them. The bound is the maximum over all k.
+
+    :param tasks_durations_sorted_desc: durations of the tasks, sorted in decreasing order
+    :param processors_number: number of available processors
+    """
+    prefix = [0, *itertools.accumulate(int(duration) for duration in tasks_durations_sorted_desc)]
+    bound = 0
+    for k in range(1, (len(prefix) - 2) // processors_number + 1):
+        last = k * processors_number
+        bound = max(bound, prefix[last + 1] - prefix[last - k])
+    return bound
+
+
+def lower_bound(tasks_durations, processors_number: int) -> int:
+    """Computes a lower bound of the optimal total time.
+
+    The bound is the maximum of py:func:`average_load`, py:func:`longest_task` and py:func:`pigeonhole`.
+
+    :param tasks_durations: durations of the tasks
+    :param processors_number: number of available processors
+    :return: lower bound of the optimal total time
+    """
+    if len(tasks_durations) == 0:
+        return 0
+    durations = sorted(tasks_durations, reverse=True)
+    return max(
+        average_load(durations, processors_number),
+        int(durations[0]),
+        pigeonhole(durations, processors_number)
+    )
+
+
+def is_optimal(total_time: int, bound: int) -> bool:
+    """Returns True if a solution with the given total time is proven optimal by the bound."""
+    return total_time <= bound
+
+
+__all__ = ["lower_bound", "average_load", "longest_task", "pigeonhole", "is_optimal"]
@@ -0,0 +1,159 @@
+import glob
+import hashlib
+import json
+import os
+import tempfile
+from .exceptions import FileContentError
+from .problem import Instance, InstanceSolution
+
+# Default maximal total size of the cached results (in bytes)
+DEFAULT_MAX_SIZE = 256 * 2 ** 20
+# Name of the environment variable with the default cache directory
+DIRECTORY_VARIABLE = "SCHEDULER_CACHE"
+
+
+def key(instance: Instance, algorithm: str, parameters: dict = None) -> str:
+    """Returns the name of the cached result of the algorithm run with the parameters on the instance.
+
+    :param instance: problem instance
+    :param algorithm: name of the algorithm
+    :param parameters: parameters of the algorithm, every value has to be representable in json
+    :return: instance fingerprint and hash of the algorithm and its parameters
+    """
+    run = json.dumps([algorithm, parameters or {}], sort_keys=True, default=str)
+    return f"{instance.fingerprint}-{hashlib.sha256(run.encode()).hexdigest()[:32]}"
+
+
+class ResultsCache:
+    """Persistent cache of solutions stored as toml files, the least recently used ones are evicted first.
+
+    Files are written atomically, so one directory can be shared by many processes.
+
+    :ivar directory: directory with the cached results
+    :type directory: str
+    :ivar max_size: maximal total size of the cached results in bytes
+    :type max_size: int
+    :ivar hits: number of results returned by py:meth:`get`
+    :type hits: int
+    :ivar misses: number of calls of py:meth:`get` which returned None
+    :type misses: int
+    """
+    def __init__(self, directory: str, max_size: int = DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.toml")
+
+    def _load(self, path: str, instance: Instance):
+        try:
+            solution, extras = InstanceSolution.load_toml(path)
+        except (OSError, FileContentError, ValueError):
+            return None, None
+        if solution.instance != instance:
+            return None, None
+        # The instance is the same, so the solution can share it
+        solution.instance = instance
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return solution, extras
+
+    def get(self, instance: Instance, algorithm: str, parameters: dict = None):
+        """Returns the cached solution of the algorithm run with the parameters on the instance.
+
+        :param instance: problem instance
+        :param algorithm: name of the algorithm
+        :param parameters: parameters of the algorithm
+        :return: cached solution or None
+        """
+        solution, _ = self._load(self._path(key(instance, algorithm, parameters)), instance)
+        if solution is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return solution
+
+    def incumbent(self, instance: Instance):
+        """Returns the best cached solution of the instance found by any algorithm, used for warm starts.
+
+        :param instance: problem instance
+        :return: best cached solution or None
+        """
+        # Only the headers are read for ranking, the best valid solution is loaded whole
+        candidates = []
+        for path in glob.glob(self._path(f"{instance.fingerprint}-*")):
+            try:
+                candidates.append((InstanceSolution.read_header(path)["results"]["total_time"], path))
+            except (OSError, ValueError, KeyError, TypeError, FileContentError):
+                continue
+        for _, path in sorted(candidates):
+            solution, _ = self._load(path, instance)
+            if solution is not None:
+                return solution
+        return None
+
+    def put(self, instance: Instance, algorithm: str, parameters: dict, solution: InstanceSolution,
+            extras: dict = None):
+        """Stores the solution of the algorithm run with the parameters on the instance and evicts old results.
+
+        A cached result which isn't worse is kept, e.g. when a genetic algorithm warm started from the incumbent
+        finishes with a worse solution.
+
+        :param instance: problem instance
+        :param algorithm: name of the algorithm
+        :param parameters: parameters of the algorithm
+        :param solution: solution to store
+        :param extras: additional simulation data saved with the solution
+        """
+        path = self._path(key(instance, algorithm, parameters))
+        try:
+            if InstanceSolution.read_header(path)["results"]["total_time"] <= solution.total_time:
+                os.utime(path)
+                return
+        except (OSError, ValueError, KeyError, TypeError, FileContentError):
+            pass
+        extras = {**(extras or {}), "algorithm": algorithm, "parameters": json.dumps(parameters or {}, default=str)}
+        descriptor, temporary = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        os.close(descriptor)
+        try:
+            solution.save_toml(temporary, extras=extras)
+            os.replace(temporary, path)
+        except BaseException:
+            os.remove(temporary)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Removes the least recently used results until their total size doesn't exceed the limit."""
+        entries = []
+        for path in glob.glob(self._path("*")):
+            try:
+                status = os.stat(path)
+            except OSError:
+                continue
+            entries.append((status.st_mtime, status.st_size, path))
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            size -= entry_size
+
+    def clear(self):
+        """Removes all of the cached results."""
+        for path in glob.glob(self._path("*")):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+__all__ = ["ResultsCache", "key"]
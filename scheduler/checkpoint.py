@@ -0,0 +1,143 @@
+import os
+import time
+import zipfile
+from threading import Lock
+import numpy
+from .exceptions import FileContentError
+from .problem import Instance, InstanceSolution
+
+# Default minimal time between two checkpoints (in seconds)
+CHECKPOINT_PERIOD = 60
+CHECKPOINT_VERSION = 1
+
+
+def assignment_of(solution: InstanceSolution) -> numpy.ndarray:
+    """Returns assignment[task_index] = processor of the solution."""
+    assignment = numpy.zeros(len(solution.instance.tasks_durations), dtype=numpy.int32)
+    for processor, tasks in enumerate(solution.processors):
+        assignment[list(tasks)] = processor
+    return assignment
+
+
+def _assignment_dtype(processors_number: int):
+    if processors_number <= 2 ** 8:
+        return numpy.uint8
+    if processors_number <= 2 ** 16:
+        return numpy.uint16
+    return numpy.int32
+
+
+def save_population(filename: str, instance: Instance, population, generation: int = 0):
+    """Saves a population as a compressed npz file, the file is replaced atomically.
+
+    :param filename: name of the checkpoint file
+    :param instance: solved problem instance
+    :param population: (population_size x tasks_number) matrix, population[i][task_index] = processor
+    :param generation: number of the generation of the population
+    """
+    population = numpy.asarray(population).reshape(-1, len(instance.tasks_durations))
+    temporary = f"{filename}.tmp"
+    with open(temporary, 'wb') as target:
+        numpy.savez_compressed(
+            target,
+            version=CHECKPOINT_VERSION,
+            fingerprint=instance.fingerprint,
+            processors_number=instance.processors_number,
+            generation=generation,
+            population=population.astype(_assignment_dtype(instance.processors_number))
+        )
+    os.replace(temporary, filename)
+
+
+def load_population(filename: str, instance: Instance) -> tuple:
+    """Loads a population saved by py:func:`save_population`.
+
+    :param filename: name of the checkpoint file
+    :param instance: solved problem instance, the checkpoint has to belong to it
+    :raise FileContentError: if the file isn't a valid checkpoint of the instance
+    :return: (population_size x tasks_number) int32 matrix and the number of the generation of the population
+    """
+    try:
+        with numpy.load(filename) as checkpoint:
+            if int(checkpoint["version"]) != CHECKPOINT_VERSION:
+                raise FileContentError(f"unsupported checkpoint version ({int(checkpoint['version'])})")
+            fingerprint = str(checkpoint["fingerprint"])
+            population = checkpoint["population"].astype(numpy.int32)
+            generation = int(checkpoint["generation"])
+    except (KeyError, ValueError, zipfile.BadZipFile) as error:
+        raise FileContentError(f"file is not a valid checkpoint ({error})")
+    if fingerprint != instance.fingerprint:
+        raise FileContentError("checkpoint belongs to a different instance")
+    if population.ndim != 2 or population.shape[1] != len(instance.tasks_durations):
+        raise FileContentError("shape of the population doesn't match the instance")
+    if population.size > 0 and (population.min() < 0 or population.max() >= instance.processors_number):
+        raise FileContentError("population assigns tasks to nonexistent processors")
+    return population, generation
+
+
+def load_seeds(filenames: list, instance: Instance) -> tuple:
+    """Loads the assignments of solution toml files and checkpoints of populations.
+
+    :param filenames: names of the toml or npz files
+    :param instance: solved problem instance, all of the files have to belong to it
+    :raise FileContentError: if a file isn't valid or belongs to a different instance
+    :return: (seeds_number x tasks_number) int32 matrix and the number of the generation of the most evolved
+        population, 0 if only solutions are loaded
+    """
+    seeds = [numpy.zeros((0, len(instance.tasks_durations)), dtype=numpy.int32)]
+    generation = 0
+    for filename in filenames:
+        if zipfile.is_zipfile(filename):
+            population, population_generation = load_population(filename, instance)
+            seeds.append(population)
+            generation = max(generation, population_generation)
+            continue
+        solution, _ = InstanceSolution.load_toml(filename)
+        if solution.instance != instance:
+            raise FileContentError(f"solution ({filename}) belongs to a different instance")
+        seeds.append(assignment_of(solution)[None, :])
+    return numpy.concatenate(seeds), generation
+
+
+class Checkpoint:
+    """Saves populations of a genetic algorithm at most once per period.
+
+    The algorithms check py:meth:`due` every generation, which is cheap, and build the population matrix only
+    when it returns True. Saving is thread safe.
+
+    :ivar filename: name of the checkpoint file
+    :type filename: str
+    :ivar instance: solved problem instance
+    :type instance: Instance
+    :ivar period: minimal time between two checkpoints in seconds
+    :type period: float
+    :ivar saves: number of saved checkpoints
+    :type saves: int
+    """
+    def __init__(self, filename: str, instance: Instance, period: float = CHECKPOINT_PERIOD):
+        self.filename = filename
+        self.instance = instance
+        self.period = period
+        self.saves = 0
+        self.lock = Lock()
+        self.next_save = time.monotonic() + period
+
+    def due(self) -> bool:
+        return time.monotonic() >= self.next_save
+
+    def save(self, population, generation: int = 0, force: bool = False):
+        """Saves the population if the period has passed since the last checkpoint or if forced.
+
+        :param population: (population_size x tasks_number) matrix, population[i][task_index] = processor
+        :param generation: number of the generation of the population
+        :param force: save even if the period hasn't passed
+        """
+        with self.lock:
+            if not force and not self.due():
+                return
+            save_population(self.filename, self.instance, population, generation)
+            self.saves += 1
+            self.next_save = time.monotonic() + self.period
+
+
+__all__ = ["Checkpoint", "save_population", "load_population", "load_seeds", "assignment_of"]
@@ -0,0 +1,108 @@
+from __future__ import annotations
+import numpy
+from .problem import Instance, InstanceSolution
+
+
+class CompactSolution:
+    """A compact, array backed representation of a P||Cmax problem solution.
+
+    Copies share the instance and the durations array, only the assignment and the loads are copied.
+
+    :ivar instance: P||Cmax problem instance
+    :type instance: py:class:`Instance`
+    :ivar tasks_durations: durations of the tasks
+    :type tasks_durations: numpy.ndarray
+    :ivar assignment: assignment[task_index] = processor the task is assigned to
+    :type assignment: numpy.ndarray
+    :ivar loads: loads[processor_index] = sum of durations of the tasks assigned to the processor
+    :type loads: numpy.ndarray
+    """
+    __slots__ = ("instance", "tasks_durations", "assignment", "loads")
+
+    def __init__(self, instance: Instance, assignment, tasks_durations: numpy.ndarray = None):
+        """Creates a py:class:`CompactSolution` object.
+
+        :param instance: P||Cmax problem instance
+        :param assignment: assignment[task_index] = processor the task is assigned to
+        :param tasks_durations: optional durations array shared with other solutions of the same instance
+        """
+        if tasks_durations is None:
+            tasks_durations = numpy.asarray(instance.tasks_durations, dtype=numpy.int64)
+        self.instance = instance
+        self.tasks_durations = tasks_durations
+        self.assignment = numpy.asarray(assignment, dtype=numpy.int32)
+        self.loads = numpy.zeros(instance.processors_number, dtype=numpy.int64)
+        numpy.add.at(self.loads, self.assignment, tasks_durations)
+
+    @property
+    def total_time(self) -> int:
+        """Returns the load of the most loaded processor."""
+        return int(self.loads.max())
+
+    def __lt__(self, other: CompactSolution) -> bool:
+        return self.total_time < other.total_time
+
+    def copy(self) -> CompactSolution:
+        """Returns a copy sharing the instance and the durations array."""
+        result = CompactSolution.__new__(CompactSolution)
+        result.instance = self.instance
+        result.tasks_durations = self.tasks_durations
+        result.assignment = numpy.copy(self.assignment)
+        result.loads = numpy.copy(self.loads)
+        return result
+
+    def __copy__(self) -> CompactSolution:
+        return self.copy()
+
+    def __deepcopy__(self, memo: dict) -> CompactSolution:
+        return self.copy()
+
+    def move(self, task_index: int, processor: int):
+        """Moves the task to the given processor.
+
+        :param task_index: index of the moved task
+        :param processor: index of the target processor
+        """
+        duration = self.tasks_durations[task_index]
+        self.loads[self.assignment[task_index]] -= duration
+        self.loads[processor] += duration
+        self.assignment[task_index] = processor
+
+    def swap(self, task_1: int, task_2: int):
+        """Swaps the processors of two tasks.
+
+        :param task_1: index of the first task
+        :param task_2: index of the second task
+        """
+        processor_1 = self.assignment[task_1]
+        processor_2 = self.assignment[task_2]
+        difference = self.tasks_durations[task_1] - self.tasks_durations[task_2]
+        self.loads[processor_1] -= difference
+        self.loads[processor_2] += difference
+        self.assignment[task_1] = processor_2
+        self.assignment[task_2] = processor_1
+
+    def processors(self) -> list:
+        """Returns the list of processors with tasks allocated to them."""
+        order = numpy.argsort(self.assignment, kind="stable")
+        bounds = numpy.cumsum(numpy.bincount(self.assignment, minlength=self.instance.processors_number))
+        return [chunk.tolist() for chunk in numpy.split(order, bounds[:-1])]
+
+    def to_instance_solution(self) -> InstanceSolution:
+        """Creates a py:class:`InstanceSolution` object with the same schedule."""
+        return InstanceSolution(self.instance, self.processors())
+
+    @staticmethod
+    def from_instance_solution(solution: InstanceSolution, tasks_durations: numpy.ndarray = None) -> CompactSolution:
+        """Creates a py:class:`CompactSolution` object with the same schedule.
+
+        :param solution: solution of a P||Cmax problem instance
+        :param tasks_durations: optional durations array shared with other solutions of the same instance
+        """
+        assignment = numpy.zeros(len(solution.instance.tasks_durations), dtype=numpy.int32)
+        for processor_index, tasks in enumerate(solution.processors):
+            assignment[tasks] = processor_index
+        return CompactSolution(solution.instance, assignment, tasks_durations)
+
+
+__all__ = ["CompactSolution"]
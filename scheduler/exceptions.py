@@ -4,3 +4,7 @@ class FileContentError(Exception):
 
 class IncorrectGeneratorDatasetError(Exception):
     """Exception that is called if input parameters to generator are incorrect."""
+
+
+class StateLimitError(Exception):
+    """Exception that is called if a dynamic programming table would exceed its size limit."""
@@ -0,0 +1,114 @@
+import itertools
+import numpy
+
+# Height of a bar, processors are drawn one unit apart
+BAR_HEIGHT = 0.8
+# Default size (in inches) of one exported chart and resolution of the exported images
+FIGURE_SIZE = (8, 6)
+DPI = 100
+
+
+def bars(solution) -> tuple:
+    """Computes the bars of the Gantt chart of the solution at once.
+
+    :param solution: solution of a problem instance
+    :return: (rows, lefts, widths, layers) arrays, a bar for every task in the order of the processors, the layer
+        of a bar is its position on the processor
+    """
+    counts = numpy.fromiter(map(len, solution.processors), dtype=numpy.int64, count=len(solution.processors))
+    tasks = numpy.fromiter(itertools.chain.from_iterable(solution.processors), dtype=numpy.int64, count=counts.sum())
+    widths = numpy.asarray(solution.instance.tasks_durations, dtype=numpy.int64)[tasks]
+    rows = numpy.repeat(numpy.arange(len(counts)), counts)
+    firsts = numpy.cumsum(counts) - counts
+    ends = numpy.cumsum(widths)
+    # Every processor starts at 0, so the ends of the previous processors are subtracted
+    ends -= numpy.repeat(numpy.concatenate(([0], ends))[firsts], counts)
+    layers = numpy.arange(len(tasks)) - numpy.repeat(firsts, counts)
+    return rows, ends - widths, widths, layers
+
+
+def aggregate(rows, lefts, widths, layers, resolution: float) -> tuple:
+    """Merges consecutive bars of a processor which end within the same interval of the resolution.
+
+    Bars narrower than the resolution (e.g. a pixel) can't be told apart, so drawing them separately is a waste.
+    A merged bar keeps the layer of its first bar.
+
+    :param rows: processors of the bars
+    :param lefts: starts of the bars
+    :param widths: widths of the bars
+    :param layers: positions of the bars on their processors
+    :param resolution: width of the interval
+    :return: (rows, lefts, widths, layers) arrays of the merged bars
+    """
+    if len(rows) == 0 or resolution <= 0:
+        return rows, lefts, widths, layers
+    ends = lefts + widths
+    bins = numpy.floor_divide(ends, resolution)
+    # The last bar of every processor is always kept, so merged bars never span two processors
+    kept = numpy.ones(len(rows), dtype=bool)
+    kept[:-1] = (bins[:-1] != bins[1:]) | (rows[:-1] != rows[1:])
+    lasts = numpy.flatnonzero(kept)
+    firsts = numpy.concatenate(([0], lasts[:-1] + 1))
+    return rows[lasts], lefts[firsts], ends[lasts] - lefts[firsts], layers[firsts]
+
+
+def draw(solution, ax, downsample: bool = True):
+    """Draws the Gantt chart of the solution as a single collection of polygons.
+
+    :param solution: solution of a problem instance
+    :param ax: matplotlib axes
+    :param downsample: merge the bars narrower than a pixel of the axes
+    :return: filled ax
+    """
+    from matplotlib import rcParams
+    from matplotlib.collections import PolyCollection
+    from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+    processors_number = solution.instance.processors_number
+    rows, lefts, widths, layers = bars(solution)
+    total_time = int((lefts + widths).max()) if len(rows) > 0 else 0
+    if downsample and total_time > 0:
+        rows, lefts, widths, layers = aggregate(rows, lefts, widths, layers, total_time / max(ax.bbox.width, 1))
+
+    # Processor 0 is drawn at the top
+    y = processors_number - 1 - rows
+    vertices = numpy.empty((len(rows), 4, 2))
+    vertices[:, [0, 3], 0] = lefts[:, None]
+    vertices[:, [1, 2], 0] = (lefts + widths)[:, None]
+    vertices[:, [0, 1], 1] = (y - BAR_HEIGHT / 2)[:, None]
+    vertices[:, [2, 3], 1] = (y + BAR_HEIGHT / 2)[:, None]
+    colors = rcParams["axes.prop_cycle"].by_key()["color"]
+    ax.add_collection(PolyCollection(
+        vertices, facecolors=[colors[layer % len(colors)] for layer in layers.tolist()], linewidths=0
+    ))
+
+    ax.set_xlim(0, max(total_time, 1))
+    ax.set_ylim(-0.5, processors_number - 0.5)
+    ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda value, _: f"{processors_number - 1 - int(value)}"))
+    ax.set_title("instance solution visualization")
+    ax.set_ylabel("processor")
+    ax.set_xlabel("execution time")
+    return ax
+
+
+def save(solutions: list, filename: str, titles: list = None, dpi: int = DPI):
+    """Saves the Gantt charts of the solutions side by side in an image, without any GUI backend.
+
+    :param solutions: solutions of problem instances
+    :param filename: name of the image, the format (e.g. png, svg) is taken from the extension
+    :param titles: optional titles of the charts
+    :param dpi: resolution of the image
+    """
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=(FIGURE_SIZE[0] * len(solutions), FIGURE_SIZE[1]), dpi=dpi)
+    axes = figure.subplots(1, len(solutions), squeeze=False)[0]
+    for ax, solution, title in zip(axes, solutions, titles or [None] * len(solutions)):
+        draw(solution, ax)
+        if title is not None:
+            ax.set_title(title)
+    figure.savefig(filename)
+
+
+__all__ = ["draw", "save", "bars", "aggregate"]
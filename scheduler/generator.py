@@ -1,7 +1,10 @@
 from scheduler.problem import Instance
 from scheduler.exceptions import IncorrectGeneratorDatasetError
+import json
 import math
+import os
 import random
+import numpy
 
 
 def generate_list_which_sums_to_value(sum_value: int, list_length: int, elements_range: (int, int)) -> list:
@@ -69,3 +72,140 @@ def generate(cmax: int, tasks_number: int, processors_number: int, task_duration
 
     return Instance(processors_number, result_list)
 
+
+def _spread(rng: numpy.random.Generator, group: numpy.ndarray, weights: numpy.ndarray, amounts: numpy.ndarray) -> numpy.ndarray:
+    """Distributes amounts[g] units among the elements of group g proportionally to their weights.
+
+    The fractional parts are given away as single units to randomly chosen elements with positive weights.
+
+    :param rng: random numbers generator
+    :param group: group[element] = index of the group of the element, elements of a group are contiguous
+    :param weights: nonnegative weights of the elements, every group with a positive amount has a positive weight
+    :param amounts: amounts[g] = number of units given to the group g
+    :return: number of units given to every element
+    """
+    groups_number = len(amounts)
+    weights_sum = numpy.bincount(group, weights=weights, minlength=groups_number)
+    safe_sum = numpy.where(weights_sum > 0, weights_sum, 1.0)
+    values = numpy.floor(weights * (amounts / safe_sum)[group]).astype(numpy.int64)
+    remainder = amounts - numpy.bincount(group, weights=values, minlength=groups_number).astype(numpy.int64)
+
+    # Rounding errors of huge amounts may give a group a unit too much, it's taken back from its largest element
+    for group_index in numpy.flatnonzero(remainder < 0):
+        members = numpy.flatnonzero(group == group_index)
+        values[members[numpy.argmax(values[members])]] += remainder[group_index]
+        remainder[group_index] = 0
+
+    keys = numpy.where(weights > 0, rng.random(len(weights)), 2.0)
+    order = numpy.lexsort((keys, group))
+    starts = numpy.concatenate(([0], numpy.cumsum(numpy.bincount(group, minlength=groups_number))[:-1]))
+    ranks = numpy.arange(len(order)) - starts[group[order]]
+    values[order[ranks < remainder[group[order]]]] += 1
+    return values
+
+
+def bounded_compositions(rng: numpy.random.Generator, totals: numpy.ndarray, counts: numpy.ndarray, elements_range: (int, int)) -> numpy.ndarray:
+    """Generates, for every group, a list of given length with elements from a range which sums to a given value.
+
+    The values are drawn uniformly from the simplex (Dirichlet weights) and rounded, so no position is favoured.
+
+    :param rng: random numbers generator
+    :param totals: totals[g] = required sum of the group g
+    :param counts: counts[g] = length of the group g
+    :param elements_range: tuple in format (min, max) which indicate a closed range
+    :raise IncorrectGeneratorDatasetError: if it's not possible to generate such lists
+    :return: concatenated lists of all of the groups
+    """
+    element_value_min, element_value_max = elements_range
+    totals = numpy.asarray(totals, dtype=numpy.int64)
+    counts = numpy.asarray(counts, dtype=numpy.int64)
+    if numpy.any(totals < element_value_min * counts) or numpy.any(totals > element_value_max * counts):
+        raise IncorrectGeneratorDatasetError('Sum is out of possible ranges')
+
+    group = numpy.repeat(numpy.arange(len(counts)), counts)
+    capacity = element_value_max - element_value_min
+    values = _spread(rng, group, rng.exponential(size=len(group)), totals - counts * element_value_min)
+    while True:
+        excess = numpy.maximum(values - capacity, 0)
+        if not excess.any():
+            break
+        values -= excess
+        overflow = numpy.bincount(group, weights=excess, minlength=len(counts)).astype(numpy.int64)
+        values += _spread(rng, group, (capacity - values).astype(numpy.float64), overflow)
+    return values + element_value_min
+
+
+def generate_array(cmax: int, tasks_number: int, processors_number: int, task_duration_max: int, rng=None) -> numpy.ndarray:
+    """Vectorized version of py:func:`generate`, returns the durations of the tasks as a numpy array.
+
+    :param cmax: Optimal total time of execution of all tasks
+    :param tasks_number: Number of tasks that should be generated
+    :param processors_number: Number of processors on which tasks will be executed
+    :param task_duration_max: Max value of task duration
+    :param rng: numpy.random.Generator or a seed for a new one
+    :return: Generated durations of the tasks
+    """
+    rng = numpy.random.default_rng(rng)
+    tasks_rectangle_width = cmax - 1
+    tasks_in_rectangle = tasks_number - 1
+    total_length_of_rest_of_tasks = processors_number * tasks_rectangle_width
+
+    max_tasks_per_processor = math.floor(tasks_rectangle_width / 2)
+    min_tasks_per_processor = math.ceil(tasks_rectangle_width / task_duration_max)
+
+    if not (2 * tasks_in_rectangle <= total_length_of_rest_of_tasks <= task_duration_max * tasks_in_rectangle):
+        raise IncorrectGeneratorDatasetError('Cmax is out of possible ranges')
+
+    tasks_per_processor = bounded_compositions(
+        rng, [tasks_in_rectangle], [processors_number], (min_tasks_per_processor, max_tasks_per_processor)
+    )
+    durations = bounded_compositions(
+        rng, numpy.full(processors_number, tasks_rectangle_width), tasks_per_processor, (2, task_duration_max)
+    )
+    return rng.permutation(numpy.concatenate(([1], durations)))
+
+
+def generate_vectorized(cmax: int, tasks_number: int, processors_number: int, task_duration_max: int, rng=None) -> Instance:
+    """Vectorized version of py:func:`generate`, the optimal total time of the generated instance is equal to cmax.
+
+    :param cmax: Optimal total time of execution of all tasks
+    :param tasks_number: Number of tasks that should be generated
+    :param processors_number: Number of processors on which tasks will be executed
+    :param task_duration_max: Max value of task duration
+    :param rng: numpy.random.Generator or a seed for a new one
+    :return: Generated problem instance, its tasks_durations is a numpy array
+    """
+    return Instance(processors_number, generate_array(cmax, tasks_number, processors_number, task_duration_max, rng))
+
+
+def generate_batch(directory: str, count: int, cmax: int, tasks_number: int, processors_number: int,
+                   task_duration_max: int, rng=None, binary: bool = True) -> list:
+    """Generates instances one by one and writes them straight to disk, alongside a manifest with their optima.
+
+    :param directory: target directory, created if it doesn't exist
+    :param count: number of instances
+    :param cmax: Optimal total time of execution of all tasks
+    :param tasks_number: Number of tasks that should be generated
+    :param processors_number: Number of processors on which tasks will be executed
+    :param task_duration_max: Max value of task duration
+    :param rng: numpy.random.Generator or a seed for a new one
+    :param binary: write the binary instance format instead of txt
+    :return: paths to the generated files
+    """
+    rng = numpy.random.default_rng(rng)
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    manifest = {}
+    for index in range(count):
+        instance = generate_vectorized(cmax, tasks_number, processors_number, task_duration_max, rng)
+        name = f"m{processors_number}n{tasks_number}c{cmax}-{index}.{'bin' if binary else 'txt'}"
+        path = os.path.join(directory, name)
+        if binary:
+            instance.save_bin(path)
+        else:
+            instance.save_txt(path)
+        paths.append(path)
+        manifest[name] = cmax
+    with open(os.path.join(directory, "manifest.json"), 'w') as target:
+        json.dump(manifest, target, indent=2)
+    return paths
@@ -1,9 +1,47 @@
 from __future__ import annotations
-import matplotlib.axes as axes
-import matplotlib.pyplot as pyplot
-import numpy
-import toml
+import array
+import hashlib
+import itertools
+import struct
+import sys
+import warnings
 from .exceptions import FileContentError
+from .bounds import lower_bound, is_optimal
+
+# Binary instance format: magic, version, size of a duration in bytes, processors number, tasks number,
+# followed by the little-endian durations
+BINARY_MAGIC = b"PCMAX\0"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<6sBBQQ")
+BINARY_DTYPES = {4: "<i4", 8: "<i8"}
+# Processors number and tasks number hashed before the durations by Instance.fingerprint
+FINGERPRINT_HEADER = struct.Struct("<QQ")
+# Compact solution toml: the header tables are followed by the body table, which holds the durations and
+# assignment[task_index] = processor, every array in one line, so the header can be read without parsing the body
+SOLUTION_FORMAT = "assignment"
+BODY_TABLE = "[body]"
+
+
+def _parse_body(body: str) -> dict:
+    """Parses the arrays of the body table of a compact solution file."""
+    import numpy
+
+    arrays = {}
+    for line in body.splitlines():
+        name, separator, value = line.partition("=")
+        value = value.strip()
+        if not separator or not value.startswith("[") or not value.endswith("]"):
+            if line.strip():
+                raise FileContentError("solution body is corrupted")
+            continue
+        with warnings.catch_warnings():
+            # Unparsable values are reported by numpy with a warning instead of an exception
+            warnings.simplefilter("error", DeprecationWarning)
+            try:
+                arrays[name.strip()] = numpy.fromstring(value[1:-1], dtype=numpy.int64, sep=",")
+            except (ValueError, DeprecationWarning):
+                raise FileContentError("solution body is corrupted")
+    return arrays
 
 
 class Instance:
@@ -12,7 +50,7 @@ class Instance:
     :ivar processors_number: number of available processors
     :type processors_number: int
     :ivar tasks_durations: tasks_durations[process_indicator] = time it takes for the task to be completed
-    :type tasks_durations: list
+    :type tasks_durations: list, array.array or numpy.ndarray
     """
     def __init__(self, processors_number: int, tasks_durations: list):
         """Creates a py:class:`ProblemInstance` object.
@@ -25,26 +63,87 @@ class Instance:
         self.processors_number = processors_number
         self.tasks_durations = tasks_durations
 
+    def __setattr__(self, name, value):
+        # Replacing the definition of the instance invalidates its fingerprint
+        if name in ("processors_number", "tasks_durations"):
+            self.__dict__.pop("_fingerprint", None)
+        super().__setattr__(name, value)
+
+    @property
+    def fingerprint(self) -> str:
+        """Content hash (SHA-256) of the processors number and the durations.
+
+        It's computed once, so the durations mustn't be modified in place after it's been used.
+        """
+        fingerprint = self.__dict__.get("_fingerprint")
+        if fingerprint is None:
+            digest = hashlib.sha256(FINGERPRINT_HEADER.pack(self.processors_number, len(self.tasks_durations)))
+            if isinstance(self.tasks_durations, (list, tuple, array.array)):
+                # Same bytes as the numpy path, without importing numpy for plain sequences
+                durations = array.array('q', map(int, self.tasks_durations))
+                if sys.byteorder == "big":
+                    durations.byteswap()
+                digest.update(durations.tobytes())
+            else:
+                import numpy
+
+                digest.update(numpy.ascontiguousarray(self.tasks_durations, dtype="<i8").tobytes())
+            fingerprint = self._fingerprint = digest.hexdigest()
+        return fingerprint
+
+    def __hash__(self) -> int:
+        return int(self.fingerprint[:16], 16)
+
     def __eq__(self, other: Instance) -> bool:
         """Compares two Instance objects
 
         :param other: other instance
         """
-        return self.tasks_durations == other.tasks_durations and self.processors_number == other.processors_number
+        if not isinstance(other, Instance):
+            return NotImplemented
+        if self is other:
+            return True
+        if "_fingerprint" in self.__dict__ and "_fingerprint" in other.__dict__:
+            return self._fingerprint == other._fingerprint
+        return (
+            self.processors_number == other.processors_number and
+            len(self.tasks_durations) == len(other.tasks_durations) and
+            all(a == b for a, b in zip(self.tasks_durations, other.tasks_durations))
+        )
+
+    @staticmethod
+    def load(filename: str) -> Instance:
+        """Creates a py:class:`Instance` object from a txt or binary file, the format is detected from the contents.
+
+        :param filename: name of the file
+        :return: created object
+        """
+        with open(filename, 'rb') as source:
+            magic = source.read(len(BINARY_MAGIC))
+        if magic == BINARY_MAGIC:
+            return Instance.load_bin(filename)
+        return Instance.load_txt(filename)
 
     @staticmethod
-    def load_txt(filename: str) -> Instance:
+    def load_txt(filename: str, typed: bool = False) -> Instance:
         """Creates a py:class:`Instance` object from a valid txt file.
 
+        The file is parsed line by line, so only the durations themselves are kept in memory.
+
         :param filename: name of the text file
+        :param typed: store the durations in a typed array.array instead of a list
         :return: created object
         """
         with open(filename, 'r') as source:
             try:
                 processors_number = int(source.readline())
                 tasks_number = int(source.readline())
-                tasks_durations = list(map(int, source.read().strip().split('\n')))
-            except ValueError:
+                tasks_durations = array.array('q') if typed else []
+                for line in source:
+                    line = line.strip()
+                    if line:
+                        tasks_durations.append(int(line))
+            except (ValueError, OverflowError):
                 raise FileContentError(
                     f"file must contain <processors_number> and <tasks_number>, every value must be an \\n separated int"
                 )
@@ -66,11 +165,93 @@ class Instance:
         :param filename: name of the text file
         """
         with open(filename, 'w') as target:
-            print(self.processors_number, file=target)
-            print(len(self.tasks_durations), file=target)
+            target.write(f"{self.processors_number}\n{len(self.tasks_durations)}\n")
+            target.writelines(f"{task_duration}\n" for task_duration in self.tasks_durations)
+
+    @staticmethod
+    def load_bin(filename: str, mmap: bool = True) -> Instance:
+        """Creates a py:class:`Instance` object from a valid binary file.
+
+        :param filename: name of the binary file
+        :param mmap: map the durations into memory (read-only, no copies) instead of reading them
+        :return: created object, its tasks_durations is a numpy array
+        """
+        import numpy
+
+        with open(filename, 'rb') as source:
+            header = source.read(BINARY_HEADER.size)
+        if len(header) != BINARY_HEADER.size:
+            raise FileContentError("file is too short to contain the header")
+        magic, version, item_size, processors_number, tasks_number = BINARY_HEADER.unpack(header)
+        if magic != BINARY_MAGIC:
+            raise FileContentError("file is not a binary instance file")
+        if version != BINARY_VERSION:
+            raise FileContentError(f"unsupported binary format version ({version})")
+        if item_size not in BINARY_DTYPES:
+            raise FileContentError(f"unsupported size of a duration ({item_size})")
+        if processors_number <= 0:
+            raise FileContentError(f"number of processors must be > 0, not ({processors_number})")
+        dtype = numpy.dtype(BINARY_DTYPES[item_size])
+        if tasks_number == 0:
+            tasks_durations = numpy.zeros(0, dtype=dtype)
+        elif mmap:
+            try:
+                tasks_durations = numpy.memmap(
+                    filename, dtype=dtype, mode='r', offset=BINARY_HEADER.size, shape=(tasks_number,)
+                )
+            except ValueError:
+                raise FileContentError(
+                    f"declared number of tasks ({tasks_number}) is not equal to the length of tasks durations list"
+                )
+        else:
+            tasks_durations = numpy.fromfile(filename, dtype=dtype, offset=BINARY_HEADER.size)
+            if len(tasks_durations) != tasks_number:
+                raise FileContentError(
+                    f"declared number of tasks ({tasks_number}) is not equal to the length of tasks durations list"
+                )
+        return Instance(processors_number, tasks_durations)
+
+    def save_bin(self, filename: str, item_size: int = None):
+        """Saves a py:class:`Instance` object in a binary file.
+
+        :param filename: name of the binary file
+        :param item_size: size of a duration in bytes (4 or 8), by default the smallest one that fits
+        """
+        import numpy
+
+        tasks_durations = numpy.asarray(self.tasks_durations, dtype=numpy.int64)
+        if item_size is None:
+            fits = len(tasks_durations) == 0 or (
+                tasks_durations.min() >= numpy.iinfo(numpy.int32).min and
+                tasks_durations.max() <= numpy.iinfo(numpy.int32).max
+            )
+            item_size = 4 if fits else 8
+        if item_size not in BINARY_DTYPES:
+            raise ValueError(f"size of a duration must be one of {tuple(BINARY_DTYPES)}, not ({item_size})")
+        with open(filename, 'wb') as target:
+            target.write(BINARY_HEADER.pack(
+                BINARY_MAGIC, BINARY_VERSION, item_size, self.processors_number, len(tasks_durations)
+            ))
+            tasks_durations.astype(BINARY_DTYPES[item_size]).tofile(target)
+
 
-            for i in range(len(self.tasks_durations)):
-                print(self.tasks_durations[i], file=target)
+def convert_txt_to_bin(source: str, target: str, item_size: int = None):
+    """Converts an instance from the txt format to the binary format.
+
+    :param source: name of the text file
+    :param target: name of the binary file
+    :param item_size: size of a duration in bytes (4 or 8), by default the smallest one that fits
+    """
+    Instance.load_txt(source, typed=True).save_bin(target, item_size)
+
+
+def convert_bin_to_txt(source: str, target: str):
+    """Converts an instance from the binary format to the txt format.
+
+    :param source: name of the binary file
+    :param target: name of the text file
+    """
+    Instance.load_bin(source).save_txt(target)
 
 
 class InstanceSolution:
@@ -89,7 +270,35 @@ class InstanceSolution:
         """
         self.instance = instance
         self.processors = processors
-        self.total_time = max(map(sum, self))
+        self.invalidate()
+
+    def invalidate(self):
+        """Drops the cached loads and total time, must be called after the processors are modified in place.
+
+        Subclasses which keep the loads up to date themselves may modify :py:attr:`loads` in place and assign
+        :py:attr:`total_time` instead.
+        """
+        self._loads = None
+        self._total_time = None
+
+    @property
+    def loads(self) -> list:
+        """Sums of durations of the tasks allocated to every processor, computed on the first access."""
+        if self._loads is None:
+            tasks_durations = self.instance.tasks_durations
+            self._loads = [sum(tasks_durations[task] for task in processor) for processor in self.processors]
+        return self._loads
+
+    @property
+    def total_time(self):
+        """Load of the most loaded processor, computed on the first access."""
+        if self._total_time is None:
+            self._total_time = max(self.loads)
+        return self._total_time
+
+    @total_time.setter
+    def total_time(self, value):
+        self._total_time = value
 
     def __len__(self):
         """Returns the processors number."""
@@ -104,101 +313,201 @@ class InstanceSolution:
         """Replaces tasks indexes in the chosen processor with their execution time.
         :param processor_index: index of a chosen processor
         """
-        return list(map(
-            lambda t: self.instance.tasks_durations[t],
-            self.processors[processor_index]
-        ))
+        tasks_durations = self.instance.tasks_durations
+        return [tasks_durations[task] for task in self.processors[processor_index]]
 
-    def plot(self, ax: pyplot.Axes = None) -> axes.Axes:
-        """Creates a graphical visualization of the solution.
+    def plot(self, ax: pyplot.Axes = None, downsample: bool = True) -> axes.Axes:
+        """Creates a graphical visualization of the solution, drawn as a single collection of bars.
 
-        :param ax: optional title
+        :param ax: optional axes, if not provided the visualization is shown in a new window
+        :param downsample: merge the bars narrower than a pixel
         :return: filled ax if ax provided
         """
-        if ax is None:
-            inplace = True
-            _, ax = pyplot.subplots()
-        else:
-            inplace = False
-        y = numpy.arange(self.instance.processors_number)
-        length = max([len(processor) for processor in self.processors])
-        x = numpy.zeros((length, self.instance.processors_number))
-        for i, processor in enumerate(self):
-            for j in range(len(processor)):
-                x[j][self.instance.processors_number - 1 - i] = processor[j]
-        sigma = numpy.zeros(self.instance.processors_number)
-        for i in range(length):
-            ax.barh(y, x[i], left=sigma)
-            sigma += x[i]
-        labels = [f"{i}" for i in range(self.instance.processors_number - 1, -1, -1)]
-        ax.set_yticks(y)
-        ax.set_yticklabels(labels)
-        ax.set_title("instance solution visualization")
-        ax.set_ylabel("processor")
-        ax.set_xlabel("execution time")
-        if inplace:
-            pyplot.show()
+        from . import gantt
+
+        if ax is not None:
+            return gantt.draw(self, ax, downsample)
+        import matplotlib.pyplot as pyplot
+
+        _, ax = pyplot.subplots()
+        gantt.draw(self, ax, downsample)
+        pyplot.show()
         return ax
 
-    def save_toml(self, filename: str, extras: dict = None):
+    def save_plot(self, filename: str, title: str = None, dpi: int = None):
+        """Saves the visualization of the solution in an image (e.g. png, svg) without opening a window.
+
+        :param filename: name of the image, the format is taken from the extension
+        :param title: optional title of the chart
+        :param dpi: resolution of the image, gantt.DPI by default
+        """
+        from . import gantt
+
+        gantt.save([self], filename, [title], gantt.DPI if dpi is None else dpi)
+
+    def save_toml(self, filename: str, extras: dict = None, compact: bool = True):
         """Saves a py:class:`InstanceSolution` object alongside additional data in a toml file.
 
         :param filename: name of the toml file
         :param extras: dictionary containing additional simulation data
+        :param compact: store a single assignment vector after the header instead of a list of tasks per processor
         """
+        import toml
+
+        bound = lower_bound(self.instance.tasks_durations, self.instance.processors_number)
         package = {
-            "results": {"total_time": self.total_time},
+            "results": {
+                "total_time": int(self.total_time),
+                "lower_bound": bound,
+                "proven_optimal": is_optimal(self.total_time, bound)
+            },
             "simulation_data": extras,
-            "solution": {f"processor_{i}": j for i, j in enumerate(self.processors)},
-            "instance": {
+        }
+        tasks_durations = [int(task_duration) for task_duration in self.instance.tasks_durations]
+        if not compact:
+            package["solution"] = {f"processor_{i}": j for i, j in enumerate(self.processors)}
+            package["instance"] = {
                 "number_of_processors": self.instance.processors_number,
-                "number_of_tasks": len(self.instance.tasks_durations),
-                "tasks_durations": self.instance.tasks_durations
+                "number_of_tasks": len(tasks_durations),
+                "tasks_durations": tasks_durations
             }
+            with open(filename, 'w') as target:
+                toml.dump(package, target)
+            return
+
+        package["instance"] = {
+            "number_of_processors": self.instance.processors_number,
+            "number_of_tasks": len(tasks_durations),
+            "fingerprint": self.instance.fingerprint
         }
+        package["solution"] = {"format": SOLUTION_FORMAT}
+        assignment = [0] * len(tasks_durations)
+        for processor, tasks in enumerate(self.processors):
+            for task in tasks:
+                assignment[task] = processor
         with open(filename, 'w') as target:
             toml.dump(package, target)
+            target.write(f"\n{BODY_TABLE}\n")
+            target.write(f"tasks_durations = [{', '.join(map(str, tasks_durations))}]\n")
+            target.write(f"assignment = [{', '.join(map(str, assignment))}]\n")
 
     @staticmethod
-    def load_toml(filename: str) -> (InstanceSolution, dict):
+    def read_header(filename: str) -> dict:
+        """Reads the results, the simulation data, the size and the fingerprint of the instance without parsing the
+        solution.
+
+        Only files saved in the compact format are read lazily. The others are parsed whole, so their solution is
+        validated like by py:meth:`load_toml`, and the fingerprint and the lower bound missing in them are computed
+        from the tasks durations.
+
+        :param filename: name of the toml file
+        :raise FileContentError: if the file is saved in the old format and its solution isn't valid
+        :return: header tables of the file
         """
+        import toml
+
+        lines = []
+        with open(filename, 'r') as source:
+            for line in source:
+                if line.strip() == BODY_TABLE:
+                    return toml.loads("".join(lines))
+                lines.append(line)
+        package = toml.loads("".join(lines))
+        solution = InstanceSolution._from_package(package)
+        package["instance"].pop("tasks_durations")
+        package["instance"]["fingerprint"] = solution.instance.fingerprint
+        package["results"].setdefault(
+            "lower_bound", lower_bound(solution.instance.tasks_durations, solution.instance.processors_number)
+        )
+        package.pop("solution")
+        return package
+
+    @staticmethod
+    def load_toml(filename: str) -> (InstanceSolution, dict):
+        """Creates a py:class:`InstanceSolution` object from a toml file saved in the compact or the old format.
+
+        The assignment is validated with vectorized checks: every task has to be assigned to exactly one existing
+        processor and the loads are computed with a single bincount.
 
         :param filename: name of the toml file
         :return: created object and simulation data
         """
+        import toml
+
         with open(filename, 'r') as source:
-            package = toml.load(source)
+            text = source.read()
+        header, separator, body = text.partition(f"\n{BODY_TABLE}\n")
+        package = toml.loads(header)
+        solution = InstanceSolution._from_package(package, body if separator else None)
+        return solution, package.get("simulation_data", {})
+
+    @staticmethod
+    def _from_package(package: dict, body: str = None) -> InstanceSolution:
+        """Validates the parsed tables of a solution file and creates the solution.
+
+        :param package: parsed header of a compact file or the whole old file
+        :param body: body of a compact file, None for the old format
+        :raise FileContentError: if the solution isn't valid
+        :return: created object
+        """
+        import numpy
+
         if "instance" not in package:
             raise FileContentError("file doesn't define instance")
         if "results" not in package:
             raise FileContentError("file doesn't contain results")
         if "solution" not in package:
             raise FileContentError("file doesn't define solution")
-        instance = Instance(
-            package["instance"].get("number_of_processors"),
-            package["instance"].get("tasks_durations")
-        )
-        if instance.tasks_durations is None or instance.processors_number is None:
-            raise FileContentError("instance definition is not complete")
-        if len(instance.tasks_durations) != package["instance"].get("number_of_tasks"):
+        processors_number = package["instance"].get("number_of_processors")
+        tasks_number = package["instance"].get("number_of_tasks")
+
+        if body is not None:
+            if package["solution"].get("format") != SOLUTION_FORMAT:
+                raise FileContentError("solution format is not supported")
+            arrays = _parse_body(body)
+            tasks_durations, assignment = arrays.get("tasks_durations"), arrays.get("assignment")
+            if tasks_durations is None or processors_number is None:
+                raise FileContentError("instance definition is not complete")
+            if assignment is None or len(assignment) != len(tasks_durations):
+                raise FileContentError("solution definition is corrupted")
+            processors = None
+        else:
+            tasks_durations = package["instance"].get("tasks_durations")
+            if tasks_durations is None or processors_number is None:
+                raise FileContentError("instance definition is not complete")
+            if len(package["solution"]) != processors_number:
+                raise FileContentError("solution definition is corrupted")
+            processors = [package["solution"].get(f"processor_{i}") for i in range(processors_number)]
+            if any(processor is None for processor in processors):
+                raise FileContentError("solution definition is corrupted")
+            counts = [len(processor) for processor in processors]
+            if sum(counts) != len(tasks_durations):
+                raise FileContentError("solution definition is corrupted")
+            tasks = numpy.fromiter(itertools.chain.from_iterable(processors), dtype=numpy.int64, count=sum(counts))
+            if len(tasks) > 0 and (tasks.min() < 0 or tasks.max() >= len(tasks)):
+                raise FileContentError("solution definition is corrupted")
+            # As many tasks as there are durations, so if none is repeated, all of them are assigned
+            if numpy.bincount(tasks, minlength=len(tasks)).max(initial=0) > 1:
+                raise FileContentError("solution definition is corrupted")
+            assignment = numpy.empty(len(tasks), dtype=numpy.int64)
+            assignment[tasks] = numpy.repeat(numpy.arange(processors_number), counts)
+
+        instance = Instance(processors_number, tasks_durations)
+        if len(tasks_durations) != tasks_number:
             raise FileContentError("instance definition is corrupted")
-        if len(package["solution"]) != instance.processors_number:
+        if "fingerprint" in package["instance"] and package["instance"]["fingerprint"] != instance.fingerprint:
+            raise FileContentError("instance definition is corrupted")
+        if len(assignment) > 0 and (assignment.min() < 0 or assignment.max() >= processors_number):
             raise FileContentError("solution definition is corrupted")
-        processors = []
-        tasks = [False for _ in instance.tasks_durations]
-        for i in range(instance.processors_number):
-            processor = package["solution"].get(f"processor_{i}")
-            if processor is None:
-                raise FileContentError("solution definition is corrupted")
-            for task in processor:
-                if task >= len(tasks):
-                    raise FileContentError("solution definition is corrupted")
-                if tasks[task]:
-                    raise FileContentError("solution definition is corrupted")
-                else:
-                    tasks[task] = True
-            processors.append(processor)
+        loads = numpy.bincount(
+            assignment, weights=numpy.asarray(tasks_durations, dtype=numpy.int64), minlength=processors_number
+        ).astype(numpy.int64)
+        if processors is None:
+            counts = numpy.bincount(assignment, minlength=processors_number)
+            order = numpy.argsort(assignment, kind="stable")
+            processors = [tasks.tolist() for tasks in numpy.split(order, numpy.cumsum(counts)[:-1])]
         solution = InstanceSolution(instance, processors)
+        solution._loads = loads.tolist()
         if package["results"].get("total_time") != solution.total_time:
             raise FileContentError("results are corrupted")
-        return solution, package.get("simulation_data", {})
+        return solution
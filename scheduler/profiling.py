@@ -0,0 +1,212 @@
+import contextlib
+import json
+import os
+import threading
+import time
+
+# Maximal number of measured phases kept by every thread for the Chrome trace, the sums are kept after it's reached
+MAX_TRACE_EVENTS = 200000
+FORMATS = ["json", "chrome"]
+
+
+class _ThreadStats:
+    """Measurements of a single thread, only the thread itself writes to them."""
+    def __init__(self, name: str):
+        self.name = name
+        self.phases = {}
+        self.events = []
+        self.generations = 0
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "begin")
+
+    def __init__(self, profiler, name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.begin = time.perf_counter()
+
+    def __exit__(self, *_):
+        self.profiler.record(self.name, self.begin, time.perf_counter())
+
+
+class _Acquire:
+    __slots__ = ("profiler", "name", "lock")
+
+    def __init__(self, profiler, name: str, lock):
+        self.profiler = profiler
+        self.name = name
+        self.lock = lock
+
+    def __enter__(self):
+        begin = time.perf_counter()
+        self.lock.acquire()
+        self.profiler.record(self.name, begin, time.perf_counter())
+
+    def __exit__(self, *_):
+        self.lock.release()
+
+
+class Profiler:
+    """Measures the phases of an algorithm, counts its generations and records the improvements of the solution.
+
+    Every thread sums its own measurements, so profiling doesn't add any lock contention, and the threads are
+    merged when the profile is exported. Phases of parallel threads add up, so their total time can exceed the
+    elapsed time.
+
+    :ivar trace: keep every measured phase for the Chrome trace, not only the sums
+    :type trace: bool
+    :ivar start: perf_counter value at the start of profiling
+    :type start: float
+    :ivar improvements: (elapsed, generations, total_time) tuples, one for every improvement of the best total time
+    :type improvements: list
+    """
+    def __init__(self, trace: bool = False):
+        self.trace = trace
+        self.start = time.perf_counter()
+        self.improvements = []
+        self.best = None
+        self.threads = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def _stats(self) -> _ThreadStats:
+        stats = getattr(self.local, "stats", None)
+        if stats is None:
+            stats = self.local.stats = _ThreadStats(threading.current_thread().name)
+            with self.lock:
+                self.threads.append(stats)
+        return stats
+
+    def phase(self, name: str):
+        """Returns a context manager measuring the time of the phase."""
+        return _Phase(self, name)
+
+    def acquire(self, name: str, lock):
+        """Returns a context manager holding the lock, the time spent waiting for it is measured as the phase."""
+        return _Acquire(self, name, lock)
+
+    def record(self, name: str, begin: float, end: float):
+        stats = self._stats()
+        entry = stats.phases.get(name)
+        if entry is None:
+            entry = stats.phases[name] = [0.0, 0]
+        entry[0] += end - begin
+        entry[1] += 1
+        if self.trace and len(stats.events) < MAX_TRACE_EVENTS:
+            stats.events.append((name, begin, end))
+
+    def generation(self, count: int = 1):
+        """Counts the finished generations, e.g. all generations of an island reported by a single migration."""
+        self._stats().generations += count
+
+    @property
+    def generations(self) -> int:
+        return sum(stats.generations for stats in self.threads)
+
+    def improvement(self, total_time: int):
+        """Records the total time if it's better than the best one so far."""
+        with self.lock:
+            if self.best is not None and total_time >= self.best:
+                return
+            self.best = total_time
+            self.improvements.append((time.perf_counter() - self.start, self.generations, int(total_time)))
+
+    def summary(self) -> dict:
+        """Returns the profile: the sums of the phases sorted from the longest, the rate of generations and the
+        improvements."""
+        elapsed = time.perf_counter() - self.start
+        phases = {}
+        for stats in list(self.threads):
+            for name, (total, calls) in list(stats.phases.items()):
+                entry = phases.setdefault(name, [0.0, 0])
+                entry[0] += total
+                entry[1] += calls
+        generations = self.generations
+        return {
+            "elapsed": elapsed,
+            "threads": len(self.threads),
+            "generations": generations,
+            "generations_per_second": generations / elapsed if elapsed > 0 else 0.0,
+            "phases": {
+                name: {"time": total, "calls": calls, "mean": total / calls}
+                for name, (total, calls) in sorted(phases.items(), key=lambda item: -item[1][0])
+            },
+            "improvements": [
+                {"elapsed": at, "generations": generation, "total_time": total_time}
+                for at, generation, total_time in self.improvements
+            ],
+        }
+
+    def chrome_trace(self) -> dict:
+        """Returns the profile in the Chrome trace event format, which can be opened in chrome://tracing or Perfetto.
+
+        The phases are complete events of their threads, the best total time is a counter.
+        """
+        pid = os.getpid()
+        events = []
+        for tid, stats in enumerate(list(self.threads)):
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": stats.name}})
+            events.extend(
+                {
+                    "name": name, "ph": "X", "pid": pid, "tid": tid,
+                    "ts": (begin - self.start) * 1e6, "dur": (end - begin) * 1e6
+                }
+                for name, begin, end in list(stats.events)
+            )
+        events.extend(
+            {"name": "total_time", "ph": "C", "pid": pid, "ts": at * 1e6, "args": {"total_time": total_time}}
+            for at, _, total_time in self.improvements
+        )
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"summary": self.summary()}}
+
+    def save(self, filename: str, file_format: str = "json"):
+        """Saves the profile.
+
+        :param filename: name of the file
+        :param file_format: "json" saves py:meth:`summary`, "chrome" saves py:meth:`chrome_trace`
+        """
+        if file_format not in FORMATS:
+            raise ValueError(f"format must be one of {FORMATS}, not ({file_format})")
+        with open(filename, 'w') as target:
+            json.dump(self.chrome_trace() if file_format == "chrome" else self.summary(), target)
+
+    def report(self) -> str:
+        """Returns a table of the phases and the rate of generations."""
+        summary = self.summary()
+        lines = [
+            f"Generations: {summary['generations']} | Rate: {summary['generations_per_second']:.1f}/s"
+            f" | Improvements: {len(summary['improvements'])}"
+        ]
+        for name, phase in summary["phases"].items():
+            lines.append(f"{name:16} | {phase['time']:10.4f} s | {phase['calls']:10} | {phase['mean'] * 1e6:10.2f} us")
+        return "\n".join(lines)
+
+
+class NullProfiler:
+    """Profiler which measures nothing, the algorithms use it when profiling is disabled."""
+    trace = False
+
+    def phase(self, name: str):
+        return _NULL_PHASE
+
+    def acquire(self, name: str, lock):
+        return lock
+
+    def record(self, name: str, begin: float, end: float):
+        pass
+
+    def generation(self, count: int = 1):
+        pass
+
+    def improvement(self, total_time: int):
+        pass
+
+
+_NULL_PHASE = contextlib.nullcontext()
+NULL_PROFILER = NullProfiler()
+
+
+__all__ = ["Profiler", "NullProfiler", "NULL_PROFILER", "FORMATS"]
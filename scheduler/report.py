@@ -0,0 +1,185 @@
+import datetime
+import glob
+import itertools
+import os
+import statistics
+from . import bounds
+from .batch import write_summary
+from .exceptions import FileContentError
+from .problem import InstanceSolution
+
+REPORT_FIELDS = [
+    "instance", "algorithm", "runs", "processors_number", "tasks_number", "lower_bound", "best", "median", "worst",
+    "best_gap", "median_gap", "proven_optimal", "time_to_best_min", "time_to_best_median", "fingerprint"
+]
+# Number of files read by a worker process at once, and number of files read before the results are aggregated
+CHUNK_SIZE = 16
+WINDOW = 1024
+
+
+def parse_duration(value):
+    """Converts a duration saved in the simulation data (HH:MM:SS, MM:SS, time or seconds) to seconds.
+
+    :return: number of seconds or None if the value isn't a duration
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (datetime.datetime, datetime.time)):
+        return value.hour * 3600 + value.minute * 60 + value.second + value.microsecond / 1e6
+    if isinstance(value, str):
+        try:
+            parts = [float(part) for part in value.split(":")]
+        except ValueError:
+            return None
+        if 1 <= len(parts) <= 3:
+            return sum(part * 60 ** power for power, part in enumerate(reversed(parts)))
+    return None
+
+
+def read_run(path: str):
+    """Reads the header of a solution file without parsing the solution, see py:meth:`InstanceSolution.read_header`.
+
+    :param path: path to the solution file
+    :return: dictionary describing the run, or the path and the "error" if the file isn't a valid solution
+    """
+    try:
+        header = InstanceSolution.read_header(path)
+        results, instance = header["results"], header["instance"]
+        extras = header.get("simulation_data") or {}
+        return {
+            "path": path,
+            "fingerprint": instance["fingerprint"],
+            "instance": os.path.splitext(os.path.basename(extras["instance"]))[0] if "instance" in extras else
+            f"m{instance['number_of_processors']}n{instance['number_of_tasks']}",
+            "algorithm": extras.get("algorithm", "unknown"),
+            "processors_number": instance["number_of_processors"],
+            "tasks_number": instance["number_of_tasks"],
+            "total_time": int(results["total_time"]),
+            "lower_bound": int(results["lower_bound"]),
+            "time_to_best": parse_duration(extras.get("best_solution_at")),
+        }
+    except (OSError, ValueError, KeyError, TypeError, FileContentError) as error:
+        return {"path": path, "error": str(error) or type(error).__name__}
+
+
+def scan(directory: str, workers: int = None):
+    """Reads the headers of all of the solution files in the directory and its subdirectories in a process pool.
+
+    The files are read in windows of py:data:`WINDOW` files, so only a bounded number of headers is kept in memory.
+
+    :param directory: directory with the solution files
+    :param workers: number of processes, defaults to the number of CPUs, 1 reads the files in this process
+    :return: generator of the runs, see py:func:`read_run`
+    """
+    paths = iter(sorted(glob.glob(os.path.join(directory, "**", "*.toml"), recursive=True)))
+    if workers == 1:
+        yield from map(read_run, paths)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(workers) as executor:
+        while True:
+            window = list(itertools.islice(paths, WINDOW))
+            if not window:
+                return
+            yield from executor.map(read_run, window, chunksize=CHUNK_SIZE)
+
+
+def summarize(runs) -> list:
+    """Groups the runs by the instance fingerprint and the algorithm and computes the statistics of every group.
+
+    Only the total times and the times to the best solution of the runs are kept.
+
+    :param runs: iterable of valid runs, see py:func:`read_run`
+    :return: report rows, see py:data:`REPORT_FIELDS`, sorted by the instance and the algorithm
+    """
+    groups = {}
+    for run in runs:
+        group = groups.get((run["fingerprint"], run["algorithm"]))
+        if group is None:
+            group = groups[run["fingerprint"], run["algorithm"]] = {
+                key: run[key] for key in ("instance", "algorithm", "processors_number", "tasks_number",
+                                          "lower_bound", "fingerprint")
+            }
+            group["total_times"], group["times_to_best"] = [], []
+        group["total_times"].append(run["total_time"])
+        if run["time_to_best"] is not None:
+            group["times_to_best"].append(run["time_to_best"])
+
+    rows = []
+    for group in groups.values():
+        total_times, times_to_best = group.pop("total_times"), group.pop("times_to_best")
+        bound = group["lower_bound"]
+        best, median = min(total_times), statistics.median(total_times)
+        rows.append({
+            **group,
+            "runs": len(total_times),
+            "best": best,
+            "median": median,
+            "worst": max(total_times),
+            "best_gap": (best - bound) / bound if bound > 0 else 0.0,
+            "median_gap": (median - bound) / bound if bound > 0 else 0.0,
+            "proven_optimal": bounds.is_optimal(best, bound),
+            "time_to_best_min": min(times_to_best, default=None),
+            "time_to_best_median": statistics.median(times_to_best) if times_to_best else None,
+            "total_times": total_times,
+        })
+    rows.sort(key=lambda row: (row["instance"], row["fingerprint"], row["algorithm"]))
+    return rows
+
+
+def plot(rows: list, directory: str, extension: str = "png"):
+    """Saves a chart of the total times of the algorithms for every instance, without any GUI backend.
+
+    :param rows: report rows returned by py:func:`summarize`
+    :param directory: directory for the images, one per instance
+    :param extension: format of the images, e.g. png or svg
+    :return: paths to the images
+    """
+    from matplotlib.figure import Figure
+
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for _, group in itertools.groupby(rows, key=lambda row: (row["instance"], row["fingerprint"])):
+        group = list(group)
+        figure = Figure(figsize=(max(4, 1.5 * len(group)), 4))
+        ax = figure.subplots()
+        ax.boxplot([row["total_times"] for row in group])
+        ax.set_xticks(range(1, len(group) + 1), [row["algorithm"] for row in group])
+        ax.axhline(group[0]["lower_bound"], color="gray", linestyle="--", label="lower bound")
+        ax.set_title(group[0]["instance"])
+        ax.set_ylabel("total time")
+        ax.legend()
+        path = os.path.join(directory, f"{group[0]['instance']}-{group[0]['fingerprint'][:8]}.{extension}")
+        figure.savefig(path)
+        paths.append(path)
+    return paths
+
+
+def report(directory: str, target: str = None, plots: str = None, workers: int = None) -> (list, list):
+    """Summarizes the solution files in the directory, the files which aren't valid solutions are skipped.
+
+    :param directory: directory with the solution files
+    :param target: optional path to the csv/json report
+    :param plots: optional directory for the charts of the instances
+    :param workers: number of processes reading the files
+    :return: report rows and the skipped files, (path, error) pairs
+    """
+    skipped = []
+
+    def valid(runs):
+        for run in runs:
+            if "error" in run:
+                skipped.append((run["path"], run["error"]))
+            else:
+                yield run
+
+    rows = summarize(valid(scan(directory, workers)))
+    if target is not None:
+        write_summary([{field: row[field] for field in REPORT_FIELDS} for row in rows], target, REPORT_FIELDS)
+    if plots is not None:
+        plot(rows, plots)
+    return rows, skipped
+
+
+__all__ = ["report", "scan", "summarize", "plot", "read_run", "parse_duration", "REPORT_FIELDS"]
@@ -1,8 +1,13 @@
 import click
-import matplotlib.pyplot as pyplot
 import scheduler
 
 
+IMAGE_OPTION = click.option(
+    "-o", "target", default=None, help="Save the plot in an image (png, svg, ...) instead of showing it.",
+    type=click.Path(dir_okay=False, writable=True)
+)
+
+
 @click.group()
 def analyze():
     """Analyzes the results of the scheduler module"""
@@ -12,7 +17,8 @@ def analyze():
 @click.option(
     "-i", "source", prompt=True, help="Path to the solution file.", type=click.Path(exists=True)
 )
-def display(source: str):
+@IMAGE_OPTION
+def display(source: str, target: str):
     """Displays the simulation data and plots the result."""
     solution, extras = scheduler.InstanceSolution.load_toml(source)
     print(f"Solution of instance - m{solution.instance.processors_number}n{len(solution.instance.tasks_durations)}")
@@ -21,6 +27,11 @@ def display(source: str):
     print(f"{name:{width}}", solution.total_time)
     for key in extras:
         print(f"{key:{width}}", extras[key])
+    if target is not None:
+        solution.save_plot(target, title=extras.get("algorithm", "unknown"))
+        return
+    import matplotlib.pyplot as pyplot
+
     _, ax = pyplot.subplots()
     solution.plot(ax=ax)
     ax.set_title(extras.get("algorithm", "unknown"))
@@ -34,7 +45,8 @@ def display(source: str):
 @click.option(
     "-i2", "source_2", prompt=True, help="Path to the second solution file.", type=click.Path(exists=True)
 )
-def compare(source_1: str, source_2: str):
+@IMAGE_OPTION
+def compare(source_1: str, source_2: str, target: str):
     """Compares two solutions"""
     solution_1, extras_1 = scheduler.InstanceSolution.load_toml(source_1)
     solution_2, extras_2 = scheduler.InstanceSolution.load_toml(source_2)
@@ -59,9 +71,44 @@ def compare(source_1: str, source_2: str):
     for key in extras_2:
         if key not in common:
             print(f"{key:{width_1}}", f"{name_2:-^{width_2}}", f"{extras_2[key]:<{width_2}}")
+    if target is not None:
+        scheduler.gantt.save(
+            [solution_1, solution_2], target,
+            [extras_1.get("algorithm", "unknown"), extras_2.get("algorithm", "unknown")]
+        )
+        return
+    import matplotlib.pyplot as pyplot
+
     _, (ax_1, ax_2) = pyplot.subplots(1, 2)
     solution_1.plot(ax=ax_1)
     solution_2.plot(ax=ax_2)
     ax_1.set_title(extras_1.get("algorithm", "unknown"))
     ax_2.set_title(extras_2.get("algorithm", "unknown"))
     pyplot.show()
+
+
+@analyze.command()
+@click.option(
+    "-i", "directory", prompt=True, help="Directory with the solution files.",
+    type=click.Path(exists=True, file_okay=False)
+)
+@click.option(
+    "-o", "target", default="report.csv", help="Path to the csv/json report.", type=click.Path(dir_okay=False)
+)
+@click.option(
+    "--plots", "plots", default=None, help="Directory for the charts of the instances.",
+    type=click.Path(file_okay=False)
+)
+@click.option("-n", "workers", default=None, help="Number of worker processes.", type=click.IntRange(min=1))
+def report(directory: str, target: str, plots: str, workers: int):
+    """Summarizes all of the solutions in a directory, grouped by the instance and the algorithm."""
+    rows, skipped = scheduler.report.report(directory, target, plots, workers)
+    width = max([len(row["instance"]) for row in rows], default=0)
+    for row in rows:
+        print(
+            f"{row['instance']:{width}}", f"{row['algorithm']:22}", f"runs {row['runs']:4}",
+            f"best {row['best']:8}", f"median {row['median']:10}", f"gap {row['best_gap']:.4f}", sep=" | "
+        )
+    for path, error in skipped:
+        print(f"skipped {path}: {error}")
+    print(f"{len(rows)} groups written to {target}, {len(skipped)} files skipped")
@@ -1,12 +1,10 @@
 import os.path
 import time
 import datetime
-import itertools
 import re
-import math
 import click
+import functools
 import scheduler
-from threading import Event, Timer
 
 
 def get_file_name(name, extension):
@@ -19,6 +17,147 @@ def get_file_name(name, extension):
     return f"{name}-{i}.{extension}"
 
 
+def get_improvement(mode, bound=None):
+    if mode == "none":
+        return None
+    return functools.partial(scheduler.local_search.improve, mode=mode, lower_bound=bound)
+
+
+# Constructive algorithms which can start the genetic algorithms, their modules are imported when they're used
+SEEDERS = ["greedy", "lpt", "multifit", "karmarkar_karp", "dynamic_programming", "local_search"]
+
+
+def get_constructive(name):
+    return getattr(scheduler, name).solve
+
+
+def seeder_option(default):
+    return click.option(
+        "--seeder", "seeder", default=None,
+        help=f"Algorithm computing the initial solution, the best cached solution or {default} by default.",
+        type=click.Choice(["none", *SEEDERS] if default == "none" else SEEDERS)
+    )
+
+
+CACHE_OPTION = click.option(
+    "--cache", "cache_directory", default=None, envvar=scheduler.cache.DIRECTORY_VARIABLE,
+    help="Directory of the persistent results cache.", type=click.Path(file_okay=False)
+)
+
+
+def get_cache(directory):
+    return None if directory is None else scheduler.cache.ResultsCache(directory)
+
+
+def get_seeder(name, default, cache, instance):
+    """Returns the name and the seeder of a genetic algorithm.
+
+    Unless the seeder was chosen, the best cached solution of the instance is used as a warm start and its name is
+    "cache", the default seeder is used when there is no cached solution.
+    """
+    if name is None:
+        incumbent = None if cache is None else cache.incumbent(instance)
+        if incumbent is not None:
+            return "cache", lambda _: incumbent
+        name = default
+    return name, get_constructive(name) if name in SEEDERS else None
+
+
+LOCAL_SEARCH_OPTION = click.option(
+    "--local-search", "local_search_mode", default="none", help="Improve the best specimen of every generation.",
+    type=click.Choice(["none", "first", "best"])
+)
+
+
+PERIOD_OPTION = click.option(
+    "-t", "period", default=None, help="Processing time fmt = HH:MM:SS/MM:SS/SS",
+    type=click.DateTime(["%H:%M:%S", "%M:%S", "%S"])
+)
+GENERATIONS_OPTION = click.option(
+    "-g", "generations", default=None, help="Maximal number of generations.", type=click.IntRange(min=1)
+)
+TARGET_OPTION = click.option(
+    "--target", "target_total_time", default=None, help="Stop as soon as a solution this good is found.", type=int
+)
+
+
+SEED_FROM_OPTION = click.option(
+    "--seed-from", "seed_from", multiple=True,
+    help="Solution toml or population checkpoint added to the initial population.",
+    type=click.Path(exists=True, dir_okay=False)
+)
+RESUME_OPTION = click.option(
+    "--resume", "resume", default=None, help="Population checkpoint the run continues from, it's also updated.",
+    type=click.Path(exists=True, dir_okay=False)
+)
+CHECKPOINT_OPTION = click.option(
+    "--checkpoint", "checkpoint_file", default=None, help="File the population is periodically saved to (npz).",
+    type=click.Path(dir_okay=False, writable=True)
+)
+CHECKPOINT_PERIOD_OPTION = click.option(
+    "--checkpoint-period", "checkpoint_period", default=lambda: scheduler.checkpoint.CHECKPOINT_PERIOD,
+    help="Minimal number of seconds between two checkpoints.", type=click.FloatRange(min=0)
+)
+
+
+def get_checkpointing(instance, seed_from, resume, checkpoint_file, checkpoint_period):
+    """Returns the initial population loaded from the files, the generation the run continues from and the
+    checkpoint of the population of the run."""
+    filenames = ([] if resume is None else [resume]) + list(seed_from)
+    try:
+        initial, generation = scheduler.checkpoint.load_seeds(filenames, instance) if filenames else (None, 0)
+    except scheduler.FileContentError as error:
+        raise click.BadParameter(str(error))
+    if checkpoint_file is None:
+        checkpoint_file = resume
+    if checkpoint_file is None:
+        return initial, generation, None
+    return initial, generation, scheduler.checkpoint.Checkpoint(checkpoint_file, instance, checkpoint_period)
+
+
+PROFILE_OPTION = click.option(
+    "--profile", "profile_file", default=None, help="File the profile of the phases of the generations is saved to.",
+    type=click.Path(dir_okay=False, writable=True)
+)
+PROFILE_FORMAT_OPTION = click.option(
+    "--profile-format", "profile_format", default="json", help="Summary (json) or Chrome trace (chrome) profile.",
+    type=click.Choice(["json", "chrome"])
+)
+
+
+def get_profiler(profile_file, profile_format):
+    if profile_file is None:
+        return None
+    return scheduler.profiling.Profiler(trace=profile_format == "chrome")
+
+
+def save_profile(profiler, profile_file, profile_format):
+    if profiler is None:
+        return
+    profiler.save(profile_file, profile_format)
+    print(profiler.report())
+
+
+def get_seconds(period):
+    if period is None:
+        return None
+    return period.hour * 3600 + period.minute * 60 + period.second
+
+
+def show_progress(progress):
+    if progress.best is None:
+        return
+    print(
+        f"Time elapsed: {parse_time(progress.elapsed)}",
+        f"Generations created: {progress.iterations}",
+        f"Rate: {progress.rate:8.1f}/s",
+        f"Best solution: {progress.total_time}",
+        sep=" | ",
+        end="\r",
+        flush=True
+    )
+
+
 def parse_time(seconds):
     hours = min(seconds // 3600, 24)
     seconds %= 3600
@@ -42,64 +181,74 @@ def solve():
 @click.option("-p", "population_size", prompt=True, help="Size of the population.", type=int)
 @click.option("-b", "best_specimens_group_size", prompt=True, help="Size of the best specimens group.", type=int)
 @click.option(
-    "-t", "period", default=None, help="Processing time fmt = HH:MM:SS/MM:SS/SS",
-    type=click.DateTime(["%H:%M:%S", "%M:%S", "%S"])
+    "--engine", "engine", default="python", help="Population engine, numpy keeps the whole population in one array.",
+    type=click.Choice(["python", "numpy"])
 )
-def jakub_genetic(source: str, target: str, population_size: int, best_specimens_group_size: int, period: datetime.datetime):
-    """Solves the instance read from input and writes the result to the output after KeyboardInterrupt."""
+@LOCAL_SEARCH_OPTION
+@seeder_option("none")
+@PERIOD_OPTION
+@GENERATIONS_OPTION
+@TARGET_OPTION
+@CACHE_OPTION
+@SEED_FROM_OPTION
+@RESUME_OPTION
+@CHECKPOINT_OPTION
+@CHECKPOINT_PERIOD_OPTION
+@PROFILE_OPTION
+@PROFILE_FORMAT_OPTION
+def jakub_genetic(source: str, target: str, population_size: int, best_specimens_group_size: int, engine: str, local_search_mode: str, seeder: str, period: datetime.datetime, generations: int, target_total_time: int, cache_directory: str, seed_from: tuple, resume: str, checkpoint_file: str, checkpoint_period: float, profile_file: str, profile_format: str):
+    """Solves the instance read from input and writes the result to the output when the budget runs out or after KeyboardInterrupt."""
     if best_specimens_group_size > population_size:
         raise ValueError("best_specimens_group_size can't be higher than the population_size")
+    instance = scheduler.Instance.load(source)
+    default = f"jakub_genetic-m{instance.processors_number}n{len(instance.tasks_durations)}"
+    if target is None:
+        target = default
+    elif os.path.isdir(target):
+        target = os.path.join(target, default)
+    bound = scheduler.bounds.lower_bound(instance.tasks_durations, instance.processors_number)
+    cache = get_cache(cache_directory)
+    seeder, seeder_function = get_seeder(seeder, "none", cache, instance)
+    parameters = {
+        "population_size": population_size,
+        "best_specimens_group_size": best_specimens_group_size,
+        "engine": engine,
+        "local_search": local_search_mode,
+        "seeder": seeder
+    }
+    initial, generation, checkpoint = get_checkpointing(instance, seed_from, resume, checkpoint_file, checkpoint_period)
+    profiler = get_profiler(profile_file, profile_format)
+    if engine == "numpy":
+        generator = scheduler.jakub_genetic.population_generator(
+            instance, population_size, best_specimens_group_size, improve=get_improvement(local_search_mode, bound),
+            seeder=seeder_function, initial=initial, checkpoint=checkpoint, profiler=profiler,
+            generation=generation
+        )
     else:
-        new = datetime.datetime.now()
-        if period is not None:
-            period = new + datetime.timedelta(hours=period.hour, minutes=period.minute, seconds=period.second)
-            period = period.timestamp()
-        else:
-            period = 0
-        extras = {
-            "algorithm": "jakub_genetic",
-            "time_period": "",
-            "best_solution_at": "00:00:00",
-            "population_size": population_size,
-            "best_specimens_group_size": best_specimens_group_size
-        }
-        instance = scheduler.Instance.load_txt(source)
-        default = f"jakub_genetic-m{instance.processors_number}n{len(instance.tasks_durations)}"
-        if target is None:
-            target = default
-        elif os.path.isdir(target):
-            target = os.path.join(target, default)
-        generator = scheduler.jakub_genetic.solution_generator(instance, population_size, best_specimens_group_size)
-        best_solution = next(generator)
-        total_times = [best_solution.total_time for _ in range(100)]
-        start = time.time()
-        average = 0
-        average_width = 0
-        solution_width = math.ceil(math.log10(best_solution.total_time))
-        try:
-            for generation, solution in zip(itertools.count(1, 1), generator):
-                if solution.total_time < best_solution.total_time:
-                    best_solution = solution
-                    extras.update({"best_solution_at": parse_time(time.time() - start)})
-                if period != 0 and time.time() >= period:
-                    raise KeyboardInterrupt()
-                total_times[(generation - 1)%100] = solution.total_time
-                average = sum(total_times)/len(total_times)
-                average_width = max(average_width, math.ceil(math.log10(average)))
-                solution_width = max(solution_width, math.ceil(math.log10(best_solution.total_time)))
-                print(
-                    f"Time elapsed: {parse_time(time.time() - start)}",
-                    f"Generations created: {generation}",
-                    f"Average solution: {average:{average_width}.0f}",
-                    f"Best solution: {best_solution.total_time:{solution_width}}",
-                    sep=" | ",
-                    end="\r",
-                    flush=True
-                )
-        except KeyboardInterrupt as error:
-            extras.update({"time_period": parse_time(time.time() - start)})
-            best_solution.save_toml(get_file_name(target, "toml"), extras=extras)
-            raise KeyboardInterrupt(error)
+        generator = scheduler.jakub_genetic.solution_generator(
+            instance, population_size, best_specimens_group_size, improve=get_improvement(local_search_mode, bound),
+            seeder=seeder_function, initial=initial, checkpoint=checkpoint, profiler=profiler,
+            generation=generation
+        )
+    result = scheduler.anytime.run(
+        generator, time_limit=get_seconds(period), iterations=generations, target=target_total_time,
+        lower_bound=bound, progress=show_progress
+    )
+    print()
+    save_profile(profiler, profile_file, profile_format)
+    if result.best is None:
+        raise click.Abort()
+    solution = result.best.to_instance_solution()
+    solution.save_toml(get_file_name(target, "toml"), extras={
+        "algorithm": "jakub_genetic",
+        "time_period": parse_time(result.elapsed),
+        "best_solution_at": parse_time(result.improved_at),
+        "generations": result.iterations,
+        "stop_reason": result.status,
+        **parameters
+    })
+    if cache is not None:
+        cache.put(instance, "jakub_genetic", parameters, solution)
 
 
 @solve.command()
@@ -110,51 +259,138 @@ def jakub_genetic(source: str, target: str, population_size: int, best_specimens
     "-o", "target", help="output", default=None, type=click.Path(writable=True)
 )
 @click.option("-n", "threads", prompt=True, help="Number of threads", type=int)
-@click.option("-p", "thread_population_size", prompt=True, help="Size of the population of each thread.", type=int)
-@click.option("-b", "best_specimens_per_thread", prompt=True, help="Size of the best specimens group per thread.", type=int)
 @click.option(
-    "-t", "period", default=None, help="Processing time fmt = HH:MM:SS/MM:SS/SS",
-    type=click.DateTime(["%H:%M:%S", "%M:%S", "%S"])
+    "--backend", "backend", default="threads", help="Run the workers as threads or as processes (island model).",
+    type=click.Choice(["threads", "processes"])
 )
-def eryk_genetic(source: str, target: str, threads: int, thread_population_size: int, best_specimens_per_thread: int, period: datetime.datetime):
-    """Solves the instance read from input and writes the result to the output after KeyboardInterrupt."""
-
-    extras = {
-        "algorithm": "eryk_heuristic",
+@LOCAL_SEARCH_OPTION
+@click.option("-p", "thread_population_size", prompt=True, help="Size of the population of each thread.", type=int)
+@click.option("-b", "best_specimens_per_thread", prompt=True, help="Size of the best specimens group per thread.", type=int)
+@seeder_option("greedy")
+@PERIOD_OPTION
+@GENERATIONS_OPTION
+@TARGET_OPTION
+@CACHE_OPTION
+@SEED_FROM_OPTION
+@RESUME_OPTION
+@CHECKPOINT_OPTION
+@CHECKPOINT_PERIOD_OPTION
+@PROFILE_OPTION
+@PROFILE_FORMAT_OPTION
+def eryk_genetic(source: str, target: str, threads: int, backend: str, local_search_mode: str, thread_population_size: int, best_specimens_per_thread: int, seeder: str, period: datetime.datetime, generations: int, target_total_time: int, cache_directory: str, seed_from: tuple, resume: str, checkpoint_file: str, checkpoint_period: float, profile_file: str, profile_format: str):
+    """Solves the instance read from input and writes the result to the output when the budget runs out or after KeyboardInterrupt."""
+    instance = scheduler.Instance.load(source)
+    default = f"eryk_genetic-m{instance.processors_number}n{len(instance.tasks_durations)}"
+    if target is None:
+        target = default
+    elif os.path.isdir(target):
+        target = os.path.join(target, default)
+    bound = scheduler.bounds.lower_bound(instance.tasks_durations, instance.processors_number)
+    cache = get_cache(cache_directory)
+    seeder, seeder_function = get_seeder(seeder, "greedy", cache, instance)
+    parameters = {
         'threads_number': threads,
+        'backend': backend,
+        'local_search': local_search_mode,
         'thread_population_size': thread_population_size,
-        'best_specimens_per_thread': best_specimens_per_thread
+        'best_specimens_per_thread': best_specimens_per_thread,
+        'seeder': seeder
     }
+    initial, generation, checkpoint = get_checkpointing(instance, seed_from, resume, checkpoint_file, checkpoint_period)
+    profiler = get_profiler(profile_file, profile_format)
 
-    stop_event = Event()
-    start_time = time.time()
-    if period is not None:
-        Timer(period.hour * 3600 + period.minute * 60 + period.second, lambda: stop_event.set()).start()
+    generator = scheduler.eryk_heuristic.solution_generator(
+        instance, threads, thread_population_size, best_specimens_per_thread,
+        improve=get_improvement(local_search_mode, bound), backend=backend,
+        seeder=seeder_function, initial=initial, checkpoint=checkpoint, profiler=profiler, generation=generation
+    )
+    result = scheduler.anytime.run(
+        generator, time_limit=get_seconds(period), iterations=generations, target=target_total_time,
+        lower_bound=bound, progress=show_progress
+    )
+    print()
+    save_profile(profiler, profile_file, profile_format)
+    if result.best is None:
+        raise click.Abort()
+    result.best.save_toml(get_file_name(target, "toml"), {
+        "algorithm": "eryk_heuristic",
+        **parameters,
+        'time_period': parse_time(result.elapsed),
+        'best_solution_at': parse_time(result.improved_at),
+        'generations': result.iterations,
+        'stop_reason': result.status
+    })
+    if cache is not None:
+        cache.put(instance, "eryk_heuristic", parameters, result.best)
 
-    instance = scheduler.Instance.load_txt(source)
-    default = f"eryk_genetic-m{instance.processors_number}n{len(instance.tasks_durations)}"
+
+@solve.command()
+@click.option(
+    "-i", "source", prompt=True, help="Path to the instance file.", type=click.Path(exists=True)
+)
+@click.option(
+    "-o", "target", help="output", default=None, type=click.Path(writable=True)
+)
+@click.option(
+    "-a", "algorithm", default="multifit", help="Constructive algorithm.", type=click.Choice(SEEDERS)
+)
+@CACHE_OPTION
+def heuristic(source: str, target: str, algorithm: str, cache_directory: str):
+    """Solves the instance read from input with a constructive algorithm and writes the result to the output."""
+    instance = scheduler.Instance.load(source)
+    default = f"{algorithm}-m{instance.processors_number}n{len(instance.tasks_durations)}"
     if target is None:
         target = default
     elif os.path.isdir(target):
         target = os.path.join(target, default)
+    cache = get_cache(cache_directory)
+    start = time.perf_counter()
+    solution = None if cache is None else cache.get(instance, algorithm)
+    cached = solution is not None
+    if not cached:
+        solution = get_constructive(algorithm)(instance)
+    elapsed = time.perf_counter() - start
+    if cache is not None and not cached:
+        cache.put(instance, algorithm, None, solution)
+    print(f"Best solution: {solution.total_time}")
+    solution.save_toml(
+        get_file_name(target, "toml"), {"algorithm": algorithm, "wall_time": elapsed, "cached": cached}
+    )
 
-    def update_interface(queue):
-        current_best = queue.best()
-        print(
-            f"Elapsed time: {parse_time(time.time() - start_time)}",
-            f"Best solution: {current_best.total_time:8}",
-            sep=" | ",
-            end="\r",
-            flush=True
-        )
-       
-    try:
-        results_queue = scheduler.eryk_heuristic.SolutionsQueue(4)
-        scheduler.eryk_heuristic.solve(instance, results_queue, stop_event, update_interface, threads, thread_population_size, best_specimens_per_thread)
-        results_queue.pop().save_toml(get_file_name(target, "toml"), { **extras, 'time_period': period })
-    except KeyboardInterrupt as error:
-        stop_event.set()
-        end_time = time.time()
-
-        results_queue.pop().save_toml(get_file_name(target, "toml"), { **extras, 'time_period': parse_time(end_time - start_time) })
-        raise error
+
+@solve.command()
+@click.option(
+    "-i", "pattern", prompt=True, help="Directory with the instance files or a glob pattern.", type=str
+)
+@click.option(
+    "-o", "target", prompt=True, help="Directory for the solution files.", type=click.Path(file_okay=False, writable=True)
+)
+@click.option(
+    "-a", "algorithms", multiple=True, required=True, help="Algorithm to run, can be given multiple times.",
+    type=click.Choice(list(scheduler.batch.ALGORITHMS))
+)
+@click.option("-n", "workers", default=None, help="Number of worker processes.", type=int)
+@click.option(
+    "-t", "period", default=None, help="Time limit of a single job fmt = HH:MM:SS/MM:SS/SS",
+    type=click.DateTime(["%H:%M:%S", "%M:%S", "%S"])
+)
+@click.option(
+    "-s", "summary", default=None, help="Summary file, json if the name ends with .json, csv otherwise.",
+    type=click.Path(dir_okay=False, writable=True)
+)
+@CACHE_OPTION
+def batch(pattern: str, target: str, algorithms: tuple, workers: int, period: datetime.datetime, summary: str, cache_directory: str):
+    """Solves every instance with every algorithm in a process pool and writes a summary."""
+    sources = scheduler.batch.find_instances(pattern)
+    if len(sources) == 0:
+        raise click.BadParameter(f"no instance files match ({pattern})", param_hint="-i")
+    time_limit = get_seconds(period)
+    if summary is None:
+        summary = os.path.join(target, "summary.csv")
+
+    def job_finished(row):
+        print(row["algorithm"], row["instance"], row["status"], row["total_time"], sep=" | ", flush=True)
+
+    scheduler.batch.run_batch(
+        sources, list(algorithms), target, time_limit, workers, summary, job_finished, cache_directory
+    )
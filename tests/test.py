@@ -1,12 +1,112 @@
 import unittest
+import itertools
+import json
+import multiprocessing
 import random
+import queue
+import os
+import subprocess
+import sys
+import tempfile
+import numpy
 from scheduler import (
+    anytime,
+    batch,
+    bounds,
+    cache,
+    checkpoint,
+    branch_and_bound,
     brute_force_iterative,
     brute_force_recursive,
+    dynamic_programming,
     greedy,
+    eryk_heuristic,
+    gantt,
+    jakub_genetic,
+    karmarkar_karp,
+    local_search,
+    lpt,
+    report,
+    multifit,
+    profiling,
     generate,
+    generate_vectorized,
+    generate_batch,
     Instance,
+    InstanceSolution,
+    convert_txt_to_bin,
+    convert_bin_to_txt,
+    CompactSolution,
+    SolutionsQueue,
 )
+from scheduler.exceptions import FileContentError, StateLimitError
+
+
+class TestInstanceFiles(unittest.TestCase):
+    def test_round_trip(self):
+        instance = Instance(3, [1, 5, 2, 5, 6, 8, 1, 2])
+        with tempfile.TemporaryDirectory() as directory:
+            txt = os.path.join(directory, "instance.txt")
+            binary = os.path.join(directory, "instance.bin")
+            instance.save_txt(txt)
+            convert_txt_to_bin(txt, binary)
+            convert_bin_to_txt(binary, txt)
+
+            self.assertEqual(Instance.load(binary), instance)
+            self.assertEqual(Instance.load(txt), instance)
+            self.assertEqual(Instance.load_txt(txt).tasks_durations, instance.tasks_durations)
+
+    def test_solution_round_trip(self):
+        instance = Instance(3, [1, 5, 2, 5, 6, 8, 1, 2])
+        solution = lpt.solve(instance)
+        with tempfile.TemporaryDirectory() as directory:
+            compact = os.path.join(directory, "compact.toml")
+            old = os.path.join(directory, "old.toml")
+            solution.save_toml(compact, extras={"algorithm": "lpt"})
+            solution.save_toml(old, extras={"algorithm": "lpt"}, compact=False)
+            for filename in (compact, old):
+                loaded, extras = InstanceSolution.load_toml(filename)
+                self.assertEqual(loaded.instance, instance)
+                self.assertEqual(loaded.total_time, solution.total_time)
+                self.assertEqual(sorted(map(sorted, loaded.processors)), sorted(map(sorted, solution.processors)))
+                self.assertEqual(extras, {"algorithm": "lpt"})
+                header = InstanceSolution.read_header(filename)
+                self.assertEqual(header["results"]["total_time"], solution.total_time)
+                self.assertNotIn("tasks_durations", header["instance"])
+
+    def test_corrupted_solution(self):
+        instance = Instance(3, [1, 5, 2, 5, 6, 8, 1, 2])
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "solution.toml")
+            lpt.solve(instance).save_toml(filename)
+            with open(filename) as source:
+                content = source.read()
+            for corrupted in ("assignment = [3, ", "assignment = [x, "):
+                with open(filename, "w") as target:
+                    target.write(content.replace("assignment = [", corrupted))
+                with self.assertRaises(FileContentError):
+                    InstanceSolution.load_toml(filename)
+
+            solution = lpt.solve(instance)
+            solution.processors[0].append(solution.processors[1][0])
+            solution.save_toml(filename, compact=False)
+            with self.assertRaises(FileContentError):
+                InstanceSolution.load_toml(filename)
+
+
+class TestInstanceSolution(unittest.TestCase):
+    def test_cached_loads(self):
+        solution = InstanceSolution(Instance(2, [4, 1, 1, 3, 2]), [[0, 1, 2], [3, 4]])
+        self.assertEqual(solution.loads, [6, 5])
+        self.assertEqual(solution.total_time, 6)
+
+        # The loads are cached, so modifying the processors in place doesn't change them until invalidate()
+        solution.processors[1].append(solution.processors[0].pop(0))
+        self.assertEqual(solution.loads, [6, 5])
+        self.assertEqual(solution.total_time, 6)
+        solution.invalidate()
+        self.assertEqual(solution.loads, [2, 9])
+        self.assertEqual(solution.total_time, 9)
 
 
 class TestBruteForceIterative(unittest.TestCase):
@@ -17,6 +117,39 @@ class TestBruteForceIterative(unittest.TestCase):
         self.assertEqual(solution.total_time, 10)
 
 
+    def test_scored_generator(self):
+        tasks_durations = [1, 5, 2, 5, 6, 8, 3]
+        for processors_number in (1, 2, 3):
+            scored = [
+                (total_time, tuple(assignment))
+                for total_time, assignment in brute_force_iterative.brute_scored_generator(
+                    tasks_durations, processors_number
+                )
+            ]
+            # Every partition into processors_number nonempty processors, numbered in the order of their first task
+            expected = {
+                assignment for assignment in itertools.product(range(processors_number), repeat=len(tasks_durations))
+                if list(dict.fromkeys(assignment)) == list(range(processors_number))
+            }
+            self.assertEqual(len(scored), len(expected))
+            self.assertEqual({assignment for _, assignment in scored}, expected)
+            for total_time, assignment in scored:
+                loads = [0] * processors_number
+                for task_index, processor in enumerate(assignment):
+                    loads[processor] += tasks_durations[task_index]
+                self.assertEqual(total_time, max(loads))
+
+            # Both generators walk through the assignments in the same order
+            self.assertEqual(
+                list(brute_force_iterative.brute_generator(len(tasks_durations), processors_number)),
+                [
+                    [[task_index for task_index, assigned in enumerate(assignment) if assigned == processor]
+                     for processor in range(processors_number)]
+                    for _, assignment in scored
+                ]
+            )
+
+
 class TestBruteForceRecursive(unittest.TestCase):
     def test_example(self):
         instance = Instance(3, [1, 5, 2, 5, 6, 8, 1, 2])
@@ -25,6 +158,95 @@ class TestBruteForceRecursive(unittest.TestCase):
         self.assertEqual(solution.total_time, 10)
 
 
+class TestBranchAndBound(unittest.TestCase):
+    def test_example(self):
+        instance = Instance(3, [1, 5, 2, 5, 6, 8, 1, 2])
+        solution = branch_and_bound.solve(instance)
+
+        self.assertEqual(solution.total_time, 10)
+
+    def test_matches_brute_force(self):
+        random.seed(112997)
+        for _ in range(20):
+            instance = Instance(random.randint(1, 4), [random.randint(1, 20) for _ in range(8)])
+
+            self.assertEqual(
+                branch_and_bound.solve(instance).total_time, brute_force_recursive.solve(instance).total_time
+            )
+
+    def test_deep(self):
+        # LPT misses the optimum, so the search goes as deep as the number of tasks
+        instance = Instance(2, [3, 3, 2, 2, 2] + [1000] * 2996)
+        self.assertEqual(branch_and_bound.solve(instance).total_time, 1498006)
+
+    def test_parallel(self):
+        random.seed(112997)
+        instance = Instance(4, [random.randint(10, 99) for _ in range(16)])
+        solution = branch_and_bound.solve_parallel(instance, workers=2)
+
+        self.assertEqual(solution.total_time, branch_and_bound.solve(instance).total_time)
+
+
+class TestBounds(unittest.TestCase):
+    def test_lower_bound(self):
+        self.assertEqual(bounds.lower_bound([1, 5, 2, 5, 6, 8, 1, 2], 3), 10)
+        self.assertEqual(bounds.lower_bound([10, 1, 1], 3), 10)
+        self.assertEqual(bounds.lower_bound([3, 3, 3, 3, 3], 2), 9)
+        self.assertEqual(bounds.lower_bound([], 3), 0)
+
+    def test_valid(self):
+        generator = random.Random(112997)
+        for _ in range(100):
+            tasks_durations = [generator.randint(1, 20) for _ in range(generator.randint(1, 8))]
+            instance = Instance(generator.randint(1, 4), tasks_durations)
+            bound = bounds.lower_bound(instance.tasks_durations, instance.processors_number)
+            self.assertLessEqual(bound, branch_and_bound.solve(instance).total_time)
+
+    def test_proven_optimal(self):
+        instance = Instance(3, [1, 5, 2, 5, 6, 8, 1, 2])
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "solution.toml")
+            local_search.solve(instance).save_toml(filename)
+            solution, _ = InstanceSolution.load_toml(filename)
+            with open(filename) as source:
+                content = source.read()
+        self.assertEqual(solution.total_time, 10)
+        self.assertIn("proven_optimal = true", content)
+
+
+class TestDynamicProgramming(unittest.TestCase):
+    def test_example(self):
+        instance = Instance(3, [1, 5, 2, 5, 6, 8, 1, 2])
+        self.assertEqual(dynamic_programming.solve_three(instance).total_time, 10)
+        self.assertEqual(dynamic_programming.solve_two(Instance(2, [8, 7, 6, 5, 4])).total_time, 15)
+
+    def test_matches_branch_and_bound(self):
+        generator = random.Random(112997)
+        for _ in range(50):
+            tasks_durations = [generator.randint(1, 40) for _ in range(generator.randint(1, 9))]
+            for processors_number in (2, 3):
+                instance = Instance(processors_number, tasks_durations)
+                solution = dynamic_programming.solve(instance)
+                self.assertEqual(solution.total_time, branch_and_bound.solve(instance).total_time)
+                self.assertEqual(sorted(task for processor in solution.processors for task in processor),
+                                 list(range(len(tasks_durations))))
+
+    def test_ptas(self):
+        generator = random.Random(112997)
+        for _ in range(30):
+            instance = Instance(generator.randint(2, 5), [generator.randint(1, 40) for _ in range(9)])
+            optimum = branch_and_bound.solve(instance).total_time
+            for epsilon in (0.5, 0.2):
+                self.assertLessEqual(dynamic_programming.ptas(instance, epsilon).total_time, (1 + epsilon) * optimum)
+
+    def test_limits(self):
+        instance = Instance(3, [1, 5, 2, 5, 6, 8, 1, 2])
+        with self.assertRaises(StateLimitError):
+            dynamic_programming.solve_two(Instance(2, [1000, 999, 998]), memory_limit=1000)
+        solution = dynamic_programming.solve(instance, memory_limit=0, state_limit=0)
+        self.assertEqual(sorted(task for processor in solution.processors for task in processor), list(range(8)))
+
+
 class TestGreedy(unittest.TestCase):
     def test_example(self):
         instance = Instance(3, [1, 5, 2, 5, 6, 8, 1, 2])
@@ -33,6 +255,425 @@ class TestGreedy(unittest.TestCase):
         self.assertEqual(solution.total_time, 13)
 
 
+class TestLpt(unittest.TestCase):
+    def test_example(self):
+        instance = Instance(3, [1, 5, 2, 5, 6, 8, 1, 2])
+        solution = lpt.solve(instance)
+
+        self.assertEqual(solution.total_time, 10)
+        self.assertIs(solution.instance, instance)
+
+
+class TestMultifit(unittest.TestCase):
+    def test_example(self):
+        instance = Instance(3, [1, 5, 2, 5, 6, 8, 1, 2])
+        solution = multifit.solve(instance)
+
+        self.assertEqual(solution.total_time, 10)
+        self.assertEqual(sorted(task for processor in solution.processors for task in processor), list(range(8)))
+
+    def test_first_fit_decreasing(self):
+        self.assertEqual(multifit.first_fit_decreasing([8, 6, 5, 5, 2, 2, 1, 1], 3, 10), [0, 1, 2, 2, 0, 1, 1, 1])
+        self.assertIsNone(multifit.first_fit_decreasing([8, 6, 5, 5, 2, 2, 1, 1], 3, 9))
+
+
+class TestKarmarkarKarp(unittest.TestCase):
+    def test_example(self):
+        instance = Instance(3, [1, 5, 2, 5, 6, 8, 1, 2])
+        solution = karmarkar_karp.solve(instance)
+
+        self.assertEqual(solution.total_time, 10)
+        self.assertEqual(sorted(task for processor in solution.processors for task in processor), list(range(8)))
+
+    def test_two_processors(self):
+        instance = Instance(2, [8, 7, 6, 5, 4])
+        self.assertEqual(karmarkar_karp.solve(instance).total_time, 16)
+
+
+class TestLocalSearch(unittest.TestCase):
+    def test_improves_greedy(self):
+        instance = Instance(3, [1, 5, 2, 5, 6, 8, 1, 2])
+        for mode in ("best", "first"):
+            solution = local_search.improve(greedy.solve(instance), mode=mode)
+
+            self.assertEqual(solution.total_time, 10)
+            self.assertEqual(sorted(task for processor in solution.processors for task in processor), list(range(8)))
+
+
+class TestJakubGenetic(unittest.TestCase):
+    def test_population_generator(self):
+        instance = Instance(3, [1, 5, 2, 5, 6, 8, 1, 2])
+        generator = jakub_genetic.population_generator(instance, 16, 4, rng=112997)
+        # The generator stops as soon as it reaches the lower bound
+        solution = list(generator)[-1]
+
+        self.assertEqual(solution.total_time, 10)
+        self.assertEqual(solution.to_instance_solution().total_time, 10)
+
+    def test_cross(self):
+        instance = Instance(3, [1, 5, 2, 5, 6, 8, 1, 2])
+        random.seed(112997)
+        for _ in range(20):
+            first, second = (
+                jakub_genetic.GeneticSolution(instance, [random.randrange(3) for _ in range(8)]) for _ in range(2)
+            )
+            child = first.cross(second)
+            # The parents' cached loads are read while crossing, the child's have to match its processors
+            for solution in (first, second, child):
+                self.assertEqual(solution.loads, InstanceSolution(instance, solution.processors).loads)
+            self.assertEqual(sorted(task for processor in child.processors for task in processor), list(range(8)))
+
+
+class TestAnytime(unittest.TestCase):
+    def setUp(self):
+        random.seed(112997)
+        # The optimal total time (17) is above the lower bound (16), so the algorithms don't stop by themselves
+        self.instance = Instance(3, [8, 9, 4, 6, 4, 4, 8, 5])
+
+    def test_iterations(self):
+        events = []
+        result = anytime.run(
+            jakub_genetic.population_generator(self.instance, 16, 4, rng=112997), iterations=20,
+            progress=events.append, progress_interval=0
+        )
+        self.assertEqual(result.status, anytime.ITERATIONS)
+        self.assertEqual(result.iterations, 20)
+        self.assertIs(events[-1], result)
+        self.assertEqual([event.iterations for event in events[:-1]], list(range(1, 20)))
+
+    def test_target(self):
+        result = anytime.run(jakub_genetic.solution_generator(self.instance, 16, 4), target=10 ** 6)
+        self.assertEqual(result.status, anytime.TARGET)
+        self.assertEqual(result.iterations, 1)
+
+    def test_one_shot(self):
+        result = anytime.run(anytime.one_shot(lpt.solve, self.instance))
+        self.assertEqual(result.status, anytime.EXHAUSTED)
+        self.assertEqual(result.best.total_time, lpt.solve(self.instance).total_time)
+
+    def test_eryk_heuristic(self):
+        generator = eryk_heuristic.solution_generator(self.instance, 2, 8, 2)
+        result = anytime.run(generator, time_limit=0.3)
+        self.assertEqual(result.status, anytime.TIME_LIMIT)
+        self.assertGreaterEqual(result.best.total_time, 17)
+        self.assertGreater(result.iterations, 1)
+
+    def test_eryk_processes(self):
+        # The initial specimens are sent to the inboxes of the islands before they start
+        initial = [[0, 1, 2, 1, 0, 2, 2, 0], [0] * 8, [1] * 8]
+        profiler = profiling.Profiler()
+        generator = eryk_heuristic.solution_generator(
+            self.instance, 2, 8, 2, backend="processes", migration_period=2, initial=initial, profiler=profiler
+        )
+        result = anytime.run(generator, iterations=6, time_limit=30)
+        self.assertEqual(result.status, anytime.ITERATIONS)
+        self.assertEqual(multiprocessing.active_children(), [])
+        self.assertGreaterEqual(profiler.generations, 10)
+
+        solution = result.best
+        self.assertEqual(sorted(task for processor in solution.processors for task in processor), list(range(8)))
+        loads = [sum(self.instance.tasks_durations[task] for task in processor) for processor in solution.processors]
+        self.assertEqual(solution.total_time, max(loads))
+        self.assertEqual(solution.total_time, 17)
+
+    def test_lower_bound(self):
+        instance = Instance(3, [1, 5, 2, 5, 6, 8, 1, 2])
+        result = anytime.run(eryk_heuristic.solution_generator(instance, 2, 8, 2), lower_bound=10, time_limit=30)
+        self.assertEqual(result.status, anytime.OPTIMAL)
+        self.assertEqual(result.best.total_time, 10)
+
+
+class TestSolutionsQueue(unittest.TestCase):
+    def test_keeps_best_distinct(self):
+        instance = Instance(2, [1, 2, 3, 4])
+        solutions_queue = SolutionsQueue(2)
+        for processors in ([[0, 1], [2, 3]], [[0, 3], [1, 2]], [[1, 0], [2, 3]], [[0, 1, 2], [3]], [[3], [0, 1, 2]]):
+            solutions_queue.push(InstanceSolution(instance, processors))
+
+        self.assertEqual(len(solutions_queue), 2)
+        self.assertEqual(solutions_queue.pop().total_time, 5)
+        self.assertEqual(solutions_queue.pop().total_time, 6)
+        self.assertRaises(queue.Empty, solutions_queue.pop, timeout=0.01)
+
+
+class TestCompactSolution(unittest.TestCase):
+    def test_round_trip(self):
+        instance = Instance(3, [1, 5, 2, 5, 6, 8, 1, 2])
+        solution = CompactSolution.from_instance_solution(lpt.solve(instance))
+        copied = solution.copy()
+        copied.move(0, 2)
+        copied.swap(1, 5)
+
+        self.assertEqual(solution.total_time, 10)
+        self.assertIs(copied.instance, instance)
+        self.assertEqual(copied.total_time, copied.to_instance_solution().total_time)
+        self.assertEqual(list(copied.loads), list(map(sum, copied.to_instance_solution())))
+
+
+class TestCache(unittest.TestCase):
+    def test_fingerprint(self):
+        instance = Instance(3, [1, 5, 2, 5, 6, 8, 1, 2])
+        same = Instance(3, numpy.array([1, 5, 2, 5, 6, 8, 1, 2]))
+        self.assertEqual(instance.fingerprint, same.fingerprint)
+        self.assertEqual(len({instance, same}), 1)
+        self.assertNotEqual(instance.fingerprint, Instance(2, [1, 5, 2, 5, 6, 8, 1, 2]).fingerprint)
+        same.tasks_durations = [1, 5, 2, 5, 6, 8, 1, 3]
+        self.assertNotEqual(instance, same)
+
+    def test_get_put(self):
+        instance = Instance(3, [1, 5, 2, 5, 6, 8, 1, 2])
+        with tempfile.TemporaryDirectory() as directory:
+            results = cache.ResultsCache(directory)
+            self.assertIsNone(results.get(instance, "greedy"))
+            results.put(instance, "greedy", None, greedy.solve(instance))
+            results.put(instance, "lpt", {"order": "desc"}, lpt.solve(instance))
+
+            solution = results.get(Instance(3, [1, 5, 2, 5, 6, 8, 1, 2]), "greedy")
+            self.assertEqual(solution.processors, greedy.solve(instance).processors)
+            self.assertIsNone(results.get(instance, "lpt"))
+            self.assertEqual(results.incumbent(instance).total_time, 10)
+            self.assertEqual((results.hits, results.misses), (1, 2))
+
+    def test_put_keeps_better(self):
+        instance = Instance(3, [1, 5, 2, 5, 6, 8, 1, 2])
+        worse = InstanceSolution(instance, [list(range(8)), [], []])
+        with tempfile.TemporaryDirectory() as directory:
+            results = cache.ResultsCache(directory)
+            results.put(instance, "eryk_genetic", {"seeder": "cache"}, lpt.solve(instance))
+            results.put(instance, "eryk_genetic", {"seeder": "cache"}, worse)
+            self.assertEqual(results.get(instance, "eryk_genetic", {"seeder": "cache"}).total_time, 10)
+
+            results.put(instance, "greedy", None, worse)
+            results.put(instance, "greedy", None, lpt.solve(instance))
+            self.assertEqual(results.get(instance, "greedy").total_time, 10)
+
+    def test_eviction(self):
+        first, second = Instance(3, [1, 5, 2, 5, 6, 8, 1, 2]), Instance(3, [2, 5, 2, 5, 6, 8, 1, 2])
+        with tempfile.TemporaryDirectory() as directory:
+            results = cache.ResultsCache(directory)
+            results.put(first, "lpt", None, lpt.solve(first))
+            path = os.path.join(directory, f"{cache.key(first, 'lpt')}.toml")
+            os.utime(path, (0, 0))
+            results.max_size = 1.5 * os.path.getsize(path)
+            results.put(second, "lpt", None, lpt.solve(second))
+
+            self.assertFalse(os.path.exists(path))
+            self.assertIsNone(results.get(first, "lpt"))
+            self.assertIsNotNone(results.get(second, "lpt"))
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        # The optimal total time (17) is above the lower bound (16), so the algorithms don't stop by themselves
+        self.instance = Instance(3, [8, 9, 4, 6, 4, 4, 8, 5])
+        self.optimal = [0, 1, 2, 1, 0, 2, 2, 0]
+
+    def test_save_load(self):
+        population = numpy.array([self.optimal, [0] * 8])
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "population.npz")
+            checkpoint.save_population(filename, self.instance, population, generation=7)
+            loaded, generation = checkpoint.load_population(filename, self.instance)
+            numpy.testing.assert_array_equal(loaded, population)
+            self.assertEqual(generation, 7)
+            with self.assertRaises(FileContentError):
+                checkpoint.load_population(filename, Instance(3, [8, 9, 4, 6, 4, 4, 8, 6]))
+
+    def test_load_seeds(self):
+        with tempfile.TemporaryDirectory() as directory:
+            population_file = os.path.join(directory, "population.npz")
+            solution_file = os.path.join(directory, "solution.toml")
+            checkpoint.save_population(population_file, self.instance, [[0] * 8, [1] * 8])
+            lpt.solve(self.instance).save_toml(solution_file)
+            seeds, generation = checkpoint.load_seeds([solution_file, population_file], self.instance)
+            self.assertEqual(generation, 0)
+            self.assertEqual(seeds.shape, (3, 8))
+            numpy.testing.assert_array_equal(seeds[0], checkpoint.assignment_of(lpt.solve(self.instance)))
+
+    def test_resume(self):
+        with tempfile.TemporaryDirectory() as directory:
+            saved = checkpoint.Checkpoint(os.path.join(directory, "population.npz"), self.instance, period=0)
+            generator = jakub_genetic.population_generator(
+                self.instance, 16, 4, rng=112997, initial=[self.optimal], checkpoint=saved, generation=10
+            )
+            self.assertEqual(next(generator).total_time, 17)
+            generator.close()
+            population, generation = checkpoint.load_population(saved.filename, self.instance)
+            self.assertEqual(population.shape, (16, 8))
+            self.assertEqual(generation, 11)
+            self.assertIn(self.optimal, population.tolist())
+
+            # The eryk heuristic saves only after its workers start, i.e. after the first solution
+            saves = saved.saves
+            generator = eryk_heuristic.solution_generator(
+                self.instance, 2, 8, 2, initial=population, checkpoint=saved, generation=generation
+            )
+            self.assertEqual(next(generator).total_time, 17)
+            for _ in zip(range(8), generator):
+                pass
+            generator.close()
+            self.assertGreater(saved.saves, saves)
+            self.assertGreater(checkpoint.load_population(saved.filename, self.instance)[1], generation)
+
+
+class TestGantt(unittest.TestCase):
+    def setUp(self):
+        self.solution = InstanceSolution(Instance(2, [4, 1, 1, 3, 2]), [[0, 1, 2], [3, 4]])
+
+    def test_bars(self):
+        rows, lefts, widths, layers = gantt.bars(self.solution)
+        self.assertEqual(rows.tolist(), [0, 0, 0, 1, 1])
+        self.assertEqual(lefts.tolist(), [0, 4, 5, 0, 3])
+        self.assertEqual(widths.tolist(), [4, 1, 1, 3, 2])
+        self.assertEqual(layers.tolist(), [0, 1, 2, 0, 1])
+
+    def test_aggregate(self):
+        rows, lefts, widths, layers = gantt.aggregate(*gantt.bars(self.solution), resolution=3)
+        self.assertEqual(rows.tolist(), [0, 0, 1])
+        self.assertEqual(lefts.tolist(), [0, 5, 0])
+        self.assertEqual(widths.tolist(), [5, 1, 5])
+        self.assertEqual(layers.tolist(), [0, 2, 0])
+
+    def test_save(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for extension in ("png", "svg"):
+                filename = os.path.join(directory, f"solution.{extension}")
+                self.solution.save_plot(filename, title="test")
+                self.assertGreater(os.path.getsize(filename), 0)
+
+
+class TestReport(unittest.TestCase):
+    def test_parse_duration(self):
+        self.assertEqual(report.parse_duration("01:02:03"), 3723)
+        self.assertEqual(report.parse_duration("02:03.5"), 123.5)
+        self.assertEqual(report.parse_duration(7), 7)
+        self.assertIsNone(report.parse_duration("soon"))
+
+    def test_report(self):
+        instance = Instance(3, [1, 5, 2, 5, 6, 8, 1, 2])
+        with tempfile.TemporaryDirectory() as directory:
+            for index, algorithm in enumerate([greedy, greedy, lpt]):
+                name = algorithm.__name__.rsplit(".", 1)[-1]
+                algorithm.solve(instance).save_toml(
+                    os.path.join(directory, f"{name}-{index}.toml"),
+                    {"algorithm": name, "instance": "test.txt", "best_solution_at": f"00:00:0{index}"}
+                )
+            # Old files don't contain the lower bound and the fingerprint
+            with open(os.path.join(directory, "old.toml"), 'w') as target:
+                target.write(
+                    "[results]\ntotal_time = 11\n\n[simulation_data]\nalgorithm = \"old\"\ninstance = \"test.txt\"\n\n"
+                    "[instance]\nnumber_of_processors = 3\nnumber_of_tasks = 8\n"
+                    "tasks_durations = [1, 5, 2, 5, 6, 8, 1, 2]\n\n"
+                    "[solution]\nprocessor_0 = [0, 1, 2]\nprocessor_1 = [3, 4]\nprocessor_2 = [5, 6, 7]\n"
+                )
+            with open(os.path.join(directory, "broken.toml"), 'w') as target:
+                target.write("[results\n")
+            # Old file assigning the durations instead of the tasks
+            with open(os.path.join(directory, "values.toml"), 'w') as target:
+                target.write(
+                    "[results]\ntotal_time = 16\n\n[instance]\nnumber_of_processors = 3\nnumber_of_tasks = 8\n"
+                    "tasks_durations = [1, 5, 2, 5, 6, 8, 1, 2]\n\n"
+                    "[solution]\nprocessor_0 = [1, 5, 2]\nprocessor_1 = [5, 6]\nprocessor_2 = [8, 1, 2]\n"
+                )
+            target = os.path.join(directory, "report.csv")
+            rows, skipped = report.report(directory, target, workers=1)
+
+            self.assertEqual([(row["algorithm"], row["runs"]) for row in rows], [("greedy", 2), ("lpt", 1), ("old", 1)])
+            self.assertEqual(sorted(os.path.basename(path) for path, _ in skipped), ["broken.toml", "values.toml"])
+            self.assertEqual({row["fingerprint"] for row in rows}, {instance.fingerprint})
+            self.assertEqual({row["lower_bound"] for row in rows}, {10})
+            self.assertEqual(rows[0]["time_to_best_min"], 0)
+            self.assertEqual(rows[1]["best"], 10)
+            self.assertTrue(rows[1]["proven_optimal"])
+            self.assertAlmostEqual(rows[2]["best_gap"], 0.1)
+            with open(target) as source:
+                self.assertEqual(len(source.readlines()), 4)
+
+
+class TestProfiling(unittest.TestCase):
+    def test_profiler(self):
+        profiler = profiling.Profiler(trace=True)
+        for total_time in [5, 7, 4]:
+            with profiler.phase("step"):
+                profiler.generation()
+            profiler.improvement(total_time)
+        profiler.generation(16)
+        summary = profiler.summary()
+        self.assertEqual(summary["generations"], 19)
+        self.assertEqual(summary["phases"]["step"]["calls"], 3)
+        self.assertEqual([event["total_time"] for event in summary["improvements"]], [5, 4])
+        self.assertEqual([event["generations"] for event in summary["improvements"]], [1, 3])
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "profile.json")
+            profiler.save(filename, "chrome")
+            with open(filename) as source:
+                events = json.load(source)["traceEvents"]
+            self.assertEqual(len([event for event in events if event["ph"] == "X"]), 3)
+            self.assertEqual(len([event for event in events if event["ph"] == "C"]), 2)
+
+    def test_generators(self):
+        # The optimal total time is above the lower bound, so the generators don't stop before mutating
+        instance = Instance(3, [8, 9, 4, 6, 4, 4, 8, 5])
+        for generator in (jakub_genetic.solution_generator, jakub_genetic.population_generator):
+            profiler = profiling.Profiler()
+            for _, _ in zip(range(5), generator(instance, 16, 4, profiler=profiler)):
+                pass
+            summary = profiler.summary()
+            self.assertGreaterEqual(summary["generations"], 1)
+            self.assertIn("mutate", summary["phases"])
+            self.assertGreaterEqual(len(summary["improvements"]), 1)
+
+    def test_solutions_queue(self):
+        profiler = profiling.Profiler()
+        queue = SolutionsQueue(2, profiler)
+        queue.push(greedy.solve(Instance(2, [1, 2, 3])))
+        queue.pop()
+        self.assertEqual(profiler.summary()["phases"]["queue.lock"]["calls"], 2)
+        self.assertEqual(profiler.summary()["phases"]["queue.wait"]["calls"], 1)
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_attributes(self):
+        import scheduler
+        from scheduler.algorithms import greedy as greedy_module
+
+        self.assertIs(scheduler.greedy, greedy_module)
+        self.assertIs(scheduler.Instance, Instance)
+        self.assertIn("jakub_genetic", dir(scheduler))
+        with self.assertRaises(AttributeError):
+            scheduler.missing
+
+    def test_startup(self):
+        # A fresh interpreter, the test process has already imported everything
+        code = (
+            "import sys, scheduler\n"
+            "from scheduler.scripts import solve\n"
+            "scheduler.greedy.solve(scheduler.Instance(2, [1, 2, 3]))\n"
+            "print(sorted({'numpy', 'toml', 'matplotlib'} & set(sys.modules)))\n"
+        )
+        root = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+        output = subprocess.run(
+            [sys.executable, "-c", code], env={**os.environ, "PYTHONPATH": root}, capture_output=True, text=True,
+            check=True
+        ).stdout
+        self.assertEqual(output.strip(), "[]")
+
+
+class TestBatch(unittest.TestCase):
+    def test_summary(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "instance.txt")
+            Instance(3, [1, 5, 2, 5, 6, 8, 1, 2]).save_txt(source)
+            summary = os.path.join(directory, "summary.json")
+            rows = batch.run_batch([source], ["greedy", "lpt"], directory, workers=1, summary=summary)
+
+            self.assertEqual([row["total_time"] for row in rows], [13, 10])
+            self.assertEqual([row["lower_bound"] for row in rows], [10, 10])
+            self.assertTrue(os.path.isfile(os.path.join(directory, "lpt-instance.toml")))
+            self.assertTrue(os.path.isfile(summary))
+
+
 class TestRandomDatasetsGenerator(unittest.TestCase):
     def test_example(self):
         cmax = 10
@@ -46,6 +687,26 @@ class TestRandomDatasetsGenerator(unittest.TestCase):
 
         self.assertEqual(solution.total_time, cmax)
 
+    def test_vectorized(self):
+        cmax = 10
+        for seed in range(10):
+            instance = generate_vectorized(cmax, 8, 3, 8, rng=seed)
+            self.assertEqual(brute_force_recursive.solve(instance).total_time, cmax)
+
+        instance = generate_vectorized(1001, 10000, 20, 100, rng=numpy.random.default_rng(112997))
+        self.assertEqual(len(instance.tasks_durations), 10000)
+        self.assertEqual(int(instance.tasks_durations.sum()), 20 * 1000 + 1)
+        self.assertTrue(1 <= instance.tasks_durations.min() and instance.tasks_durations.max() <= 100)
+        self.assertEqual(list(generate_vectorized(1001, 10000, 20, 100, rng=1).tasks_durations),
+                         list(generate_vectorized(1001, 10000, 20, 100, rng=1).tasks_durations))
+
+    def test_batch(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = generate_batch(directory, 3, 10, 8, 3, 8, rng=112997)
+            self.assertEqual(len(paths), 3)
+            for path in paths:
+                self.assertEqual(branch_and_bound.solve(Instance.load(path)).total_time, 10)
+
 
 if __name__ == '__main__':
     unittest.main()